@@ -1,30 +1,93 @@
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
+import hmac
 import json
 import time
 import traceback
 import os
 import platform
 import sys
-import random
 from datetime import datetime
-import numpy as np
 from models.aco import ACO_MultiAgent_Scheduler as ACOScheduler
 from models.pso import PSO_MultiAgent_Scheduler as PSOScheduler
 from models.utils import (
     generate_agen_default,
     safe_convert_to_float,
-    normalize_id,
-    parse_dependensi,
-    filter_ghost_dependencies,
     fungsi_biaya_jadwal,
-    validasi_dependensi,
-    ada_dependensi_sirkular,
 )
+from ingestion import (
+    DependencyError,
+    TaskFileError,
+    detect_file_format,
+    ingest_tasks,
+    read_task_file,
+)
+from dataset_registry import DatasetRegistry
+from result_cache import ResultCache
+from job_queue import JobQueue
 
 app = Flask(__name__)
 app.start_time = time.time()
 
+# Cache hasil simulasi (LRU + TTL, tier disk opsional via RESULT_CACHE_DIR)
+result_cache = ResultCache.from_env()
+
+# Dataset statis di data/ (kolom .npy memory-map, dirujuk lewat dataset_id)
+dataset_registry = DatasetRegistry.from_env()
+
+# Antrean job asinkron (process pool lokal, state job di disk bersama antar worker)
+job_queue = JobQueue.from_env()
+
+
+class SchedulingRequestError(ValueError):
+    """
+    Request simulasi tidak valid; dijawab endpoint dengan `status_code` (400/404).
+    """
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def sse_response(generator):
+    """
+    Bungkus generator event menjadi Response SSE tanpa buffering.
+    """
+    response = Response(generator, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache, no-transform"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.headers["Connection"] = "keep-alive"
+    return response
+
+
+def sse_events(events):
+    """
+    Format event JSON menjadi baris SSE, dengan komentar keepalive tiap 10 event setelah start.
+    """
+    try:
+        for iteration_count, event in enumerate(events):
+            yield f"data: {event}\n\n"
+            if iteration_count and iteration_count % 10 == 0:
+                yield f": keepalive {iteration_count}\n\n"
+    finally:
+        # Klien terputus: hentikan juga generator simulasi
+        events.close()
+
+
+def replay_cached_result(algorithm, cached):
+    """
+    Replay event dari cache: start, riwayat iterasi, done, lalu final_metrics.
+    """
+    start_time = time.time()
+    yield json.dumps({"type": "start", "message": f"Starting {algorithm} simulation (cached)..."})
+
+    yield from cached["chunks"]
+
+    final_metrics = dict(cached["final_metrics"])
+    final_metrics["total_execution_time"] = round((time.time() - start_time) * 1000, 2)
+    final_metrics["cache_hit"] = True
+    yield json.dumps(final_metrics)
+
 
 # Middleware: Header Keamanan
 @app.after_request
@@ -60,7 +123,11 @@ def add_security_headers(response):
     if request.endpoint:
         if "health" in request.endpoint or request.endpoint == "home":
             response.headers["Cache-Control"] = "public, max-age=300"
-        elif "simulate" in request.endpoint or "algorithm" in request.endpoint:
+        elif (
+            "simulate" in request.endpoint
+            or "algorithm" in request.endpoint
+            or "job" in request.endpoint
+        ):
             response.headers["Cache-Control"] = (
                 "no-cache, no-store, must-revalidate, private"
             )
@@ -237,391 +304,624 @@ def health_check():
         return jsonify({"status": "error", "error": str(e)}), 500
 
 
+def sse_error_response(e):
+    """
+    Respons SSE berisi satu event error (dengan traceback) untuk kegagalan tak terduga.
+    """
+    error_details = {
+        "type": "error",
+        "message": str(e),
+        "traceback": traceback.format_exc(),
+    }
+    return Response(
+        f"data: {json.dumps(error_details)}\n\n", mimetype="text/event-stream"
+    )
+
+
+def parse_scheduling_request(data):
+    """
+    Ambil (algorithm, tasks, parameters, dataset_id) dari body JSON simulasi.
+
+    Melempar SchedulingRequestError jika body kosong, tugas atau algoritma tidak ada, atau
+    dataset tidak dikenal.
+    """
+    if not data:
+        raise SchedulingRequestError("No data provided")
+
+    tasks = data.get("tasks", data.get("tasks_data", []))
+    parameters = data.get("parameters", {})
+    dataset_id = data.get("dataset_id")
+    if dataset_id:
+        if dataset_id not in dataset_registry:
+            raise SchedulingRequestError(f"Unknown dataset: {dataset_id}", 404)
+        print(f"🔍 DEBUG: Using registered dataset {dataset_id}")
+    elif not tasks:
+        raise SchedulingRequestError("No tasks provided")
+    else:
+        print(f"🔍 DEBUG: Received {len(tasks)} tasks from frontend")
+
+    algorithm = data.get("algorithm", "").upper()
+    if not algorithm:
+        raise SchedulingRequestError("Algorithm not specified")
+
+    return algorithm, tasks, parameters, dataset_id
+
+
 @app.route("/stream_scheduling", methods=["POST"])
 def stream_scheduling():
     """
     Endpoint utama simulasi penjadwalan real-time (SSE).
     """
     try:
-        data = request.get_json()
-        if not data:
-            return jsonify({"error": "No data provided"}), 400
+        try:
+            algorithm, tasks, parameters, dataset_id = parse_scheduling_request(
+                request.get_json()
+            )
+        except SchedulingRequestError as e:
+            return jsonify({"error": str(e)}), e.status_code
 
-        tasks = data.get("tasks", data.get("tasks_data", []))
-        parameters = data.get("parameters", {})
-        if not tasks:
-            return jsonify({"error": "No tasks provided"}), 400
+        return run_scheduling_stream(algorithm, tasks, parameters, dataset_id=dataset_id)
+
+    except Exception as e:
+        return sse_error_response(e)
 
-        print(f"🔍 DEBUG: Received {len(tasks)} tasks from frontend")
 
-        algorithm = data.get("algorithm", "").upper()
+@app.route("/stream_scheduling/upload", methods=["POST"])
+def stream_scheduling_upload():
+    """
+    Simulasi penjadwalan (SSE) dari file tugas mentah (CSV/Parquet/Arrow).
+
+    File dikirim sebagai multipart (field `file`, plus field `algorithm` dan `parameters`
+    berupa JSON) atau langsung sebagai body dengan `algorithm`/`parameters` di query string.
+    File dibaca server-side dengan reader kolumnar tanpa array JSON raksasa.
+    """
+    try:
+        algorithm = request.values.get("algorithm", "").upper()
         if not algorithm:
             return jsonify({"error": "Algorithm not specified"}), 400
 
-        # Ekstraksi Parameter
-        num_default_agents = parameters.get("num_default_agents", 10)
-        n_iterations = parameters.get("n_iterations", 100)
-        task_id_col_for_scheduler = parameters.get("task_id_col", "id")
-        dependency_col_for_scheduler = parameters.get("dependency_col", "")
-
-        # Pengaturan Random Seed
-        random_seed = parameters.get("random_seed", 42)
-        random.seed(random_seed)
-        np.random.seed(random_seed)
-
-        # Parameter Spesifik Algoritma
-        n_ants = parameters.get("n_ants", 50)
-        alpha = parameters.get("alpha", 0.9)
-        beta = parameters.get("beta", 2)
-        evaporation_rate = parameters.get("evaporation_rate", 0.3)
-        pheromone_deposit = parameters.get("pheromone_deposit", 100)
-
-        n_particles = parameters.get("n_particles", 50)
-        w = parameters.get("w", 0.3)
-        c1 = parameters.get("c1", 0.3)
-        c2 = parameters.get("c2", 0.4)
-
-        enable_dependencies = parameters.get("enable_dependencies", None)
-
-        # Normalisasi data tugas
-        formatted_tasks = []
-        flexible_task_id_candidates = [
-            "Task_ID",
-            "TaskID",
-            "task_id",
-            "id",
-            "ID",
-            "name",
-            "Name",
-        ]
-
-        for i, task in enumerate(tasks):
-            # Normalisasi ID
-            task_id_value = None
-            for field in flexible_task_id_candidates:
-                if field in task and task[field] is not None:
-                    raw_val = task[field]
-                    if str(raw_val).strip():
-                        task_id_value = normalize_id(raw_val)
-                        break
-
-            # Fallback ID
-            if not task_id_value:
-                task_id_value = str(i + 1)
-
-            # Ekstrak field numerik
-            task_length = None
-            for field in [
-                "Duration",
-                "duration",
-                "length",
-                "Length",
-                "Weight",
-                "weight",
-                "execution_time",
-                "Execution_Time (s)",
-            ]:
-                if field in task:
-                    task_length = safe_convert_to_float(task[field])
-                    if task_length > 0:
-                        break
-            if task_length is None or task_length <= 0:
-                task_length = 1.0
-
-            cost = 0.0
-            for field in ["Cost", "cost", "price", "Price"]:
-                if field in task:
-                    cost = safe_convert_to_float(task[field])
-                    if cost >= 0:
-                        break
-
-            priority = safe_convert_to_float(
-                task.get("Priority", task.get("priority", 1)), 1
-            )
+        try:
+            parameters = json.loads(request.values.get("parameters") or "{}")
+        except json.JSONDecodeError:
+            return jsonify({"error": "Invalid parameters JSON"}), 400
+        if not isinstance(parameters, dict):
+            return jsonify({"error": "Invalid parameters JSON"}), 400
 
-            # Normalisasi dependensi
-            dependencies = None
-
-            # Gunakan kolom dependensi dari user jika ada
-            if dependency_col_for_scheduler and dependency_col_for_scheduler in task:
-                dependencies = task[dependency_col_for_scheduler]
-
-            # Cari otomatis jika belum ketemu
-            if dependencies is None and enable_dependencies is not False:
-                for field in [
-                    "dependencies",
-                    "Depends_On_Task_ID",
-                    "depends_on",
-                    "prerequisites",
-                    "requires",
-                    "dependensi",
-                    "Dependensi",
-                ]:
-                    if field in task and task[field] is not None:
-                        dependencies = task[field]
-                        break
-
-            # Parse dependensi ke list
-            if isinstance(dependencies, str):
-                normalized_deps = parse_dependensi(dependencies)
-            elif isinstance(dependencies, (list, tuple)):
-                normalized_deps = [
-                    normalize_id(d)
-                    for d in dependencies
-                    if d is not None
-                    and str(d).lower() not in ["null", "nan", "none", ""]
-                ]
-            elif isinstance(dependencies, (int, float)):
-                normalized_deps = [normalize_id(dependencies)]
+        upload = request.files.get("file")
+        try:
+            if upload is not None:
+                file_format = detect_file_format(
+                    upload.filename, upload.mimetype, request.values.get("format")
+                )
+                tasks = read_task_file(upload.stream, file_format)
             else:
-                normalized_deps = []
-
-            formatted_task = {
-                task_id_col_for_scheduler: task_id_value,
-                "length": task_length,
-                "cost": cost,
-                "priority": priority,
-                "dependencies": normalized_deps,
-            }
+                file_format = detect_file_format(
+                    None, request.mimetype, request.args.get("format")
+                )
+                tasks = read_task_file(request.stream, file_format)
+        except TaskFileError as e:
+            return jsonify({"error": str(e)}), 400
 
-            # Salin field tambahan
-            for key, value in task.items():
-                if key not in formatted_task:
-                    if isinstance(value, (int, float)):
-                        formatted_task[key] = safe_convert_to_float(value, 0)
-                    else:
-                        formatted_task[key] = str(value).strip() if value else ""
+        if tasks.empty:
+            return jsonify({"error": "No tasks provided"}), 400
 
-            formatted_tasks.append(formatted_task)
+        print(f"🔍 DEBUG: Received {len(tasks)} tasks from {file_format} upload")
 
-        # Auto-enable dependensi jika data ditemukan
-        has_dependencies = any(len(t["dependencies"]) > 0 for t in formatted_tasks)
+        return run_scheduling_stream(algorithm, tasks, parameters)
 
-        if has_dependencies:
-            if not enable_dependencies:
-                print(
-                    "Auto-enabling dependencies (Force) because dependency data was found."
-                )
-            enable_dependencies = True
+    except Exception as e:
+        return sse_error_response(e)
 
-        # Konversi ke boolean
-        enable_dependencies = bool(enable_dependencies)
 
-        # Filter ghost dependencies
-        if enable_dependencies and len(formatted_tasks) > 0:
-            count_removed = filter_ghost_dependencies(
-                formatted_tasks, task_id_col_for_scheduler
-            )
+def run_scheduling_stream(algorithm, tasks, parameters, dataset_id=None):
+    """
+    Stream hasil simulasi sebagai SSE, atau respons 400 jika request tidak valid.
 
-            # Validasi dependensi sirkular
-            is_valid, masalah_dependensi = validasi_dependensi(
-                formatted_tasks, task_id_col_for_scheduler
+    Dipakai bersama oleh endpoint JSON dan endpoint upload file; `tasks` boleh list dict
+    atau DataFrame. Jika `dataset_id` diberikan, tugas diambil dari dataset registry.
+    """
+    try:
+        events = scheduling_events(algorithm, tasks, parameters, dataset_id)
+    except SchedulingRequestError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    return sse_response(sse_events(events))
+
+
+def ingest_scheduling_tasks(tasks, parameters, dataset_id=None):
+    """
+    Normalisasi data tugas secara kolumnar; kembalikan (task_table, dependencies_enabled).
+
+    Alias per kolom, konversi angka vektor, dan dependensi diparse sekali lalu langsung
+    dipakai scheduler. Jika `dataset_id` diberikan, tugas diambil dari dataset registry.
+    Dependensi tidak valid (misal siklus) menjadi SchedulingRequestError.
+    """
+    try:
+        if dataset_id:
+            return dataset_registry.ingest(
+                dataset_id,
+                parameters.get("dependency_col", ""),
+                parameters.get("enable_dependencies", None),
             )
-            if not is_valid:
-                error_msg = "Dependency Error: " + "; ".join(masalah_dependensi)
-                print(f"{error_msg}")
-                return jsonify({"error": error_msg}), 400
+        return ingest_tasks(
+            tasks,
+            parameters.get("dependency_col", ""),
+            parameters.get("enable_dependencies", None),
+        )
+    except DependencyError as e:
+        error_msg = f"Dependency Error: {e}"
+        print(f"{error_msg}")
+        raise SchedulingRequestError(error_msg) from e
 
-        # Generate agen default jika tidak ada
-        agents = parameters.get("agents")
 
-        if not agents:
-            agents = generate_agen_default(num_default_agents, "id")
-            print(f"DEBUG: Generated {len(agents)} deterministic agents.")
+def scheduling_events(algorithm, tasks, parameters, dataset_id=None, ingested=None):
+    """
+    Normalisasi tugas dan bangun scheduler, lalu kembalikan generator event JSON simulasi.
 
-        # Buat fungsi biaya
-        cost_function = fungsi_biaya_jadwal
+    Validasi berjalan langsung (SchedulingRequestError); simulasi baru berjalan saat
+    generator diiterasi: start, iterasi, done, lalu final_metrics (atau replay dari cache).
+    Dipakai oleh stream SSE maupun worker job asinkron. `ingested` adalah hasil
+    ingest_scheduling_tasks yang sudah divalidasi sebelumnya (dipakai alih-alih `tasks`).
+    """
+    # Ekstraksi Parameter
+    num_default_agents = parameters.get("num_default_agents", 10)
+    n_iterations = parameters.get("n_iterations", 100)
+    task_id_col_for_scheduler = parameters.get("task_id_col", "id")
+
+    # Pengaturan Random Seed (dipakai generator milik scheduler, bukan state global)
+    random_seed = parameters.get("random_seed", 42)
+
+    # Parameter Spesifik Algoritma
+    n_ants = parameters.get("n_ants", 50)
+    alpha = parameters.get("alpha", 0.9)
+    beta = parameters.get("beta", 2)
+    evaporation_rate = parameters.get("evaporation_rate", 0.3)
+    pheromone_deposit = parameters.get("pheromone_deposit", 100)
+    pheromone_dtype = parameters.get("pheromone_dtype", "float64")
+    pheromone_mode = parameters.get("pheromone_mode", "dense")
+    candidate_k = parameters.get("candidate_k", 20)
+    batch_construction = bool(parameters.get("batch_construction", False))
+    heuristic_mode = parameters.get("heuristic_mode", "default")
+
+    n_particles = parameters.get("n_particles", 50)
+    w = parameters.get("w", 0.3)
+    c1 = parameters.get("c1", 0.3)
+    c2 = parameters.get("c2", 0.4)
+    bottom_level_bias = parameters.get("bottom_level_bias", 0.0)
+
+    # Jumlah proses worker untuk evaluasi paralel (ACO dan PSO); scheduler membatasinya ke
+    # max_solver_workers() dan nilai efektifnya (scheduler.n_workers) yang masuk kunci cache
+    n_workers = parameters.get("n_workers", 1)
+
+    # Early stopping (ACO dan PSO): patience tanpa perbaikan relatif, target makespan
+    patience = parameters.get("patience")
+    min_improvement = parameters.get("min_improvement", 0.0)
+    target_makespan = parameters.get("target_makespan")
+
+    # Berhenti begitu makespan terbaik dalam toleransi gap (%) dari batas bawahnya
+    gap_tolerance = parameters.get("gap_tolerance")
+
+    # Local search swap/insert ("iteration" atau "final") pada solusi terbaik
+    local_search = parameters.get("local_search")
+    local_search_moves = parameters.get("local_search_moves", 50)
+
+    # Anggaran waktu wall-clock (mode anytime): hasil terbaik sejauh ini saat habis
+    time_budget_ms = parameters.get("time_budget_ms")
+
+    enable_dependencies = parameters.get("enable_dependencies", None)
+
+    if ingested is None:
+        ingested = ingest_scheduling_tasks(tasks, parameters, dataset_id)
+    task_table, dependencies_enabled = ingested
+
+    if dependencies_enabled and not enable_dependencies:
+        print("Auto-enabling dependencies (Force) because dependency data was found.")
+    enable_dependencies = dependencies_enabled
+
+    # Generate agen default jika tidak ada
+    agents = parameters.get("agents")
+
+    if not agents:
+        agents = generate_agen_default(num_default_agents, "id")
+        print(f"DEBUG: Generated {len(agents)} deterministic agents.")
+
+    if algorithm not in ("ACO", "PSO"):
+        raise SchedulingRequestError(f"Unsupported algorithm: {algorithm}")
+
+    # Buat fungsi biaya
+    cost_function = fungsi_biaya_jadwal
+
+    # Inisialisasi scheduler berdasarkan algoritma
+    scheduler = None
+    if algorithm == "ACO":
+        scheduler = ACOScheduler(
+            tasks=task_table,
+            cost_function=cost_function,
+            agents=agents,  # Heuristic function is now default in class
+            n_ants=n_ants,
+            n_iterations=n_iterations,
+            alpha=alpha,
+            beta=beta,
+            evaporation_rate=evaporation_rate,
+            pheromone_deposit=pheromone_deposit,
+            pheromone_dtype=pheromone_dtype,
+            pheromone_mode=pheromone_mode,
+            candidate_k=candidate_k,
+            batch_construction=batch_construction,
+            heuristic_mode=heuristic_mode,
+            n_workers=n_workers,
+            task_id_col=task_id_col_for_scheduler,
+            enable_dependencies=enable_dependencies,
+            random_seed=random_seed,
+            num_default_agents=num_default_agents,
+            patience=patience,
+            min_improvement=min_improvement,
+            target_makespan=target_makespan,
+            time_budget_ms=time_budget_ms,
+            gap_tolerance=gap_tolerance,
+            local_search=local_search,
+            local_search_moves=local_search_moves,
+        )
+    elif algorithm == "PSO":
+        scheduler = PSOScheduler(
+            tasks=task_table,
+            agents=agents,
+            cost_function=cost_function,
+            n_particles=n_particles,
+            n_iterations=n_iterations,
+            w=w,
+            c1=c1,
+            c2=c2,
+            bottom_level_bias=bottom_level_bias,
+            n_workers=n_workers,
+            task_id_col=task_id_col_for_scheduler,
+            enable_dependencies=enable_dependencies,
+            random_seed=random_seed,
+            num_default_agents=num_default_agents,
+            patience=patience,
+            min_improvement=min_improvement,
+            target_makespan=target_makespan,
+            time_budget_ms=time_budget_ms,
+            gap_tolerance=gap_tolerance,
+            local_search=local_search,
+            local_search_moves=local_search_moves,
+        )
 
-        # Inisialisasi scheduler berdasarkan algoritma
-        scheduler = None
+    # Cache berbasis konten: hanya untuk run deterministik (seed tetap)
+    cache_key = None
+    if (
+        parameters.get("use_cache", True)
+        and random_seed is not None
+        and result_cache.enabled
+    ):
+        cache_params = {
+            "n_iterations": n_iterations,
+            "num_default_agents": num_default_agents,
+            "task_id_col": task_id_col_for_scheduler,
+            "enable_dependencies": enable_dependencies,
+            "n_workers": scheduler.n_workers,
+            "patience": patience,
+            "min_improvement": min_improvement,
+            "target_makespan": target_makespan,
+            "gap_tolerance": gap_tolerance,
+            "local_search": local_search,
+            "local_search_moves": local_search_moves,
+        }
         if algorithm == "ACO":
-            scheduler = ACOScheduler(
-                tasks=formatted_tasks,
-                cost_function=cost_function,
-                agents=agents,  # Heuristic function is now default in class
-                n_ants=n_ants,
-                n_iterations=n_iterations,
-                alpha=alpha,
-                beta=beta,
-                evaporation_rate=evaporation_rate,
-                pheromone_deposit=pheromone_deposit,
-                task_id_col=task_id_col_for_scheduler,
-                enable_dependencies=enable_dependencies,
-                random_seed=random_seed,
-                num_default_agents=num_default_agents,
-            )
-        elif algorithm == "PSO":
-            scheduler = PSOScheduler(
-                tasks=formatted_tasks,
-                agents=agents,
-                cost_function=cost_function,
-                n_particles=n_particles,
-                n_iterations=n_iterations,
-                w=w,
-                c1=c1,
-                c2=c2,
-                task_id_col=task_id_col_for_scheduler,
-                enable_dependencies=enable_dependencies,
-                random_seed=random_seed,
-                num_default_agents=num_default_agents,
+            cache_params.update(
+                {
+                    "n_ants": n_ants,
+                    "alpha": alpha,
+                    "beta": beta,
+                    "evaporation_rate": evaporation_rate,
+                    "pheromone_deposit": pheromone_deposit,
+                    "pheromone_dtype": pheromone_dtype,
+                    "pheromone_mode": pheromone_mode,
+                    "candidate_k": candidate_k,
+                    "batch_construction": batch_construction,
+                    "heuristic_mode": heuristic_mode,
+                }
             )
         else:
-            return jsonify({"error": f"Unsupported algorithm: {algorithm}"}), 400
-
-        # Generator untuk SSE streaming
-        def generate():
-            start_time = time.time()
-            final_result = None
-            algorithm_computation_time = 0
-            cancelled = False
-
-            try:
-                initial_data = {
-                    "type": "start",
-                    "message": f"Starting {algorithm} simulation...",
-                }
-                yield f"data: {json.dumps(initial_data)}\n\n"
-
-                iteration_count = 0
-
-                for data_chunk in scheduler.run():
-                    yield f"data: {data_chunk}\n\n"
-
-                    iteration_count += 1
-                    if iteration_count % 10 == 0:
-                        yield f": keepalive {iteration_count}\n\n"
-
-                    try:
-                        chunk_obj = json.loads(data_chunk)
-                        if chunk_obj.get("type") == "done":
-                            final_result = chunk_obj
-                            algorithm_computation_time = chunk_obj.get(
-                                "computation_time", 0
-                            )
-                    except json.JSONDecodeError:
-                        continue
-            except GeneratorExit:
-                # Klien terputus
-                cancelled = True
-                print(f"[INFO] Client disconnected, stopping {algorithm} simulation")
-                return
-
-            if cancelled:
-                return
-
-            try:
-                total_execution_time = time.time() - start_time
-                load_balance_index = final_result.get("load_balance_index", 0)
-
-                schedule_data = final_result.get("schedule", [])
-                full_schedule_table = {
-                    "columns": ["task_id", "agent_id", "start_time", "finish_time"],
-                    "data": [
-                        [
-                            item.get("task_id"),
-                            item.get("agent_id"),
-                            round(item.get("start_time", 0), 2),
-                            round(item.get("finish_time", 0), 2),
-                        ]
-                        for item in schedule_data
-                    ],
-                    "total_rows": len(schedule_data),
+            cache_params.update(
+                {
+                    "n_particles": n_particles,
+                    "w": w,
+                    "c1": c1,
+                    "c2": c2,
+                    "bottom_level_bias": bottom_level_bias,
                 }
+            )
 
-                agent_finish_times = final_result.get("agent_finish_times", {})
-                agent_info_table = {
-                    "columns": [
-                        "agent_id",
-                        "type",
-                        "capacity",
-                        "efficiency",
-                        "total_tasks",
-                        "finish_time",
-                    ],
-                    "data": [],
-                }
+        cache_key = ResultCache.make_key(
+            algorithm=algorithm,
+            tasks=task_table.fingerprint(),
+            agents=agents,
+            parameters=cache_params,
+            random_seed=random_seed,
+        )
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            print(f"[INFO] Cache hit for {algorithm} simulation ({cache_key[:12]})")
+            return replay_cached_result(algorithm, cached)
+
+    # Generator untuk SSE streaming
+    def generate():
+        start_time = time.time()
+        final_result = None
+        algorithm_computation_time = 0
+        cancelled = False
 
-                for agent in agents:
-                    agent_id = agent.get("id")
-                    agent_tasks = [
-                        s for s in schedule_data if s.get("agent_id") == agent_id
+        try:
+            initial_data = {
+                "type": "start",
+                "message": f"Starting {algorithm} simulation...",
+            }
+            yield json.dumps(initial_data)
+
+            chunks = []
+
+            for data_chunk in scheduler.run():
+                yield data_chunk
+                chunks.append(data_chunk)
+
+                try:
+                    chunk_obj = json.loads(data_chunk)
+                    if chunk_obj.get("type") == "done":
+                        final_result = chunk_obj
+                        algorithm_computation_time = chunk_obj.get(
+                            "computation_time", 0
+                        )
+                except json.JSONDecodeError:
+                    continue
+        except GeneratorExit:
+            # Klien terputus
+            cancelled = True
+            print(f"[INFO] Client disconnected, stopping {algorithm} simulation")
+            return
+
+        if cancelled:
+            return
+
+        try:
+            total_execution_time = time.time() - start_time
+            load_balance_index = final_result.get("load_balance_index", 0)
+
+            schedule_data = final_result.get("schedule", [])
+            full_schedule_table = {
+                "columns": ["task_id", "agent_id", "start_time", "finish_time"],
+                "data": [
+                    [
+                        item.get("task_id"),
+                        item.get("agent_id"),
+                        round(item.get("start_time", 0), 2),
+                        round(item.get("finish_time", 0), 2),
                     ]
-                    agent_info_table["data"].append(
-                        [
-                            agent_id,
-                            agent.get("type", "N/A"),
-                            round(agent.get("capacity", 1.0), 2),
-                            round(agent.get("efficiency", 1.0), 2),
-                            len(agent_tasks),
-                            round(agent_finish_times.get(agent_id, 0), 2),
-                        ]
-                    )
-                agent_info_table["total_rows"] = len(agent_info_table["data"])
-
-                final_metrics = {
-                    "type": "final_metrics",
-                    "total_execution_time": round(total_execution_time * 1000, 2),
-                    "computation_time": algorithm_computation_time,
+                    for item in schedule_data
+                ],
+                "total_rows": len(schedule_data),
+            }
+
+            agent_finish_times = final_result.get("agent_finish_times", {})
+            agent_info_table = {
+                "columns": [
+                    "agent_id",
+                    "type",
+                    "capacity",
+                    "efficiency",
+                    "total_tasks",
+                    "finish_time",
+                ],
+                "data": [],
+            }
+
+            for agent in agents:
+                agent_id = agent.get("id")
+                agent_tasks = [
+                    s for s in schedule_data if s.get("agent_id") == agent_id
+                ]
+                agent_info_table["data"].append(
+                    [
+                        agent_id,
+                        agent.get("type", "N/A"),
+                        round(agent.get("capacity", 1.0), 2),
+                        round(agent.get("efficiency", 1.0), 2),
+                        len(agent_tasks),
+                        round(agent_finish_times.get(agent_id, 0), 2),
+                    ]
+                )
+            agent_info_table["total_rows"] = len(agent_info_table["data"])
+
+            final_metrics = {
+                "type": "final_metrics",
+                "total_execution_time": round(total_execution_time * 1000, 2),
+                "computation_time": algorithm_computation_time,
+                "load_balance_index": load_balance_index,
+                "full_schedule_table": full_schedule_table,
+                "agent_info_table": agent_info_table,
+                "full_result": {
+                    "algorithm": algorithm,
+                    "schedule": schedule_data,
+                    "makespan": final_result.get("makespan", 0),
                     "load_balance_index": load_balance_index,
-                    "full_schedule_table": full_schedule_table,
-                    "agent_info_table": agent_info_table,
-                    "full_result": {
-                        "algorithm": algorithm,
-                        "schedule": schedule_data,
-                        "makespan": final_result.get("makespan", 0),
-                        "load_balance_index": load_balance_index,
-                        "computation_time": algorithm_computation_time,
-                        "agent_finish_times": final_result.get(
-                            "agent_finish_times", {}
-                        ),
-                        "iteration_history": final_result.get("iteration_history", []),
-                        "total_tasks": len(schedule_data),
-                        "total_agents": len(final_result.get("agent_finish_times", {})),
-                        "timestamp": datetime.now().isoformat(),
-                        "parameters": {
-                            "enable_dependencies": enable_dependencies,
-                            "random_seed": random_seed,
-                            "n_iterations": n_iterations,
-                            "num_agents": num_default_agents,
-                        },
+                    "computation_time": algorithm_computation_time,
+                    "agent_finish_times": final_result.get(
+                        "agent_finish_times", {}
+                    ),
+                    "iteration_history": final_result.get("iteration_history", []),
+                    "stop_reason": final_result.get("stop_reason"),
+                    "budget_exhausted": final_result.get("budget_exhausted", False),
+                    "lower_bound": final_result.get("lower_bound"),
+                    "gap": final_result.get("gap"),
+                    "total_tasks": len(schedule_data),
+                    "total_agents": len(final_result.get("agent_finish_times", {})),
+                    "timestamp": datetime.now().isoformat(),
+                    "parameters": {
+                        "enable_dependencies": enable_dependencies,
+                        "random_seed": random_seed,
+                        "n_iterations": n_iterations,
+                        "num_agents": num_default_agents,
+                        "patience": patience,
+                        "min_improvement": min_improvement,
+                        "target_makespan": target_makespan,
+                        "time_budget_ms": time_budget_ms,
+                        "gap_tolerance": gap_tolerance,
+                        "local_search": local_search,
+                        "local_search_moves": local_search_moves,
                     },
-                }
+                },
+            }
 
-                if algorithm == "ACO":
-                    final_metrics["full_result"]["parameters"].update(
-                        {
-                            "n_ants": n_ants,
-                            "alpha": alpha,
-                            "beta": beta,
-                            "evaporation_rate": evaporation_rate,
-                            "pheromone_deposit": pheromone_deposit,
-                        }
-                    )
-                elif algorithm == "PSO":
-                    final_metrics["full_result"]["parameters"].update(
-                        {"n_particles": n_particles, "w": w, "c1": c1, "c2": c2}
-                    )
-
-                yield f"data: {json.dumps(final_metrics)}\n\n"
-            except GeneratorExit:
-                print(f"[INFO] Client disconnected during final metrics")
-                return
-
-        response = Response(generate(), mimetype="text/event-stream")
-        response.headers["Cache-Control"] = "no-cache, no-transform"
-        response.headers["X-Accel-Buffering"] = "no"
-        response.headers["Connection"] = "keep-alive"
-        return response
+            if algorithm == "ACO":
+                final_metrics["full_result"]["parameters"].update(
+                    {
+                        "n_ants": n_ants,
+                        "alpha": alpha,
+                        "beta": beta,
+                        "evaporation_rate": evaporation_rate,
+                        "pheromone_deposit": pheromone_deposit,
+                        "heuristic_mode": heuristic_mode,
+                    }
+                )
+            elif algorithm == "PSO":
+                final_metrics["full_result"]["parameters"].update(
+                    {
+                        "n_particles": n_particles,
+                        "w": w,
+                        "c1": c1,
+                        "c2": c2,
+                        "bottom_level_bias": bottom_level_bias,
+                    }
+                )
 
-    except Exception as e:
-        error_details = {
-            "type": "error",
-            "message": str(e),
-            "traceback": traceback.format_exc(),
-        }
-        return Response(
-            f"data: {json.dumps(error_details)}\n\n", mimetype="text/event-stream"
+            # Hasil yang terpotong anggaran waktu bergantung pada beban mesin, jadi tidak
+            # di-cache; hasil lengkap sama untuk anggaran berapa pun
+            if cache_key is not None and not final_result.get("budget_exhausted"):
+                result_cache.set(
+                    cache_key, {"chunks": chunks, "final_metrics": final_metrics}
+                )
+
+            yield json.dumps(final_metrics)
+        except GeneratorExit:
+            print(f"[INFO] Client disconnected during final metrics")
+            return
+
+    return generate()
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """
+    Antrekan simulasi ke worker pool lokal dan langsung kembalikan job ID (202).
+
+    Body sama dengan /stream_scheduling. Simulasi tetap berjalan walau klien terputus;
+    status dan hasil diambil lewat GET /jobs/<id>, progress di-stream lewat
+    GET /jobs/<id>/stream.
+    """
+    try:
+        algorithm, tasks, parameters, dataset_id = parse_scheduling_request(
+            request.get_json(silent=True)
         )
+    except SchedulingRequestError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    if algorithm not in ("ACO", "PSO"):
+        return jsonify({"error": f"Unsupported algorithm: {algorithm}"}), 400
+
+    # Ingestion (termasuk deteksi siklus) berjalan sebelum submit agar payload tidak valid
+    # ditolak 400 seperti di /stream_scheduling, bukan menjadi job failed
+    try:
+        ingested = ingest_scheduling_tasks(tasks, parameters, dataset_id)
+    except SchedulingRequestError as e:
+        return jsonify({"error": str(e)}), e.status_code
+
+    job_id = job_queue.submit(
+        scheduling_events,
+        (algorithm, None, parameters, dataset_id, ingested),
+        meta={"algorithm": algorithm, "dataset_id": dataset_id},
+    )
+    return (
+        jsonify(
+            {
+                "job_id": job_id,
+                "status": JobQueue.QUEUED,
+                "status_url": f"/jobs/{job_id}",
+                "stream_url": f"/jobs/{job_id}/stream",
+            }
+        ),
+        202,
+    )
+
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    """
+    Status job: queued/running/done/failed, progress iterasi terakhir, dan hasil atau error.
+    """
+    try:
+        return jsonify(job_queue.get(job_id))
+    except KeyError:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+
+
+@app.route("/jobs/<job_id>/stream", methods=["GET"])
+def stream_job(job_id):
+    """
+    Ikuti event job sebagai SSE sampai job selesai; event yang sudah lewat ikut dikirim.
+
+    Setiap event membawa `id` berurutan sehingga klien bisa menyambung ulang lewat header
+    Last-Event-ID (atau query `from`) tanpa menerima event yang sama dua kali.
+    """
+    try:
+        job_queue.get(job_id)
+    except KeyError:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+
+    last_event_id = request.headers.get("Last-Event-ID")
+    try:
+        start = (
+            int(last_event_id) + 1
+            if last_event_id is not None
+            else request.args.get("from", 0, type=int)
+        )
+    except ValueError:
+        start = 0
+
+    def generate():
+        for item in job_queue.follow(job_id, start=start):
+            if item is None:
+                yield ": keepalive\n\n"
+                continue
+            event_id, event = item
+            yield f"id: {event_id}\ndata: {event}\n\n"
+
+    return sse_response(generate())
+
+
+@app.route("/datasets", methods=["GET"])
+def list_datasets():
+    """
+    Daftar dataset terdaftar yang bisa dirujuk lewat `dataset_id`.
+    """
+    return jsonify({"datasets": dataset_registry.describe()})
+
+
+@app.route("/datasets/<dataset_id>/build", methods=["POST"])
+def build_dataset(dataset_id):
+    """
+    Endpoint admin: konversi ulang CSV dataset ke kolom biner (butuh DATASET_ADMIN_TOKEN).
+    """
+    token = os.getenv("DATASET_ADMIN_TOKEN")
+    if not token or not hmac.compare_digest(
+        request.headers.get("X-Admin-Token", ""), token
+    ):
+        return jsonify({"error": "Forbidden"}), 403
+    if dataset_id not in dataset_registry:
+        return jsonify({"error": f"Unknown dataset: {dataset_id}"}), 404
+
+    try:
+        manifest = dataset_registry.build(dataset_id, force=True)
+    except (DependencyError, TaskFileError) as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(manifest)
 
 
 @app.route("/health/simple")
@@ -643,5 +943,6 @@ def get_algorithms():
 
 
 if __name__ == "__main__":
+    dataset_registry.build_all()
     port = int(os.getenv("PORT", 5001))
     app.run(debug=True, host="0.0.0.0", port=port, threaded=True)
@@ -0,0 +1,310 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from ingestion import ingest_tasks, read_task_file
+from models.task_table import TaskTable
+
+_POLA_ID = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+class DatasetRegistry:
+    """
+    Registry dataset tugas statis yang dirujuk lewat `dataset_id` (nama file CSV tanpa .csv).
+
+    Setiap CSV dikonversi sekali (saat startup atau lewat panggilan admin) menjadi kolom
+    biner .npy hasil ingestion default: ID, durasi, prioritas, biaya, dan dependensi dalam
+    format CSR. Request berikutnya hanya me-memory-map kolom tersebut secara read-only, jadi
+    semua worker gunicorn berbagi page cache yang sama tanpa parsing JSON/CSV ulang.
+
+    Setiap konversi ditulis ke direktori `<dataset_id>/<build_id>/`; manifest.json di
+    `<dataset_id>/` adalah penunjuk ke build aktif dan diganti atomik (os.replace), jadi
+    path build yang sedang dibaca worker lain tidak pernah hilang saat rebuild.
+    """
+
+    VERSI_FORMAT = 2
+    KOLOM = ("ids", "durasi", "prioritas", "biaya", "dep_indptr", "dep_indices")
+
+    # Build lama (selain aktif dan sebelumnya) baru dihapus setelah masa tenggang ini (detik)
+    MASA_TENGGANG_BUILD = 300
+
+    def __init__(self, data_dir, cache_dir):
+        """
+        Inisialisasi registry untuk CSV di `data_dir` dengan hasil konversi di `cache_dir`.
+        """
+        self.data_dir = data_dir
+        self.cache_dir = cache_dir
+        self._mmap = {}
+        self._tabel = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Bangun registry dari variabel lingkungan DATASET_DIR dan DATASET_CACHE_DIR.
+        """
+        bawaan = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+        )
+        return cls(
+            data_dir=os.getenv("DATASET_DIR", bawaan),
+            cache_dir=os.getenv(
+                "DATASET_CACHE_DIR",
+                os.path.join(tempfile.gettempdir(), "swarm-wave-datasets"),
+            ),
+        )
+
+    def available(self):
+        """
+        Daftar dataset_id yang tersedia (CSV di direktori data).
+        """
+        if not os.path.isdir(self.data_dir):
+            return []
+        return sorted(
+            nama[: -len(".csv")]
+            for nama in os.listdir(self.data_dir)
+            if nama.endswith(".csv") and _POLA_ID.match(nama[: -len(".csv")])
+        )
+
+    def source_path(self, dataset_id):
+        """
+        Path CSV sumber untuk `dataset_id`; KeyError jika tidak dikenal.
+        """
+        if not dataset_id or not _POLA_ID.match(dataset_id):
+            raise KeyError(dataset_id)
+        path = os.path.join(self.data_dir, f"{dataset_id}.csv")
+        if not os.path.isfile(path):
+            raise KeyError(dataset_id)
+        return path
+
+    def __contains__(self, dataset_id):
+        try:
+            self.source_path(dataset_id)
+        except KeyError:
+            return False
+        return True
+
+    def _direktori(self, dataset_id):
+        return os.path.join(self.cache_dir, dataset_id)
+
+    def _direktori_build(self, dataset_id, build_id):
+        return os.path.join(self.cache_dir, dataset_id, build_id)
+
+    @staticmethod
+    def _stempel(path):
+        info = os.stat(path)
+        return {"size": info.st_size, "mtime_ns": info.st_mtime_ns}
+
+    def manifest(self, dataset_id):
+        """
+        Manifest hasil konversi jika masih sesuai dengan CSV sumber, atau None.
+        """
+        path = os.path.join(self._direktori(dataset_id), "manifest.json")
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            manifest.get("version") != self.VERSI_FORMAT
+            or manifest.get("source") != self._stempel(self.source_path(dataset_id))
+        ):
+            return None
+        return manifest
+
+    def build(self, dataset_id, force=False):
+        """
+        Konversi CSV `dataset_id` ke kolom .npy di direktori build baru, lalu pasang penunjuknya.
+
+        Dilewati jika hasil konversi masih sesuai dengan sumber, kecuali `force`.
+        """
+        sumber = self.source_path(dataset_id)
+        if not force:
+            manifest = self.manifest(dataset_id)
+            if manifest is not None:
+                return manifest
+
+        stempel = self._stempel(sumber)
+        tabel, dependensi_ditemukan = ingest_tasks(read_task_file(sumber, "csv"))
+
+        # Dependensi per baris -> CSR atas slot ID (ghost sudah difilter ingestion)
+        jumlah_dep = [len(deps) for deps in tabel.dependensi]
+        dep_indptr = np.concatenate(([0], np.cumsum(jumlah_dep))).astype(np.int64)
+        dep_indices = np.array(
+            [tabel.indeks[d] for deps in tabel.dependensi for d in deps], dtype=np.int64
+        )
+        kolom = {
+            "ids": np.array(tabel.ids, dtype=str),
+            "durasi": tabel.durasi,
+            "prioritas": tabel.prioritas,
+            "biaya": tabel.biaya,
+            "dep_indptr": dep_indptr,
+            "dep_indices": dep_indices,
+        }
+        manifest = {
+            "version": self.VERSI_FORMAT,
+            "dataset_id": dataset_id,
+            "build_id": uuid.uuid4().hex,
+            "source": stempel,
+            "rows": len(tabel),
+            "dependencies_found": bool(dependensi_ditemukan),
+            "columns": list(self.KOLOM),
+        }
+
+        direktori = self._direktori(dataset_id)
+        os.makedirs(direktori, exist_ok=True)
+        sementara = tempfile.mkdtemp(prefix=".build.", dir=direktori)
+        try:
+            for nama, array in kolom.items():
+                np.save(os.path.join(sementara, f"{nama}.npy"), array)
+            os.rename(sementara, self._direktori_build(dataset_id, manifest["build_id"]))
+        finally:
+            shutil.rmtree(sementara, ignore_errors=True)
+        self._pasang(dataset_id, manifest)
+        return manifest
+
+    def _pasang(self, dataset_id, manifest):
+        """
+        Arahkan penunjuk manifest.json ke build baru secara atomik, lalu bersihkan build lama.
+
+        Build aktif, build sebelumnya, dan build yang lebih muda dari MASA_TENGGANG_BUILD
+        (misal build proses lain yang belum dipasang) tidak dihapus.
+        """
+        direktori = self._direktori(dataset_id)
+        path = os.path.join(direktori, "manifest.json")
+        simpan = {manifest["build_id"]}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                simpan.add(json.load(f).get("build_id"))
+        except (OSError, ValueError):
+            pass
+
+        sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(sementara, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        os.replace(sementara, path)
+
+        batas = time.time() - self.MASA_TENGGANG_BUILD
+        for nama in os.listdir(direktori):
+            lama = os.path.join(direktori, nama)
+            if nama in simpan or nama.startswith(".") or not os.path.isdir(lama):
+                continue
+            try:
+                if os.stat(lama).st_ctime < batas:
+                    shutil.rmtree(lama, ignore_errors=True)
+            except OSError:
+                pass
+
+    def build_all(self, force=False):
+        """
+        Konversi semua dataset yang tersedia; dataset yang gagal dilaporkan, bukan dilempar.
+        """
+        hasil = {}
+        for dataset_id in self.available():
+            try:
+                hasil[dataset_id] = self.build(dataset_id, force=force)
+            except (OSError, ValueError) as e:
+                print(f"Peringatan: Dataset {dataset_id} gagal dikonversi: {e}")
+        return hasil
+
+    def columns(self, dataset_id):
+        """
+        Kolom dataset sebagai array memory-map read-only (dikonversi dulu jika perlu).
+        """
+        for percobaan in range(2):
+            manifest = self.manifest(dataset_id) or self.build(dataset_id)
+            with self._lock:
+                tersimpan = self._mmap.get(dataset_id)
+                if tersimpan is not None and tersimpan[0] == manifest["build_id"]:
+                    return manifest, tersimpan[1]
+
+            direktori = self._direktori_build(dataset_id, manifest["build_id"])
+            try:
+                kolom = {
+                    nama: np.load(os.path.join(direktori, f"{nama}.npy"), mmap_mode="r")
+                    for nama in self.KOLOM
+                }
+            except FileNotFoundError:
+                # Build ini baru saja digantikan dan dibersihkan proses lain: baca ulang penunjuk
+                if percobaan:
+                    raise
+                continue
+            with self._lock:
+                self._mmap[dataset_id] = (manifest["build_id"], kolom)
+            return manifest, kolom
+
+    def ingest(self, dataset_id, dependency_col="", enable_dependencies=None):
+        """
+        Padanan ingest_tasks untuk dataset terdaftar; mengembalikan (tabel, enable_dependencies).
+
+        Kolom dependensi kustom tidak ikut dikonversi, jadi untuk `dependency_col` CSV sumber
+        dibaca dan di-ingest ulang.
+        """
+        if dependency_col:
+            return ingest_tasks(
+                read_task_file(self.source_path(dataset_id), "csv"),
+                dependency_col,
+                enable_dependencies,
+            )
+
+        manifest, kolom = self.columns(dataset_id)
+        tanpa_dependensi = enable_dependencies is False
+        aktif = not tanpa_dependensi and (
+            manifest["dependencies_found"] or bool(enable_dependencies)
+        )
+
+        # Tabel (list ID, dependensi per baris, indeks ID) dibangun sekali per build per
+        # worker, bukan per request; scheduler hanya membaca tabel ini
+        with self._lock:
+            tersimpan = self._tabel.get(dataset_id)
+            if tersimpan is not None and tersimpan[0] == manifest["build_id"]:
+                tabel = tersimpan[1].get(tanpa_dependensi)
+                if tabel is not None:
+                    return tabel, aktif
+
+        ids = kolom["ids"].tolist()
+        if tanpa_dependensi:
+            dependensi = [[] for _ in ids]
+        else:
+            indptr = kolom["dep_indptr"].tolist()
+            penunjuk = [ids[j] for j in kolom["dep_indices"].tolist()]
+            dependensi = [penunjuk[indptr[i] : indptr[i + 1]] for i in range(len(ids))]
+
+        tabel = TaskTable(
+            ids,
+            kolom["durasi"],
+            kolom["prioritas"],
+            biaya=kolom["biaya"],
+            dependensi=dependensi,
+        )
+        with self._lock:
+            tersimpan = self._tabel.get(dataset_id)
+            if tersimpan is None or tersimpan[0] != manifest["build_id"]:
+                tersimpan = (manifest["build_id"], {})
+                self._tabel[dataset_id] = tersimpan
+            tersimpan[1][tanpa_dependensi] = tabel
+        return tabel, aktif
+
+    def describe(self):
+        """
+        Ringkasan semua dataset (untuk endpoint daftar dataset).
+        """
+        daftar = []
+        for dataset_id in self.available():
+            manifest = self.manifest(dataset_id)
+            daftar.append(
+                {
+                    "dataset_id": dataset_id,
+                    "built": manifest is not None,
+                    "rows": manifest["rows"] if manifest else None,
+                    "dependencies_found": manifest["dependencies_found"] if manifest else None,
+                }
+            )
+        return daftar
@@ -60,6 +60,10 @@ def on_reload(server):
 
 def when_ready(server):
     """Called just after the server is started."""
+    # Konversi dataset di master sebelum worker di-fork; worker cukup memory-map hasilnya
+    from dataset_registry import DatasetRegistry
+    datasets = DatasetRegistry.from_env().build_all()
+    print(f"📦 Datasets ready: {', '.join(datasets) or 'none'}")
     print(f"✅ Server is ready. Listening on {bind}")
     print(f"   Workers: {workers} | Threads per worker: {threads}")
     print(f"   Timeout: {timeout}s | Worker class: {worker_class}")
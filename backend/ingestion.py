@@ -0,0 +1,360 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    _ENGINE_CSV = "pyarrow"
+except ImportError:
+    _ENGINE_CSV = "c"
+
+from models.graph import ada_siklus
+from models.task_table import TaskTable
+from models.utils import safe_convert_to_float
+
+# Alias kolom per field, urutan = prioritas (sama dengan normalisasi per baris sebelumnya)
+KANDIDAT_ID = ["Task_ID", "TaskID", "task_id", "id", "ID", "name", "Name"]
+KANDIDAT_DURASI = [
+    "Duration",
+    "duration",
+    "length",
+    "Length",
+    "Weight",
+    "weight",
+    "execution_time",
+    "Execution_Time (s)",
+]
+KANDIDAT_BIAYA = ["Cost", "cost", "price", "Price"]
+KANDIDAT_PRIORITAS = ["Priority", "priority"]
+KANDIDAT_DEPENDENSI = [
+    "dependencies",
+    "Depends_On_Task_ID",
+    "depends_on",
+    "prerequisites",
+    "requires",
+    "dependensi",
+    "Dependensi",
+]
+
+_NILAI_KOSONG = ["null", "nan", "none"]
+
+# Format file upload yang didukung, dikenali dari ekstensi atau content type
+FORMAT_EKSTENSI = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+FORMAT_CONTENT_TYPE = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "text/plain": "csv",
+    "application/vnd.apache.parquet": "parquet",
+    "application/x-parquet": "parquet",
+    "application/vnd.apache.arrow.file": "arrow",
+}
+
+# Jenis nilai sel dependensi
+_LAINNYA, _TEKS, _DAFTAR, _ANGKA = 0, 1, 2, 3
+
+
+class DependencyError(ValueError):
+    """
+    Dependensi tugas tidak valid (misal siklus) sehingga simulasi tidak bisa dijalankan.
+    """
+
+
+class TaskFileError(ValueError):
+    """
+    File tugas yang di-upload tidak didukung atau tidak bisa dibaca.
+    """
+
+
+def detect_file_format(filename=None, content_type=None, format_file=None):
+    """
+    Tentukan format file upload: parameter eksplisit, lalu ekstensi, lalu content type.
+
+    Default ke CSV jika tidak ada petunjuk sama sekali.
+    """
+    if format_file:
+        format_file = format_file.lower()
+        if format_file not in ("csv", "parquet", "arrow"):
+            raise TaskFileError(f"Unsupported file format: {format_file}")
+        return format_file
+    if filename:
+        ekstensi = os.path.splitext(filename)[1].lower()
+        if ekstensi in FORMAT_EKSTENSI:
+            return FORMAT_EKSTENSI[ekstensi]
+    return FORMAT_CONTENT_TYPE.get((content_type or "").lower(), "csv")
+
+
+def read_task_file(sumber, format_file="csv"):
+    """
+    Baca file tugas (path atau file-like) menjadi DataFrame dengan reader kolumnar.
+
+    CSV memakai engine pyarrow jika terpasang (fallback engine C pandas); Parquet dan
+    Arrow IPC membutuhkan pyarrow.
+    """
+    try:
+        if format_file == "csv":
+            return pd.read_csv(sumber, engine=_ENGINE_CSV)
+
+        # Reader biner butuh sumber yang bisa di-seek (body request tidak)
+        if hasattr(sumber, "read") and not (hasattr(sumber, "seekable") and sumber.seekable()):
+            sumber = io.BytesIO(sumber.read())
+        if format_file == "parquet":
+            return pd.read_parquet(sumber)
+        if format_file == "arrow":
+            return pd.read_feather(sumber)
+    except ImportError as e:
+        raise TaskFileError(f"{format_file} support requires pyarrow") from e
+    except (ValueError, OSError, pd.errors.ParserError) as e:
+        raise TaskFileError(f"Could not read {format_file} file: {e}") from e
+    raise TaskFileError(f"Unsupported file format: {format_file}")
+
+
+def _angka(series):
+    """
+    Konversi kolom ke float64 secara vektor; nilai tidak valid menjadi NaN.
+    """
+    try:
+        return pd.to_numeric(series, errors="coerce").astype(np.float64)
+    except (TypeError, ValueError):
+        # Kolom berisi objek yang tidak bisa diproses to_numeric (list, dict, ...)
+        return series.map(lambda v: safe_convert_to_float(v, np.nan)).astype(np.float64)
+
+
+def _id_dari_angka(angka):
+    """
+    Angka -> string ID tanpa '.0' (dipotong ke integer seperti normalize_id).
+    """
+    return np.trunc(angka).astype(np.int64).astype(str)
+
+
+def _normalisasi_id(series):
+    """
+    Versi kolom dari normalize_id: angka menjadi string integer, teks di-strip.
+    """
+    hasil = pd.Series(None, index=series.index, dtype=object)
+    ada = series.notna().to_numpy()
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        angka = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        teks = np.zeros(len(series), dtype=bool)
+    else:
+        teks = series.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+        if teks.any():
+            hasil[teks] = series[teks].str.strip()
+        angka = _angka(series.where(~teks)).to_numpy()
+
+    bulat = ada & ~teks & np.isfinite(angka) & (np.abs(angka) < 2**63)
+    if bulat.any():
+        hasil[bulat] = _id_dari_angka(angka[bulat])
+
+    # Objek lain (dict, inf, ...) dipakai apa adanya sebagai string
+    sisa = ada & ~teks & ~bulat
+    if sisa.any():
+        hasil[sisa] = series[sisa].map(lambda v: str(v).strip())
+    return hasil
+
+
+def _resolve_id(frame):
+    """
+    ID tugas: alias pertama yang terisi, fallback nomor baris (1-based).
+    """
+    hasil = pd.Series(None, index=frame.index, dtype=object)
+    for kolom in KANDIDAT_ID:
+        if kolom not in frame.columns:
+            continue
+        kosong = hasil.isna()
+        if not kosong.any():
+            break
+        nilai = _normalisasi_id(frame[kolom])
+        nilai = nilai.where(nilai != "")
+        hasil = hasil.where(~kosong, nilai)
+
+    kosong = hasil.isna().to_numpy()
+    if kosong.any():
+        hasil[kosong] = (np.flatnonzero(kosong) + 1).astype(str)
+    return hasil.to_numpy(dtype=object)
+
+
+def _resolve_durasi(frame):
+    """
+    Durasi: alias pertama dengan nilai > 0, default 1.0.
+    """
+    hasil = np.full(len(frame), np.nan)
+    for kolom in KANDIDAT_DURASI:
+        if kolom in frame.columns:
+            nilai = _angka(frame[kolom]).to_numpy()
+            ambil = np.isnan(hasil) & (nilai > 0)
+            hasil[ambil] = nilai[ambil]
+    hasil[np.isnan(hasil)] = 1.0
+    return hasil
+
+
+def _resolve_biaya(frame):
+    """
+    Biaya: alias pertama yang ada dengan nilai >= 0 (nilai tidak valid dianggap 0).
+    """
+    hasil = np.zeros(len(frame))
+    selesai = np.zeros(len(frame), dtype=bool)
+    for kolom in KANDIDAT_BIAYA:
+        if kolom in frame.columns:
+            ada = frame[kolom].notna().to_numpy()
+            nilai = np.nan_to_num(_angka(frame[kolom]).to_numpy(), nan=0.0)
+            ambil = ~selesai & ada
+            hasil[ambil] = nilai[ambil]
+            selesai |= ambil & (nilai >= 0)
+    return hasil
+
+
+def _resolve_prioritas(frame):
+    """
+    Prioritas: alias pertama yang terisi, nilai tidak valid atau kosong menjadi 1.
+    """
+    hasil = np.full(len(frame), np.nan)
+    terpilih = np.zeros(len(frame), dtype=bool)
+    for kolom in KANDIDAT_PRIORITAS:
+        if kolom in frame.columns:
+            ada = frame[kolom].notna().to_numpy()
+            ambil = ~terpilih & ada
+            hasil[ambil] = _angka(frame[kolom]).to_numpy()[ambil]
+            terpilih |= ada
+    hasil[np.isnan(hasil)] = 1.0
+    return hasil
+
+
+def _pilih_kolom_dependensi(frame, dependency_col, enable_dependencies):
+    """
+    Nilai mentah dependensi per baris: kolom pilihan user, lalu alias pertama yang terisi.
+    """
+    mentah = pd.Series(None, index=frame.index, dtype=object)
+    if dependency_col and dependency_col in frame.columns:
+        mentah = frame[dependency_col].astype(object)
+    if enable_dependencies is not False:
+        for kolom in KANDIDAT_DEPENDENSI:
+            if kolom in frame.columns:
+                mentah = mentah.where(mentah.notna(), frame[kolom].astype(object))
+    return mentah
+
+
+def _jenis_dependensi(nilai):
+    if isinstance(nilai, str):
+        return _TEKS
+    if isinstance(nilai, (list, tuple)):
+        return _DAFTAR
+    if isinstance(nilai, (int, float, np.number)):
+        return _ANGKA
+    return _LAINNYA
+
+
+def _token_dependensi(mentah):
+    """
+    Pecah nilai dependensi menjadi array (baris, token ID) tanpa parsing per baris.
+
+    Semua string "1,2;3" digabung dan dipecah sekali, lalu token numerik dinormalisasi
+    secara vektor ("2.0" -> "2"); list di-explode dan elemennya dinormalisasi seperti
+    normalize_id; angka tunggal menjadi satu token.
+    """
+    mentah = mentah[mentah.notna()]
+    baris_bagian = [np.zeros(0, dtype=np.int64)]
+    token_bagian = [np.zeros(0, dtype=object)]
+    if mentah.empty:
+        return baris_bagian[0], token_bagian[0]
+    jenis = mentah.map(_jenis_dependensi).to_numpy()
+
+    teks = mentah[jenis == _TEKS]
+    if not teks.empty:
+        nilai_teks = teks.to_numpy(dtype=str)
+        jumlah = np.char.count(nilai_teks, ",") + np.char.count(nilai_teks, ";") + 1
+        token = np.array(
+            [t.strip() for t in ",".join(nilai_teks).replace(";", ",").split(",")],
+            dtype=object,
+        )
+        baris = np.repeat(teks.index.to_numpy(dtype=np.int64), jumlah)
+        simpan = (token != "") & ~pd.Series(token).str.lower().isin(_NILAI_KOSONG).to_numpy()
+        token, baris = token[simpan], baris[simpan]
+
+        angka = _angka(pd.Series(token, dtype=object)).to_numpy()
+        bulat = np.isfinite(angka) & (angka == np.trunc(angka)) & (np.abs(angka) < 2**63)
+        if bulat.any():
+            token[bulat] = _id_dari_angka(angka[bulat])
+        baris_bagian.append(baris)
+        token_bagian.append(token)
+
+    elemen = pd.concat([mentah[jenis == _DAFTAR].explode(), mentah[jenis == _ANGKA]])
+    elemen = elemen[elemen.notna()]
+    if not elemen.empty:
+        kosong = elemen.map(
+            lambda v: isinstance(v, str) and v.lower() in _NILAI_KOSONG + [""]
+        ).to_numpy(dtype=bool)
+        elemen = elemen[~kosong]
+        baris_bagian.append(elemen.index.to_numpy(dtype=np.int64))
+        token_bagian.append(_normalisasi_id(elemen).to_numpy(dtype=object))
+
+    # Urutkan per baris (stabil, urutan token dalam satu baris dipertahankan)
+    baris = np.concatenate(baris_bagian)
+    token = np.concatenate(token_bagian)
+    urutan = np.argsort(baris, kind="stable")
+    return baris[urutan], token[urutan]
+
+
+def ingest_tasks(tasks, dependency_col="", enable_dependencies=None):
+    """
+    Normalisasi payload tugas (list dict atau DataFrame) menjadi TaskTable secara kolumnar.
+
+    Alias kolom di-resolve sekali per kolom, angka dikonversi vektor, dan dependensi diparse
+    sekali, difilter dari ghost/self-dependency, lalu divalidasi (siklus -> DependencyError).
+    Mengembalikan (tabel, enable_dependencies); dependensi di tabel langsung dipakai
+    scheduler tanpa parsing ulang.
+    """
+    frame = tasks if isinstance(tasks, pd.DataFrame) else pd.DataFrame(list(tasks))
+    frame = frame.reset_index(drop=True)
+    jumlah_tugas = len(frame)
+
+    ids = _resolve_id(frame)
+    durasi = _resolve_durasi(frame)
+    biaya = _resolve_biaya(frame)
+    prioritas = _resolve_prioritas(frame)
+
+    baris, nilai = _token_dependensi(
+        _pilih_kolom_dependensi(frame, dependency_col, enable_dependencies)
+    )
+
+    # Auto-enable dependensi jika data ditemukan
+    if len(nilai) > 0:
+        enable_dependencies = True
+    enable_dependencies = bool(enable_dependencies)
+
+    # Filter ghost dependencies dan self-dependency
+    valid = pd.Index(nilai).isin(ids) & (nilai != ids[baris])
+    baris, nilai = baris[valid], nilai[valid]
+
+    # Token sudah terurut per baris, jadi cukup dipotong menurut jumlah token per baris
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(baris, minlength=jumlah_tugas))))
+    daftar = nilai.tolist()
+    indptr = indptr.tolist()
+    tabel = TaskTable(
+        ids,
+        durasi,
+        prioritas,
+        biaya=biaya,
+        dependensi=[daftar[indptr[i] : indptr[i + 1]] for i in range(jumlah_tugas)],
+    )
+
+    # Validasi siklus atas indeks integer (ID duplikat memakai baris terakhir)
+    if enable_dependencies and len(baris) > 0:
+        peta = pd.Index(list(tabel.indeks))
+        slot_id = np.fromiter(tabel.indeks.values(), dtype=np.int64, count=len(peta))
+        asal = slot_id[peta.get_indexer(nilai)]
+        terakhir = tabel.slot[baris] == baris
+        if ada_siklus(jumlah_tugas, asal[terakhir], baris[terakhir]):
+            raise DependencyError("Circular dependency detected")
+
+    return tabel, enable_dependencies
@@ -0,0 +1,297 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures.process import BrokenProcessPool
+
+from models.parallel import create_pool
+
+_POLA_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _baca_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tulis_json(path, nilai):
+    """
+    Tulis JSON secara atomik (file sementara lalu rename) agar pembaca tidak melihat separuh isi.
+    """
+    sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(sementara, "w", encoding="utf-8") as f:
+        json.dump(nilai, f)
+    os.replace(sementara, path)
+
+
+def _proses_hidup(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _jalankan_job(direktori, fungsi, args, interval_progress):
+    """
+    Dijalankan di proses worker: iterasi event JSON dari `fungsi(*args)` ke events.jsonl.
+
+    Status ditulis sebagai running saat mulai, progress iterasi terakhir diperbarui paling
+    sering tiap `interval_progress` detik, lalu done (dengan event terakhir sebagai hasil)
+    atau failed. Semua event sudah di-flush sebelum status akhir ditulis.
+    """
+    path_status = os.path.join(direktori, "status.json")
+    status = _baca_json(path_status)
+    status.update(
+        {"status": JobQueue.RUNNING, "started_at": time.time(), "worker_pid": os.getpid()}
+    )
+    _tulis_json(path_status, status)
+
+    terakhir = None
+    tulis_berikutnya = 0.0
+    with open(os.path.join(direktori, "events.jsonl"), "a", encoding="utf-8") as f:
+        try:
+            for event in fungsi(*args):
+                f.write(f"{event}\n")
+                f.flush()
+                status["events"] += 1
+                terakhir = json.loads(event)
+                if terakhir.get("type") == "iteration":
+                    status["progress"] = {
+                        k: terakhir.get(k) for k in ("iteration", "makespan", "gap")
+                    }
+                    if time.time() >= tulis_berikutnya:
+                        _tulis_json(path_status, status)
+                        tulis_berikutnya = time.time() + interval_progress
+            status.update({"status": JobQueue.DONE, "result": terakhir})
+        except Exception as e:
+            error = {
+                "type": "error",
+                "message": str(e),
+                "traceback": traceback.format_exc(),
+            }
+            f.write(f"{json.dumps(error)}\n")
+            f.flush()
+            status["events"] += 1
+            status.update({"status": JobQueue.FAILED, "error": str(e)})
+
+    status["finished_at"] = time.time()
+    _tulis_json(path_status, status)
+
+
+class JobQueue:
+    """
+    Antrean job simulasi asinkron di atas process pool lokal, tanpa broker eksternal.
+
+    Setiap job mendapat ID dan direktori sendiri di `job_dir`: status.json (ditulis atomik)
+    dan events.jsonl (satu event JSON per baris, ditambahkan worker selama job berjalan).
+    Karena state job ada di disk, semua worker gunicorn di host yang sama bisa melayani
+    polling dan stream job mana pun, bukan hanya worker yang menerima submit.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    SELESAI = (DONE, FAILED)
+
+    def __init__(self, job_dir, max_workers=2, ttl_seconds=86400, progress_interval=0.5):
+        """
+        Inisialisasi antrean dengan `max_workers` proses; job lebih tua dari TTL dipangkas.
+        """
+        self.job_dir = job_dir
+        self.max_workers = max(1, int(max_workers))
+        self.ttl_seconds = float(ttl_seconds)
+        self.progress_interval = float(progress_interval)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pangkas_terakhir = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """
+        Bangun antrean dari variabel lingkungan JOB_DIR, JOB_WORKERS, dan JOB_TTL.
+        """
+        return cls(
+            job_dir=os.getenv(
+                "JOB_DIR", os.path.join(tempfile.gettempdir(), "swarm-wave-jobs")
+            ),
+            max_workers=int(os.getenv("JOB_WORKERS", "2")),
+            ttl_seconds=float(os.getenv("JOB_TTL", "86400")),
+        )
+
+    def _direktori(self, job_id):
+        """
+        Direktori job; KeyError jika ID tidak valid atau job tidak dikenal.
+        """
+        if not job_id or not _POLA_ID.match(job_id):
+            raise KeyError(job_id)
+        direktori = os.path.join(self.job_dir, job_id)
+        if not os.path.isfile(os.path.join(direktori, "status.json")):
+            raise KeyError(job_id)
+        return direktori
+
+    def submit(self, fungsi, args=(), meta=None):
+        """
+        Antrekan `fungsi(*args)` (generator event JSON) ke pool dan kembalikan job ID.
+
+        Pool dibuat dari worker gunicorn yang multi-thread, jadi memakai konteks forkserver
+        (models.parallel.pool_context), bukan fork. `fungsi` dan `args` dikirim lewat pickle
+        dan harus bisa di-pickle; `meta` ikut disimpan di status job.
+        """
+        job_id = uuid.uuid4().hex
+        direktori = os.path.join(self.job_dir, job_id)
+        os.makedirs(direktori)
+        open(os.path.join(direktori, "events.jsonl"), "w").close()
+        status = dict(meta or {})
+        status.update(
+            {
+                "job_id": job_id,
+                "status": self.QUEUED,
+                "created_at": time.time(),
+                "owner_pid": os.getpid(),
+                "events": 0,
+            }
+        )
+        _tulis_json(os.path.join(direktori, "status.json"), status)
+
+        with self._lock:
+            if self._pool is None:
+                self._pool = create_pool(self.max_workers, None, ())
+            pool = self._pool
+        future = pool.submit(
+            _jalankan_job, direktori, fungsi, tuple(args), self.progress_interval
+        )
+        future.add_done_callback(lambda f: self._setelah_job(job_id, pool, f))
+
+        self._pangkas()
+        return job_id
+
+    def _setelah_job(self, job_id, pool, future):
+        """
+        Tandai job gagal jika worker-nya gagal di luar fungsi job (pickling, proses mati).
+        """
+        error = future.exception()
+        if error is None:
+            return
+        if isinstance(error, BrokenProcessPool):
+            # Pool rusak tidak bisa menerima job baru; submit berikutnya membuat pool baru
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+        try:
+            self._gagalkan(self._direktori(job_id), f"Job worker failed: {error}")
+        except (KeyError, OSError):
+            pass
+
+    def _gagalkan(self, direktori, pesan):
+        """
+        Tulis status failed (plus event error) untuk job yang tidak diselesaikan worker-nya.
+        """
+        path_status = os.path.join(direktori, "status.json")
+        status = _baca_json(path_status)
+        if status["status"] in self.SELESAI:
+            return status
+        with open(os.path.join(direktori, "events.jsonl"), "a", encoding="utf-8") as f:
+            f.write(f"{json.dumps({'type': 'error', 'message': pesan})}\n")
+        status.update(
+            {
+                "status": self.FAILED,
+                "error": pesan,
+                "events": status.get("events", 0) + 1,
+                "finished_at": time.time(),
+            }
+        )
+        _tulis_json(path_status, status)
+        return status
+
+    def get(self, job_id):
+        """
+        Status job (queued/running/done/failed, progress, hasil atau error); KeyError jika tidak dikenal.
+
+        Job yang prosesnya sudah mati tanpa menyelesaikan job (misal worker gunicorn di-restart
+        saat job masih antre) dilaporkan failed, bukan running selamanya.
+        """
+        direktori = self._direktori(job_id)
+        status = _baca_json(os.path.join(direktori, "status.json"))
+        if status["status"] == self.QUEUED and not _proses_hidup(status.get("owner_pid")):
+            status = self._gagalkan(direktori, "Job was lost before it started")
+        elif status["status"] == self.RUNNING and not _proses_hidup(status.get("worker_pid")):
+            status = self._gagalkan(direktori, "Job worker exited before finishing")
+        return status
+
+    def follow(self, job_id, start=0, interval=0.2, keepalive=15.0):
+        """
+        Ikuti event job mulai indeks `start` sampai job selesai.
+
+        Yield (indeks, event JSON) per event, atau None tiap `keepalive` detik tanpa event baru.
+        """
+        direktori = self._direktori(job_id)
+        indeks = 0
+        diam_sejak = time.time()
+        with open(os.path.join(direktori, "events.jsonl"), "r", encoding="utf-8") as f:
+            while True:
+                posisi = f.tell()
+                baris = f.readline()
+                if baris.endswith("\n"):
+                    if indeks >= start:
+                        yield indeks, baris[:-1]
+                    indeks += 1
+                    diam_sejak = time.time()
+                    continue
+
+                # Baris terakhir belum lengkap ditulis worker: baca ulang nanti
+                f.seek(posisi)
+                if self.get(job_id)["status"] in self.SELESAI:
+                    # Semua event sudah di-flush sebelum status akhir ditulis
+                    for baris in f:
+                        if indeks >= start:
+                            yield indeks, baris.rstrip("\n")
+                        indeks += 1
+                    return
+                if time.time() - diam_sejak >= keepalive:
+                    yield None
+                    diam_sejak = time.time()
+                time.sleep(interval)
+
+    # Jeda minimum antar pemangkasan (detik); submit batch besar tidak memindai ulang tiap job
+    interval_pangkas = 60.0
+
+    def _pangkas(self):
+        """
+        Hapus direktori job yang sudah selesai dan lebih tua dari TTL (paling sering sekali per
+        `interval_pangkas`).
+        """
+        sekarang = time.time()
+        with self._lock:
+            if sekarang - self._pangkas_terakhir < self.interval_pangkas:
+                return
+            self._pangkas_terakhir = sekarang
+
+        batas = sekarang - self.ttl_seconds
+        for nama in os.listdir(self.job_dir):
+            direktori = os.path.join(self.job_dir, nama)
+            try:
+                status = _baca_json(os.path.join(direktori, "status.json"))
+            except (OSError, ValueError):
+                continue
+            if status["status"] in self.SELESAI and status.get("finished_at", 0) < batas:
+                shutil.rmtree(direktori, ignore_errors=True)
+
+    def shutdown(self, wait=True):
+        """
+        Hentikan pool (job yang sedang berjalan ditunggu jika `wait`).
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
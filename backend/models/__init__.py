@@ -1,9 +1,17 @@
 from .aco import ACO_MultiAgent_Scheduler, ACOScheduler
 from .base import MultiAgentScheduler
+from .evaluator import GreedyEvaluator
+from .graph import DependencyGraph
+from .pheromone import SparsePheromone
+from .task_table import TaskTable
 from .pso import PSO_MultiAgent_Scheduler, PSOScheduler
 
 __all__ = [
     'MultiAgentScheduler',
+    'GreedyEvaluator',
+    'DependencyGraph',
+    'SparsePheromone',
+    'TaskTable',
     'ACO_MultiAgent_Scheduler',
     'ACOScheduler',
     'PSO_MultiAgent_Scheduler',
@@ -1,9 +1,51 @@
+import copy
 import numpy as np
-import random
 import json
 import pandas as pd
 import time
 from .base import MultiAgentScheduler
+from .parallel import (
+    SharedArray,
+    clamp_workers,
+    create_pool,
+    restore_scheduler,
+    split_counts,
+    worker_state,
+)
+from .pheromone import SparsePheromone
+
+# State scheduler di dalam proses worker (diisi sekali oleh initializer pool)
+_WORKER = {}
+
+
+def _init_colony_worker(kelas, state, feromon, spesifikasi):
+    """
+    Initializer worker: rekonstruksi scheduler dan tempel feromon dari shared memory.
+    """
+    scheduler = restore_scheduler(kelas, state)
+    shared = [SharedArray.attach(s) for s in spesifikasi]
+    if isinstance(feromon, SparsePheromone):
+        feromon.kandidat, feromon.nilai = shared[0].array, shared[1].array
+    else:
+        feromon = shared[0].array
+    scheduler.feromon = feromon
+    _WORKER["scheduler"] = scheduler
+    _WORKER["shared"] = shared
+
+
+def _construct_colony_chunk(args):
+    """
+    Bangun dan evaluasi sebagian semut di worker dengan stream acak turunan dari induk.
+    """
+    jumlah_semut, rng, skala = args
+    scheduler = _WORKER["scheduler"]
+    if skala is not None:
+        scheduler.feromon.faktor, scheduler.feromon.nilai_default = skala
+    scheduler.rng = rng
+    return [
+        (urutan, scheduler.evaluate_sequence(urutan)[:3])
+        for urutan in scheduler.construct_routes(jumlah_semut)
+    ]
 
 
 class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
@@ -11,12 +53,16 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
     Implementasi ACO (Ant Colony Optimization) untuk penjadwalan tugas multi-agen.
     """
 
+    # Pilih tugas berikutnya (Hybrid: 50% Strategy / 50% Random)
+    # Ini untuk mencegah ACO terjebak di jalur deterministik saat dependensi ketat
+    epsilon = 0.5 # 50% exploration
+
     @staticmethod
     def default_heuristic_function(task):
         """
         Fungsi heuristik default: (1.0 / Durasi) * Prioritas.
         """
-        duration = max(task.get("length", 1), 0.1)
+        duration = max(task.get("length", task.get("duration", 1)), 0.1)
         priority = max(task.get("priority", 1), 1.0)
         return (1.0 / duration) * priority
 
@@ -31,13 +77,33 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
         beta=2.0,
         evaporation_rate=0.3,
         pheromone_deposit=100,
+        pheromone_dtype=np.float64,
+        pheromone_mode="dense",
+        candidate_k=20,
+        batch_construction=False,
+        n_workers=1,
+        heuristic_mode="default",
         **kwargs,
     ):
         """
         Inisialisasi Scheduler ACO dengan parameter koloni semut, feromon, dan heuristik.
+
+        `pheromone_dtype` (misal np.float32) mengatur presisi matriks feromon T x T untuk
+        menghemat memori pada jumlah tugas besar. `pheromone_mode="sparse"` mengganti matriks
+        tersebut dengan candidate list `candidate_k` penerus per tugas (SparsePheromone).
+        `batch_construction` membangun rute semua semut sekaligus dengan array (semut x tugas).
+        `n_workers` > 1 membagi semut ke process pool dengan feromon di shared memory; nilainya
+        dibatasi ke jumlah CPU (dan MAX_SOLVER_WORKERS) di sisi server.
+        `heuristic_mode="bottom_level"` memakai bottom-level (lintasan terpanjang ke sink)
+        sebagai heuristik dan urutan lintasan kritis sebagai solusi awal.
         """
+        if pheromone_mode not in ("dense", "sparse"):
+            raise ValueError(f"pheromone_mode tidak dikenal: {pheromone_mode}")
+        if heuristic_mode not in ("default", "bottom_level"):
+            raise ValueError(f"heuristic_mode tidak dikenal: {heuristic_mode}")
         super().__init__(tasks, agents, cost_function, **kwargs)
         self.fungsi_heuristik = self.default_heuristic_function
+        self.mode_heuristik = heuristic_mode
         self.jumlah_semut = n_ants if self.jumlah_tugas > 0 else 0
         self.jumlah_iterasi = n_iterations if self.jumlah_tugas > 0 else 0
         self.alpha, self.beta = alpha, beta
@@ -46,23 +112,65 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
             pheromone_deposit,
         )
         self.prioritize_balance = True
+        self.dtype_feromon = np.dtype(pheromone_dtype)
+        self.mode_feromon = pheromone_mode
+        self.konstruksi_batch = batch_construction
+        self.n_workers = clamp_workers(n_workers)
+        self._pool = None
+        self._feromon_shared = []
 
-        if self.jumlah_tugas > 0:
-            self.feromon = np.ones((self.jumlah_tugas, self.jumlah_tugas))
+        if self.jumlah_tugas > 0 and self.mode_feromon == "sparse":
+            self.feromon = SparsePheromone(
+                self.jumlah_tugas, candidate_k, dtype=self.dtype_feromon
+            )
+            self.heuristik = self.calculate_heuristics()
+        elif self.jumlah_tugas > 0:
+            self.feromon = np.ones(
+                (self.jumlah_tugas, self.jumlah_tugas), dtype=self.dtype_feromon
+            )
             self.heuristik = self.calculate_heuristics()
         else:
-            self.feromon = self.heuristik = np.array([[]])
+            self.feromon = np.array([[]], dtype=self.dtype_feromon)
+            self.heuristik = np.array([])
+
+    def heuristic_values(self):
+        """
+        Nilai heuristik per tugas tujuan, dihitung dari array TaskTable untuk heuristik default.
+
+        Mode bottom-level: Bottom-level * Prioritas, jadi tugas di rantai terpanjang lebih
+        disukai.
+        """
+        if self.mode_heuristik == "bottom_level":
+            return np.maximum(self.bottom_level, 0.1) * np.maximum(
+                self.tabel_tugas.prioritas, 1.0
+            )
+        if self.fungsi_heuristik is self.default_heuristic_function:
+            tabel = self.tabel_tugas
+            return (1.0 / np.maximum(tabel.durasi, 0.1)) * np.maximum(
+                tabel.prioritas, 1.0
+            )
+        return np.array(
+            [self.fungsi_heuristik(tugas) for tugas in self.tugas], dtype=np.float64
+        )
 
     def calculate_heuristics(self):
         """
-        Hitung nilai heuristik statis untuk semua pasangan tugas (jarak/biaya invers).
+        Hitung vektor heuristik statis (panjang T) untuk setiap tugas tujuan.
+
+        Heuristik transisi i -> j hanya bergantung pada tugas j, jadi cukup disimpan sebagai
+        vektor; transisi ke diri sendiri tidak pernah terjadi karena tugas saat ini sudah
+        keluar dari ready set.
+        """
+        return np.ascontiguousarray(self.heuristic_values(), dtype=np.float64)
+
+    def initial_sequence(self):
+        """
+        Solusi awal: urutan indeks (sequential sederhana), atau urutan lintasan kritis
+        (bottom-level tertinggi lebih dulu, topologis) pada mode bottom-level.
         """
-        heuristik = np.zeros((self.jumlah_tugas, self.jumlah_tugas))
-        for i in range(self.jumlah_tugas):
-            for j in range(self.jumlah_tugas):
-                if i != j:
-                    heuristik[i, j] = self.fungsi_heuristik(self.tugas[j])
-        return heuristik
+        if self.mode_heuristik == "bottom_level":
+            return self.graf.priority_order(self.bottom_level)
+        return list(range(self.jumlah_tugas))
 
     def construct_solution(self):
         """
@@ -71,68 +179,132 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
         if self.jumlah_tugas == 0:
             return []
 
-        rute, tersisa = [], set(range(self.jumlah_tugas))
-        selesai = set()
+        rute = []
+        siap_set = self.graf.ready_set()
         saat_ini = None
-        iterasi_maks = self.jumlah_tugas * 2
-        hitung_iterasi = 0
-
-        # Pilih tugas berikutnya (Hybrid: 50% Strategy / 50% Random)
-        # Ini untuk mencegah ACO terjebak di jalur deterministik saat dependensi ketat
-        epsilon = 0.5 # 50% exploration
-
-        while tersisa and hitung_iterasi < iterasi_maks:
-            hitung_iterasi += 1
-            siap = self.get_ready_tasks(list(tersisa), selesai)
+        epsilon = self.epsilon
+        rng = self.rng
 
-            if not siap:
-                min_tidak_terpenuhi = float('inf')
-                tugas_paksa = None
-                for idx in tersisa:
-                    tid = self.peta_tugas_terbalik[idx]
-                    tidak_terpenuhi = len([d for d in self.dependensi.get(tid, []) if d not in selesai])
-                    if tidak_terpenuhi < min_tidak_terpenuhi:
-                        min_tidak_terpenuhi, tugas_paksa = tidak_terpenuhi, idx
-                siap = [tugas_paksa] if tugas_paksa is not None else []
+        while siap_set.jumlah_tersisa:
+            # Ready set dirawat inkremental (Kahn), terurut naik berdasarkan indeks tugas
+            siap = siap_set.siap
 
             if not siap:
-                break
+                # Deadlock: paksa tugas dengan dependensi belum terpenuhi paling sedikit
+                siap = [siap_set.paksa()]
 
             if len(siap) == 1:
                 tugas_berikutnya = siap[0]
-            elif random.random() < epsilon:
+            elif rng.random() < epsilon:
                 # Eksplorasi: Pilih acak murni
-                tugas_berikutnya = random.choice(siap)
+                tugas_berikutnya = siap[rng.integers(len(siap))]
             else:
                 # Eksploitasi: Gunakan Probabilitas (Feromon x Heuristik)
                 if saat_ini is None:
                      # Jika langkah pertama, gunakan random choice sederhana
-                     tugas_berikutnya = random.choice(siap)
+                     tugas_berikutnya = siap[rng.integers(len(siap))]
                 else:
                     try:
                         probabilitas = self.calculate_probabilities(saat_ini, siap)
-                        tugas_berikutnya = np.random.choice(siap, p=probabilitas) if len(siap) > 1 else siap[0]
+                        tugas_berikutnya = int(rng.choice(siap, p=probabilitas))
                     except ValueError:
                          # Fallback jika probabilitas tidak valid
-                         tugas_berikutnya = random.choice(siap)
+                         tugas_berikutnya = siap[rng.integers(len(siap))]
 
             # Update State
             rute.append(tugas_berikutnya)
-            tersisa.remove(tugas_berikutnya)
-            selesai.add(self.peta_tugas_terbalik[tugas_berikutnya])
+            siap_set.selesaikan(tugas_berikutnya)
             saat_ini = tugas_berikutnya
 
-        rute.extend(sorted(tersisa))
         return rute
 
+    def construct_solutions_batched(self, jumlah_semut):
+        """
+        Konstruksi rute semua semut sekaligus, satu langkah untuk seluruh koloni per putaran.
+
+        Ready set, pembagian eksplorasi/eksploitasi dan seleksi roulette disimpan dalam array
+        (semut x tugas) dengan bilangan acak diambil sekaligus. Aturan pemilihannya sama
+        dengan `construct_solution`, tetapi urutan konsumsi RNG berbeda.
+        """
+        if self.jumlah_tugas == 0 or jumlah_semut == 0:
+            return []
+
+        graf = self.graf
+        jumlah_tugas = self.jumlah_tugas
+        semut = np.arange(jumlah_semut)
+        sisa_dep = np.tile(graf.indegree, (jumlah_semut, 1))
+        terjadwal = np.zeros((jumlah_semut, jumlah_tugas), dtype=bool)
+        slot_selesai = np.zeros((jumlah_semut, jumlah_tugas), dtype=bool)
+        rute = np.empty((jumlah_semut, jumlah_tugas), dtype=np.int64)
+        saat_ini = np.full(jumlah_semut, -1, dtype=np.int64)
+        heuristik_beta = self.heuristik ** self.beta
+
+        for langkah in range(jumlah_tugas):
+            siap = (sisa_dep == 0) & ~terjadwal
+
+            # Bobot roulette: eksplorasi (atau langkah pertama) = seragam, selain itu
+            # Feromon^Alpha x Heuristik^Beta
+            acak = self.rng.random((2, jumlah_semut))
+            eksplorasi = (acak[0] < self.epsilon) | (saat_ini < 0)
+            bobot = siap.astype(np.float64)
+            eksploitasi = np.flatnonzero(~eksplorasi)
+            if len(eksploitasi):
+                asal = saat_ini[eksploitasi]
+                if self.mode_feromon == "sparse":
+                    phero = self.feromon.rows(asal)
+                else:
+                    phero = self.feromon[asal].astype(np.float64)
+                bobot[eksploitasi] *= phero ** self.alpha * heuristik_beta
+
+            total = bobot.sum(axis=1)
+            tidak_valid = ~np.isfinite(total) | (total <= 0)
+            bobot[tidak_valid] = siap[tidak_valid]
+            total[tidak_valid] = bobot[tidak_valid].sum(axis=1)
+
+            # Roulette: indeks pertama dengan kumulatif bobot melewati titik acak
+            kumulatif = np.cumsum(bobot, axis=1)
+            titik = acak[1] * total
+            pilihan = np.minimum(
+                (kumulatif <= titik[:, None]).sum(axis=1), jumlah_tugas - 1
+            )
+            # Jaga agar pilihan selalu tugas yang siap (batas akibat pembulatan float)
+            bukan_siap = ~siap[semut, pilihan]
+            if bukan_siap.any():
+                pilihan[bukan_siap] = np.argmax(
+                    siap[bukan_siap] & (kumulatif[bukan_siap] > 0), axis=1
+                )
+
+            # Deadlock: paksa tugas dengan dependensi belum terpenuhi paling sedikit
+            buntu = total == 0
+            if buntu.any():
+                sisa = np.where(terjadwal[buntu], np.iinfo(np.int64).max, sisa_dep[buntu])
+                pilihan[buntu] = np.argmin(sisa, axis=1)
+
+            rute[:, langkah] = pilihan
+            terjadwal[semut, pilihan] = True
+            saat_ini = pilihan
+
+            # Kurangi sisa dependensi penerus untuk slot yang baru pertama kali selesai
+            slot = graf.slot[pilihan]
+            baru = ~slot_selesai[semut, slot]
+            slot_selesai[semut, slot] = True
+            posisi, penerus = graf.gather_successors(slot[baru])
+            if len(penerus):
+                np.subtract.at(sisa_dep, (semut[baru][posisi], penerus), 1)
+
+        return [baris.tolist() for baris in rute]
+
     def calculate_probabilities(self, saat_ini, belum_dikunjungi):
         """
         Hitung probabilitas pemilihan (Feromon^Alpha * Heuristik^Beta).
         """
         if not belum_dikunjungi:
             return np.array([])
-        phero = self.feromon[saat_ini, belum_dikunjungi] ** self.alpha
-        heur = self.heuristik[saat_ini, belum_dikunjungi] ** self.beta
+        if self.mode_feromon == "sparse":
+            phero = self.feromon.values(saat_ini, belum_dikunjungi) ** self.alpha
+        else:
+            phero = self.feromon[saat_ini, belum_dikunjungi] ** self.alpha
+        heur = self.heuristik[belum_dikunjungi] ** self.beta
         keinginan = phero * heur
         total = np.sum(keinginan)
         return (
@@ -141,36 +313,162 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
             else np.ones(len(belum_dikunjungi)) / len(belum_dikunjungi)
         )
 
+    def route_edges(self, rute_list, biaya_list):
+        """
+        Edge deposit semua rute (asal, tujuan, jumlah) dalam urutan loop, termasuk edge
+        penutup rute[-1] -> rute[0].
+        """
+        asal, tujuan, jumlah = [], [], []
+        for rute, biaya in zip(rute_list, biaya_list):
+            if biaya == 0 or len(rute) < 2:
+                continue
+            tambah = self.deposit_feromon / biaya
+            asal.extend(rute)
+            tujuan.extend(rute[1:])
+            tujuan.append(rute[0])
+            jumlah.extend([tambah] * len(rute))
+        return (
+            np.array(asal, dtype=np.int64),
+            np.array(tujuan, dtype=np.int64),
+            np.array(jumlah, dtype=np.float64),
+        )
+
     def update_pheromones(self, rute_list, biaya_list):
         """
         Update feromon: Evaporasi lama, lalu deposit baru berdasarkan kualitas solusi.
         """
         if not rute_list or self.jumlah_tugas == 0:
             return
+        if self.mode_feromon == "sparse":
+            # Evaporasi malas + deposit hanya pada edge rute: O(semut x T)
+            self.feromon.evaporate(self.tingkat_penguapan)
+            self.feromon.deposit(*self.route_edges(rute_list, biaya_list))
+            return
         self.feromon *= 1 - self.tingkat_penguapan
-        for rute, biaya in zip(rute_list, biaya_list):
-            if biaya == 0 or len(rute) < 2:
-                continue
-            tambah = self.deposit_feromon / biaya
-            for i in range(len(rute) - 1):
-                self.feromon[rute[i], rute[i + 1]] += tambah
-            if len(rute) >= 2:
-                self.feromon[rute[-1], rute[0]] += tambah
 
-    def optimize(self, show_progress=True, progress_callback=None):
+        # Deposit semua rute sekaligus; np.add.at menjumlah berurutan sesuai urutan loop
+        # (termasuk edge penutup), jadi hasilnya identik bit-per-bit dengan loop per edge
+        asal, tujuan, jumlah = self.route_edges(rute_list, biaya_list)
+        if len(asal):
+            np.add.at(
+                self.feromon, (asal, tujuan), jumlah.astype(self.feromon.dtype, copy=False)
+            )
+
+    def construct_routes(self, jumlah_semut):
+        """
+        Rute untuk `jumlah_semut` semut: serial per semut (lazy) atau batch sekaligus.
+        """
+        if self.konstruksi_batch:
+            return self.construct_solutions_batched(jumlah_semut)
+        return (self.construct_solution() for _ in range(jumlah_semut))
+
+    def construct_colony(self):
+        """
+        Bangun dan evaluasi rute seluruh koloni untuk satu iterasi.
+
+        Menghasilkan (urutan, (biaya, durasi_total, keseimbangan, hasil)). Di process pool,
+        `hasil` bernilai None dan dievaluasi ulang di induk hanya jika dibutuhkan.
+        """
+        if self._pool is None:
+            for urutan in self.construct_routes(self.jumlah_semut):
+                yield urutan, self.evaluate_sequence(urutan)
+            return
+
+        # Stream anak per potongan diturunkan dari generator induk agar hasil reprodusibel
+        potongan = split_counts(self.jumlah_semut, self.n_workers)
+        stream_anak = self.rng.spawn(len(potongan))
+        skala = (
+            (self.feromon.faktor, self.feromon.nilai_default)
+            if self.mode_feromon == "sparse"
+            else None
+        )
+        args = [(n, rng, skala) for n, rng in zip(potongan, stream_anak)]
+        for hasil_potongan in self._pool.map(_construct_colony_chunk, args):
+            for urutan, evaluasi in hasil_potongan:
+                yield urutan, (*evaluasi, None)
+
+    def start_workers(self):
+        """
+        Pindahkan feromon ke shared memory dan buat process pool (jika n_workers > 1).
+        """
+        if self.n_workers <= 1 or self.jumlah_semut <= 1 or self._pool is not None:
+            return
+        if self.mode_feromon == "sparse":
+            self._feromon_shared = [
+                SharedArray.from_array(self.feromon.kandidat),
+                SharedArray.from_array(self.feromon.nilai),
+            ]
+            self.feromon.kandidat = self._feromon_shared[0].array
+            self.feromon.nilai = self._feromon_shared[1].array
+            feromon_worker = copy.copy(self.feromon)
+            feromon_worker.kandidat = feromon_worker.nilai = None
+        else:
+            self._feromon_shared = [SharedArray.from_array(self.feromon)]
+            self.feromon = self._feromon_shared[0].array
+            feromon_worker = None
+
+        state = worker_state(self, ("feromon", "_pool", "_feromon_shared"))
+        self._pool = create_pool(
+            min(self.n_workers, self.jumlah_semut),
+            _init_colony_worker,
+            (
+                self.__class__,
+                state,
+                feromon_worker,
+                [shared.spec for shared in self._feromon_shared],
+            ),
+        )
+
+    def stop_workers(self):
+        """
+        Hentikan process pool dan kembalikan feromon ke array biasa.
+        """
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        salinan = [shared.release() for shared in self._feromon_shared]
+        self._feromon_shared = []
+        if self.mode_feromon == "sparse":
+            self.feromon.kandidat, self.feromon.nilai = salinan
+        else:
+            self.feromon = salinan[0]
+
+    def optimize(
+        self,
+        show_progress=True,
+        progress_callback=None,
+        time_budget_ms=None,
+        gap_tolerance=None,
+    ):
         """
         Jalankan loop utama optimasi ACO.
+
+        `time_budget_ms` (opsional) membatasi waktu wall-clock; jika habis, loop berhenti di
+        antara evaluasi semut dan hasil ditandai `budget_exhausted`. `gap_tolerance` (persen)
+        menghentikan loop begitu makespan terbaik berada dalam toleransi dari batas bawahnya.
+        """
+        self.penghentian.reset(time_budget_ms, gap_tolerance)
+        self.start_workers()
+        try:
+            return self.run_colony(show_progress, progress_callback)
+        finally:
+            self.stop_workers()
+
+    def run_colony(self, show_progress=True, progress_callback=None):
         """
-        # Inisialisasi solusi awal (Sequential sederhana)
-        urutan_awal = list(range(self.jumlah_tugas))
-        jadwal_awal, waktu_agen_awal, keseimbangan_awal = self.assign_to_agents(
-            urutan_awal
+        Loop iterasi koloni: konstruksi rute, elitisme, update feromon dan riwayat.
+        """
+        # Inisialisasi solusi awal (Sequential sederhana atau lintasan kritis)
+        urutan_awal = self.initial_sequence()
+        biaya_awal, durasi_total_awal, keseimbangan_awal, hasil_awal = (
+            self.evaluate_sequence(urutan_awal)
         )
-        durasi_total_awal = max(waktu_agen_awal.values(), default=0)
-        self.biaya_terbaik = self.fungsi_biaya(jadwal_awal, durasi_total_awal)
+        self.biaya_terbaik = biaya_awal
         self.durasi_terbaik = durasi_total_awal  # Simpan makespan aktual
-        self.jadwal_terbaik = jadwal_awal
+        self.jadwal_terbaik = self.build_schedule(urutan_awal, hasil_awal)
         self.indeks_keseimbangan_terbaik = keseimbangan_awal
+        self.urutan_terbaik = urutan_awal
 
         waktu_mulai = time.time()
 
@@ -178,16 +476,11 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
             rute_list, biaya_list = [], []
             ada_terbaik_baru = False
 
-            # Konstruksi Solusi oleh Semut
-            for _ in range(self.jumlah_semut):
-                urutan = self.construct_solution()
+            # Konstruksi Solusi oleh Semut (serial, batch, atau tersebar di process pool)
+            # Evaluasi oleh Greedy (dict jadwal hanya dibangun untuk solusi terbaik)
+            for urutan, evaluasi in self.construct_colony():
                 if urutan:
-                    # Evaluasi oleh Greedy
-                    jadwal, waktu_agen, indeks_keseimbangan = self.assign_to_agents(
-                        urutan
-                    )
-                    durasi_total = max(waktu_agen.values(), default=0)
-                    biaya = self.fungsi_biaya(jadwal, durasi_total)
+                    biaya, durasi_total, indeks_keseimbangan, hasil = evaluasi
                     rute_list.append(urutan)
                     biaya_list.append(biaya)
 
@@ -198,15 +491,37 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
                     ):
                         self.biaya_terbaik = biaya
                         self.durasi_terbaik = durasi_total
-                        self.jadwal_terbaik = jadwal
+                        if hasil is None:
+                            hasil = self.evaluate_sequence(urutan)[3]
+                        self.jadwal_terbaik = self.build_schedule(urutan, hasil)
                         self.indeks_keseimbangan_terbaik = indeks_keseimbangan
+                        self.urutan_terbaik = urutan
                         ada_terbaik_baru = True
                 else:
                     rute_list.append([])
                     biaya_list.append(float("inf"))
 
-            # Update Feromon Global
-            self.update_pheromones(rute_list, biaya_list)
+                # Anggaran waktu habis: sisa koloni tidak dievaluasi
+                if self.penghentian.time_exhausted():
+                    break
+
+            # Local search pada solusi terbaik sejauh ini; hasilnya ikut men-deposit feromon
+            # sebagai semut elit
+            if (
+                self.mode_local_search == "iteration"
+                and rute_list
+                and not self.penghentian.anggaran_habis
+            ):
+                urutan, evaluasi = self.improve_sequence(self.urutan_terbaik)
+                if self.is_better(evaluasi):
+                    self.update_best(urutan, evaluasi)
+                    ada_terbaik_baru = True
+                rute_list.append(urutan)
+                biaya_list.append(evaluasi[0])
+
+            # Update Feromon Global (dilewati untuk koloni yang terpotong anggaran waktu)
+            if not self.penghentian.anggaran_habis:
+                self.update_pheromones(rute_list, biaya_list)
 
             # Tracking Riwayat
             self.riwayat_iterasi.append(
@@ -244,6 +559,18 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
                     f"Iterasi {i + 1}: Makespan Terbaik: {self.durasi_terbaik:.2f}, Load Balance: {self.indeks_keseimbangan_terbaik:.4f}"
                 )
 
+            # Early stopping: target makespan tercapai atau konvergen (tanpa perbaikan)
+            if self.penghentian.update(self.durasi_terbaik) is not None:
+                if show_progress:
+                    print(f"Berhenti di iterasi {i + 1}: {self.penghentian.alasan}")
+                break
+
+        # Local search sekali pada solusi terbaik akhir
+        if self.mode_local_search == "final" and self.jumlah_tugas > 0:
+            urutan, evaluasi = self.improve_sequence(self.urutan_terbaik)
+            if self.is_better(evaluasi):
+                self.update_best(urutan, evaluasi)
+
         # Rekap hasil akhir
         waktu_akhir_agen_final = {}
         if self.jadwal_terbaik:
@@ -269,6 +596,10 @@ class ACO_MultiAgent_Scheduler(MultiAgentScheduler):
             "time_complexity": f"O({self.jumlah_iterasi} x {self.jumlah_semut} x {self.jumlah_tugas} x {self.jumlah_agen})", 
             "iteration_history": pd.DataFrame(self.riwayat_iterasi),
             "algorithm": self.__class__.__name__,
+            "stop_reason": self.penghentian.alasan,
+            "budget_exhausted": self.penghentian.anggaran_habis,
+            "lower_bound": self.batas_bawah_makespan,
+            "gap": self.optimality_gap(self.durasi_terbaik),
         }
 
 
@@ -1,14 +1,18 @@
 import numpy as np
-import random
 import json
 import pandas as pd
 
+from models.evaluator import GreedyEvaluator, keseimbangan_delta, statistik_agen
+from models.graph import DependencyGraph
+from models.stopping import EarlyStopping, optimality_gap
+from models.task_table import TaskTable
 from models.utils import (
     generate_agen_default,
     parse_dependensi,
     hitung_load_balance_index,
+    hitung_biaya_makespan_lbi,
+    fungsi_biaya_jadwal,
     validasi_dependensi,
-    ada_dependensi_sirkular,
     filter_ghost_dependencies,
 )
 
@@ -21,6 +25,9 @@ class MultiAgentScheduler:
     termasuk manajemen tugas, agen, dependensi, dan fungsi evaluasi.
     """
 
+    # Jarak maksimum dua posisi yang ditukar/dipindah dalam satu langkah local search
+    jendela_local_search = 16
+
     def __init__(
         self,
         tasks,
@@ -31,14 +38,37 @@ class MultiAgentScheduler:
         enable_dependencies=False,
         random_seed=None,
         num_default_agents=3,
+        patience=None,
+        min_improvement=0.0,
+        target_makespan=None,
+        time_budget_ms=None,
+        gap_tolerance=None,
+        local_search=None,
+        local_search_moves=50,
     ):
         """
         Inisialisasi Multi-Agent Scheduler untuk manajemen tugas, agen, dan dependensi.
+
+        `patience`, `min_improvement`, `target_makespan`, `time_budget_ms`, dan
+        `gap_tolerance` mengatur early stopping loop optimasi (lihat EarlyStopping);
+        default-nya semua iterasi dijalankan. `local_search` ("iteration" atau "final")
+        mengaktifkan perbaikan swap/insert sebanyak `local_search_moves` langkah pada solusi
+        terbaik setiap iterasi atau hanya di akhir optimasi.
         """
-        # Konversi input ke list jika DataFrame
-        self.tugas = (
-            tasks.to_dict("records") if isinstance(tasks, pd.DataFrame) else tasks
-        )
+        if local_search not in (None, "iteration", "final"):
+            raise ValueError(f"local_search tidak dikenal: {local_search}")
+
+        # Tabel tugas struct-of-arrays (durasi, prioritas, indeks ID) dibangun sekali; hasil
+        # ingestion kolumnar (TaskTable) dipakai langsung tanpa record per tugas
+        if isinstance(tasks, TaskTable):
+            self._tugas = None
+            self.tabel_tugas = tasks
+        else:
+            # Konversi input ke list jika DataFrame
+            self._tugas = (
+                tasks.to_dict("records") if isinstance(tasks, pd.DataFrame) else tasks
+            )
+            self.tabel_tugas = TaskTable.from_records(self._tugas, task_id_col)
 
         # Generate default agents (Uniform/Homogen)
         if agents is None or (isinstance(agents, list) and len(agents) == 0):
@@ -54,7 +84,7 @@ class MultiAgentScheduler:
         self.task_id_col = task_id_col
         self.agent_id_col = agent_id_col
         self.enable_dependencies = enable_dependencies
-        self.jumlah_tugas = len(self.tugas)
+        self.jumlah_tugas = len(self.tabel_tugas)
         self.jumlah_agen = len(self.agen)
 
         if self.jumlah_tugas == 0:
@@ -62,18 +92,18 @@ class MultiAgentScheduler:
                 "Peringatan: Tidak ada tugas yang diberikan. Scheduler tidak akan berjalan."
             )
 
-        # Penanganan dependensi
-        self.peta_tugas = {
-            str(task[self.task_id_col]): i for i, task in enumerate(self.tugas)
-        }
-        self.peta_tugas_terbalik = {
-            i: str(task[self.task_id_col]) for i, task in enumerate(self.tugas)
-        }
-        self.dependensi = (
-            self.parse_dependencies()
-            if enable_dependencies and self.jumlah_tugas > 0
-            else {}
-        )
+        # Penanganan dependensi (dependensi hasil ingestion tidak diparse ulang)
+        self.peta_tugas = self.tabel_tugas.indeks
+        self.peta_tugas_terbalik = self.tabel_tugas.ids
+        if not (enable_dependencies and self.jumlah_tugas > 0):
+            self.dependensi = {}
+        elif self.tabel_tugas.dependensi is not None:
+            self.dependensi = self.tabel_tugas.dependency_map()
+        else:
+            self.dependensi = self.parse_dependencies()
+
+        # Graf dependensi CSR (edge maju/balik + indegree) untuk ready set Kahn
+        self.graf = DependencyGraph(self.tabel_tugas, self.dependensi)
 
         if (
             enable_dependencies
@@ -82,23 +112,119 @@ class MultiAgentScheduler:
         ):
             print("Peringatan: Dependensi sirkular terdeteksi. Menggunakan fallback.")
 
-        # Random seed
-        if random_seed is not None:
-            np.random.seed(random_seed)
-            random.seed(random_seed)
+        # Evaluator greedy berbasis array (dipakai di inner loop ACO/PSO)
+        self.daftar_id_agen = list(
+            dict.fromkeys(agen[self.agent_id_col] for agen in self.agen)
+        )
+        self.evaluator = self._build_evaluator()
+
+        # Generator acak milik scheduler sendiri (tanpa state global), aman untuk banyak
+        # simulasi bersamaan dalam satu proses; seed yang sama tetap mereproduksi hasil
+        self.random_seed = random_seed
+        self.rng = np.random.default_rng(random_seed)
+
+        # Top-level/bottom-level per tugas (lintasan kritis) dan batas bawah makespan untuk
+        # pelaporan gap optimalitas, dihitung sekali dari graf dependensi
+        self.top_level, self.bottom_level, self.lintasan_kritis = self.compute_task_levels()
+        self.batas_bawah_makespan = self.makespan_lower_bound()
+
+        # Kriteria henti konvergensi untuk loop optimasi
+        self.penghentian = EarlyStopping(
+            patience,
+            min_improvement,
+            target_makespan,
+            time_budget_ms,
+            gap_tolerance,
+            lower_bound=self.batas_bawah_makespan,
+        )
+
+        # Local search swap/insert dengan evaluasi delta (lihat improve_sequence)
+        self.mode_local_search = local_search
+        self.langkah_local_search = max(0, int(local_search_moves or 0))
 
         # Pelacakan
+        self.urutan_terbaik = None
         self.jadwal_terbaik = None
         self.biaya_terbaik = float("inf")
         self.indeks_keseimbangan_terbaik = float("inf")
         self.riwayat_iterasi = []
 
+    @property
+    def tugas(self):
+        """
+        Record tugas (list dict); untuk input TaskTable dibuat malas dari kolom tabel.
+        """
+        if self._tugas is None:
+            self._tugas = self.tabel_tugas.to_records(self.task_id_col)
+        return self._tugas
+
     def _generate_default_agents(self, jumlah_agen, agent_id_col):
         """
         Generate daftar agen default dengan karakteristik seragam (Homogen).
         """
         return generate_agen_default(jumlah_agen, agent_id_col)
 
+    def _build_evaluator(self):
+        """
+        Bangun GreedyEvaluator dari tabel tugas dan CSR predesesor graf dependensi.
+        """
+        return GreedyEvaluator(
+            self.tabel_tugas.durasi,
+            len(self.daftar_id_agen),
+            self.graf.pred_indptr,
+            self.graf.pred_indices,
+            self.tabel_tugas.slot,
+            homogen=self.is_homogeneous_agents(),
+        )
+
+    def compute_task_levels(self):
+        """
+        Hitung (top_level, bottom_level, panjang lintasan kritis) dari graf dependensi.
+
+        Jika dependensi sirkular, level dihitung seolah tanpa dependensi (top-level nol,
+        bottom-level = durasi) dan lintasan kritis bernilai None.
+        """
+        durasi = self.tabel_tugas.durasi
+        level = self.graf.task_levels(durasi)
+        if level is None:
+            return np.zeros(self.jumlah_tugas), durasi.astype(np.float64), None
+        top_level, bottom_level = level
+        # Lewat top-level (bukan bottom-level) agar tetap batas bawah untuk ID duplikat
+        lintasan_kritis = (
+            float((top_level + durasi).max()) if self.jumlah_tugas else 0.0
+        )
+        return top_level, bottom_level, lintasan_kritis
+
+    def makespan_lower_bound(self):
+        """
+        Batas bawah makespan: maksimum dari total durasi / jumlah agen, durasi tugas
+        terpanjang, dan lintasan kritis (jika dependensi aktif dan tidak sirkular).
+        """
+        jumlah_agen = len(self.daftar_id_agen)
+        if self.jumlah_tugas == 0 or jumlah_agen == 0:
+            return 0.0
+        durasi = self.tabel_tugas.durasi
+        batas = max(float(durasi.sum()) / jumlah_agen, float(durasi.max()))
+        if self.lintasan_kritis is not None:
+            batas = max(batas, self.lintasan_kritis)
+        return batas
+
+    def optimality_gap(self, makespan):
+        """
+        Gap (%) makespan terhadap batas bawah makespan scheduler ini.
+        """
+        return optimality_gap(makespan, self.batas_bawah_makespan)
+
+    def is_homogeneous_agents(self):
+        """
+        Cek apakah semua agen identik selain ID-nya (misal hasil generate_agen_default).
+        """
+        atribut = [
+            {k: v for k, v in agen.items() if k != self.agent_id_col}
+            for agen in self.agen
+        ]
+        return all(a == atribut[0] for a in atribut)
+
     def parse_dependencies(self):
         """
         Parse dependensi tugas dari berbagai variasi nama kolom menjadi format standar.
@@ -149,7 +275,7 @@ class MultiAgentScheduler:
         """
         if not self.enable_dependencies or self.jumlah_tugas == 0:
             return False
-        return ada_dependensi_sirkular(self.dependensi)
+        return self.graf.has_cycle()
 
     def is_dependency_satisfied(self, id_tugas, tugas_selesai):
         """
@@ -194,8 +320,6 @@ class MultiAgentScheduler:
         if not waktu_selesai_agen:
             return self.agen[0][self.agent_id_col] if self.agen else None
 
-        agen_terbaik = None
-        skor_terbaik = float("inf")
         max_saat_ini = max(waktu_selesai_agen.values(), default=0)
 
         # Cek Dependensi: Tentukan waktu tercepat tugas bisa dimulai (setelah parent selesai)
@@ -207,30 +331,36 @@ class MultiAgentScheduler:
             ]
             waktu_dep_selesai = max(dep_finish_times) if dep_finish_times else 0
 
-        # Iterasi Agen: Cari agen yang paling optimal
-        for agen in self.agen:
-            id_agen = agen[self.agent_id_col]
-            waktu_temp = waktu_selesai_agen.copy()
+        # Statistik berjalan (rata-rata, jumlah kuadrat deviasi, maks) dihitung sekali,
+        # lalu setiap kandidat dinilai O(1) lewat delta tanpa menyalin dict agen
+        daftar_id = [agen[self.agent_id_col] for agen in self.agen]
+        rata_rata, jumlah_kuadrat, maks = statistik_agen(
+            list(waktu_selesai_agen.values())
+        )
+        waktu_lama = np.array(
+            [waktu_selesai_agen.get(id_agen, 0) for id_agen in daftar_id],
+            dtype=np.float64,
+        )
 
-            # Start Time = Max(Agen Nganggur, Dependensi Selesai)
-            waktu_mulai = max(waktu_temp.get(id_agen, 0), waktu_dep_selesai)
-            waktu_temp[id_agen] = waktu_mulai + durasi_tugas
-            durasi_total_baru = max(waktu_temp.values())
+        # Start Time = Max(Agen Nganggur, Dependensi Selesai)
+        waktu_baru = np.maximum(waktu_lama, waktu_dep_selesai) + durasi_tugas
+        keseimbangan, durasi_total_baru = keseimbangan_delta(
+            waktu_lama,
+            waktu_baru,
+            rata_rata,
+            jumlah_kuadrat,
+            maks,
+            len(waktu_selesai_agen),
+        )
 
-            # Hitung Skor (Prioritaskan Load Balance)
-            if prioritize_balance:
-                skor_keseimbangan = self.calculate_load_balance_index(waktu_temp)
-                skor = skor_keseimbangan * 1000 + (durasi_total_baru / 1000)
-            else:
-                penalti_keseimbangan = (
-                    self.calculate_load_balance_index(waktu_temp) * max_saat_ini * 2
-                )
-                skor = durasi_total_baru + penalti_keseimbangan
+        # Hitung Skor (Prioritaskan Load Balance)
+        if prioritize_balance:
+            skor = keseimbangan * 1000 + (durasi_total_baru / 1000)
+        else:
+            skor = durasi_total_baru + keseimbangan * max_saat_ini * 2
 
-            # Update Terbaik
-            if skor < skor_terbaik:
-                skor_terbaik = skor
-                agen_terbaik = id_agen
+        # Agen pertama dengan skor minimum (tie-breaking sama dengan perbandingan `<`)
+        agen_terbaik = daftar_id[int(np.argmin(skor))] if daftar_id else None
 
         return agen_terbaik or min(
             waktu_selesai_agen,
@@ -238,64 +368,172 @@ class MultiAgentScheduler:
             default=self.agen[0][self.agent_id_col] if self.agen else None,
         )
 
+    def evaluate_sequence(self, urutan_indeks_tugas):
+        """
+        Evaluasi urutan tugas via GreedyEvaluator tanpa membangun dict jadwal.
+
+        Mengembalikan (biaya, durasi_total, keseimbangan_beban, hasil) dengan `hasil` adalah
+        tuple mentah evaluator yang bisa diubah menjadi jadwal lewat `build_schedule`.
+        """
+        hasil = self.evaluator.evaluate(urutan_indeks_tugas)
+        durasi_total, keseimbangan_beban = hasil[0], hasil[1]
+        return (
+            self.calculate_cost(urutan_indeks_tugas, hasil),
+            durasi_total,
+            keseimbangan_beban,
+            hasil,
+        )
+
+    def calculate_cost(self, urutan_indeks_tugas, hasil):
+        """
+        Hitung biaya hasil evaluasi; fungsi biaya default dihitung langsung dari array agen.
+        """
+        durasi_total, _, waktu_agen, agen_per_posisi, _ = hasil
+        if self.fungsi_biaya is not fungsi_biaya_jadwal:
+            return self.fungsi_biaya(
+                self.build_schedule(urutan_indeks_tugas, hasil), durasi_total
+            )
+        if not agen_per_posisi:
+            return float("inf")
+
+        # Sama seperti fungsi_biaya_jadwal: hanya agen yang mendapat tugas, urut kemunculan
+        return hitung_biaya_makespan_lbi(
+            [waktu_agen[a] for a in dict.fromkeys(agen_per_posisi)], durasi_total
+        )
+
+    def build_schedule(self, urutan_indeks_tugas, hasil):
+        """
+        Bangun list dict jadwal (task_id/agent_id/start_time/finish_time) dari hasil evaluasi.
+        """
+        _, _, _, agen_per_posisi, mulai_per_posisi = hasil
+        durasi = self.evaluator._durasi
+        return [
+            {
+                "task_id": self.peta_tugas_terbalik[int(indeks_tugas)],
+                "agent_id": self.daftar_id_agen[agen],
+                "start_time": waktu_mulai,
+                "finish_time": waktu_mulai + durasi[indeks_tugas],
+            }
+            for indeks_tugas, agen, waktu_mulai in zip(
+                urutan_indeks_tugas, agen_per_posisi, mulai_per_posisi
+            )
+        ]
+
     def assign_to_agents(self, urutan_indeks_tugas):
         """
         Menugaskan tugas ke agen secara greedy berdasarkan urutan yang diberikan.
         """
-        if (
-            not self.agen
-            or (
-                isinstance(urutan_indeks_tugas, np.ndarray)
-                and urutan_indeks_tugas.size == 0
-            )
-            or (isinstance(urutan_indeks_tugas, list) and not urutan_indeks_tugas)
-        ):
+        if not self.agen or len(urutan_indeks_tugas) == 0:
             return [], {}, 0.0
 
-        waktu_selesai_agen = {agen[self.agent_id_col]: 0 for agen in self.agen}
-        waktu_selesai_tugas = {}
-        jadwal = []
+        hasil = self.evaluator.evaluate(urutan_indeks_tugas)
+        waktu_selesai_agen = dict(zip(self.daftar_id_agen, hasil[2].tolist()))
+        return (
+            self.build_schedule(urutan_indeks_tugas, hasil),
+            waktu_selesai_agen,
+            hasil[1],
+        )
+
+    def is_better(self, evaluasi):
+        """
+        Cek apakah evaluasi (biaya, durasi_total, keseimbangan, hasil) lebih baik dari solusi
+        terbaik: biaya lebih rendah, atau biaya sama dengan load balance lebih baik.
+        """
+        biaya, _, keseimbangan, _ = evaluasi
+        return biaya < self.biaya_terbaik or (
+            biaya == self.biaya_terbaik and keseimbangan < self.indeks_keseimbangan_terbaik
+        )
 
-        # Loop setiap tugas sesuai urutan (Greedy)
-        for indeks_tugas in urutan_indeks_tugas:
-            tugas = self.tugas[indeks_tugas]
-            id_tugas = str(tugas[self.task_id_col])
-            durasi = tugas.get("length", tugas.get("duration", 1))
+    def update_best(self, urutan_indeks_tugas, evaluasi):
+        """
+        Jadikan urutan beserta evaluasinya sebagai solusi terbaik.
+        """
+        biaya, durasi_total, keseimbangan, hasil = evaluasi
+        self.biaya_terbaik = biaya
+        self.durasi_terbaik = durasi_total
+        self.indeks_keseimbangan_terbaik = keseimbangan
+        self.urutan_terbaik = list(urutan_indeks_tugas)
+        self.jadwal_terbaik = self.build_schedule(urutan_indeks_tugas, hasil)
+
+    def improve_sequence(self, urutan_indeks_tugas):
+        """
+        Local search first-improvement dengan langkah swap/insert acak pada satu urutan.
 
-            # Cari agen paling optimal (Load Balance + Waktu)
-            agen_terbaik = self.find_best_agent(
-                waktu_selesai_agen, durasi, id_tugas, waktu_selesai_tugas
-            )
-            if agen_terbaik is None:
+        Setiap langkah hanya mensimulasikan ulang greedy dari posisi pertama yang berubah
+        (GreedyEvaluator.evaluate_from), jadi biayanya O(T - k), bukan O(T). Langkah yang
+        melanggar dependensi dilewati. Mengembalikan (urutan, (biaya, durasi_total,
+        keseimbangan, hasil)) terbaik yang ditemukan.
+        """
+        urutan = [int(t) for t in urutan_indeks_tugas]
+        jejak = []
+        hasil = self.evaluator.evaluate(urutan, jejak)
+        biaya = self.calculate_cost(urutan, hasil)
+        jumlah = len(urutan)
+        if jumlah < 2:
+            return urutan, (biaya, hasil[0], hasil[1], hasil)
+
+        posisi_pertama = self._posisi_pertama_slot(urutan)
+        rng = self.rng
+        for _ in range(self.langkah_local_search):
+            if self.penghentian.time_exhausted():
+                break
+            # Langkah lokal: j paling jauh `jendela_local_search` posisi setelah i
+            i = int(rng.integers(jumlah - 1))
+            j = int(rng.integers(i + 1, min(jumlah, i + self.jendela_local_search + 1)))
+            jenis = rng.integers(3)
+            if jenis == 0:
+                # Swap posisi i dan j
+                baru = urutan.copy()
+                baru[i], baru[j] = baru[j], baru[i]
+            elif jenis == 1:
+                # Insert: tugas di posisi j dipindah ke depan posisi i
+                baru = urutan[:i] + [urutan[j]] + urutan[i:j] + urutan[j + 1 :]
+            else:
+                # Insert: tugas di posisi i dipindah ke belakang posisi j
+                baru = urutan[:i] + urutan[i + 1 : j + 1] + [urutan[i]] + urutan[j + 1 :]
+            if not self._move_feasible(baru, i, j, posisi_pertama):
                 continue
 
-            # Tentukan Waktu Mulai (Tunggu parent selesai)
-            waktu_dep_selesai = 0
-            if self.enable_dependencies and id_tugas in self.dependensi:
-                dep_finish_times = [
-                    waktu_selesai_tugas.get(dep_id, 0)
-                    for dep_id in self.dependensi[id_tugas]
-                ]
-                waktu_dep_selesai = max(dep_finish_times) if dep_finish_times else 0
-
-            # Update State Agen dan Tugas
-            waktu_mulai = max(waktu_selesai_agen[agen_terbaik], waktu_dep_selesai)
-            waktu_akhir = waktu_mulai + durasi
-            waktu_selesai_agen[agen_terbaik] = waktu_akhir
-            waktu_selesai_tugas[id_tugas] = waktu_akhir
-
-            jadwal.append(
-                {
-                    "task_id": id_tugas,
-                    "agent_id": agen_terbaik,
-                    "start_time": waktu_mulai,
-                    "finish_time": waktu_akhir,
-                }
-            )
+            jejak_baru = []
+            hasil_baru = self.evaluator.evaluate_from(baru, i, hasil, jejak, jejak_baru)
+            biaya_baru = self.calculate_cost(baru, hasil_baru)
+            if biaya_baru < biaya or (biaya_baru == biaya and hasil_baru[1] < hasil[1]):
+                urutan, hasil, jejak, biaya = baru, hasil_baru, jejak_baru, biaya_baru
+                posisi_pertama = self._posisi_pertama_slot(urutan)
+
+        return urutan, (biaya, hasil[0], hasil[1], hasil)
 
-        durasi_total = max(waktu_selesai_agen.values(), default=0)
-        keseimbangan_beban = self.calculate_load_balance_index(waktu_selesai_agen)
-        return jadwal, waktu_selesai_agen, keseimbangan_beban
+    def _posisi_pertama_slot(self, urutan_indeks_tugas):
+        """
+        Posisi pertama setiap slot ID dalam urutan (T jika tidak muncul).
+        """
+        jumlah_tugas = self.jumlah_tugas
+        posisi = np.full(jumlah_tugas, jumlah_tugas, dtype=np.int64)
+        slot = self.tabel_tugas.slot[np.asarray(urutan_indeks_tugas, dtype=np.int64)]
+        # Ditulis dari belakang agar kemunculan paling awal yang tersimpan
+        posisi[slot[::-1]] = np.arange(len(slot) - 1, -1, -1)
+        return posisi.tolist()
+
+    def _move_feasible(self, urutan_baru, i, j, posisi_pertama):
+        """
+        Cek dependensi tugas di jendela [i, j] urutan baru (di luar jendela tidak berubah).
+
+        Predesesor harus sudah muncul sebelum posisi i pada urutan lama, atau lebih dulu di
+        dalam jendela pada urutan baru.
+        """
+        if not self.graf.jumlah_edge:
+            return True
+        indptr = self.evaluator._pred_indptr
+        indices = self.evaluator._pred_indices
+        slot = self.graf._slot
+        terlihat = set()
+        for p in range(i, j + 1):
+            tugas = urutan_baru[p]
+            for s in indices[indptr[tugas] : indptr[tugas + 1]]:
+                if posisi_pertama[s] >= i and s not in terlihat:
+                    return False
+            terlihat.add(slot[tugas])
+        return True
 
     def run(self):
         """
@@ -320,6 +558,8 @@ class MultiAgentScheduler:
                         "type": "iteration",
                         "iteration": iteration,
                         "makespan": makespan,
+                        "lower_bound": self.batas_bawah_makespan,
+                        "gap": self.optimality_gap(makespan),
                         "log_message": f"Iteration {int(iteration)}: Best Makespan = {makespan:.2f}s",
                     }
                 )
@@ -386,6 +626,10 @@ class MultiAgentScheduler:
                     "agent_finish_times": hasil["agent_finish_times"],
                     "time_complexity": time_complexity,
                     "iteration_history": iteration_history,
+                    "stop_reason": hasil.get("stop_reason", EarlyStopping.MAX_ITERATIONS),
+                    "budget_exhausted": bool(hasil.get("budget_exhausted", False)),
+                    "lower_bound": self.batas_bawah_makespan,
+                    "gap": self.optimality_gap(final_makespan),
                     "log_message": f"Optimization complete! Best Makespan: {final_makespan:.2f}s | Time Complexity: {time_complexity}",
                 }
             )
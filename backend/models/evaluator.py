@@ -0,0 +1,346 @@
+import heapq
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from models.utils import hitung_load_balance_index
+
+_TERKECIL = np.finfo(np.float64).tiny
+
+
+def statistik_agen(waktu_selesai):
+    """
+    Statistik berjalan waktu selesai agen: (rata-rata, jumlah kuadrat deviasi, maksimum).
+    """
+    if len(waktu_selesai) == 0:
+        return 0.0, 0.0, 0.0
+    rata_rata = sum(waktu_selesai) / len(waktu_selesai)
+    jumlah_kuadrat = sum((t - rata_rata) ** 2 for t in waktu_selesai)
+    return rata_rata, jumlah_kuadrat, max(waktu_selesai)
+
+
+def perbarui_statistik(waktu_lama, waktu_baru, rata_rata, jumlah_kuadrat, jumlah_agen):
+    """
+    Update O(1) rata-rata dan jumlah kuadrat deviasi saat satu agen berubah waktu selesainya.
+
+    Bekerja pada skalar maupun array (satu elemen per kandidat agen). Selisih dihitung
+    relatif terhadap rata-rata lama sehingga tidak ada cancellation seperti rumus
+    sum-of-squares biasa.
+    """
+    selisih = waktu_baru - waktu_lama
+    geser = selisih / jumlah_agen
+    return (
+        rata_rata + geser,
+        jumlah_kuadrat + selisih * (waktu_baru + waktu_lama - 2 * rata_rata - geser),
+    )
+
+
+def keseimbangan_delta(
+    waktu_lama, waktu_baru, rata_rata, jumlah_kuadrat, maks, jumlah_agen
+):
+    """
+    LBI dan makespan baru jika satu agen berubah dari `waktu_lama` ke `waktu_baru`, O(1).
+
+    `waktu_lama`/`waktu_baru` boleh skalar (satu kandidat) atau array (semua kandidat).
+    """
+    durasi_total_baru = np.maximum(maks, waktu_baru)
+    if jumlah_agen <= 1:
+        return np.zeros_like(durasi_total_baru), durasi_total_baru
+
+    rata_rata_baru, jumlah_kuadrat_baru = perbarui_statistik(
+        waktu_lama, waktu_baru, rata_rata, jumlah_kuadrat, jumlah_agen
+    )
+    std_dev = np.sqrt(np.maximum(jumlah_kuadrat_baru, 0) / jumlah_agen)
+    # Waktu selesai tidak pernah negatif: rata-rata 0 berarti std_dev juga 0 (LBI = 0)
+    return std_dev / np.maximum(rata_rata_baru, _TERKECIL), durasi_total_baru
+
+
+def skor_delta(waktu_lama, waktu_baru, rata_rata, jumlah_kuadrat, maks, jumlah_agen):
+    """
+    Skor kandidat (LBI * 1000 + makespan / 1000) dari statistik berjalan, O(1) per kandidat.
+    """
+    keseimbangan, durasi_total_baru = keseimbangan_delta(
+        waktu_lama, waktu_baru, rata_rata, jumlah_kuadrat, maks, jumlah_agen
+    )
+    return keseimbangan * 1000 + (durasi_total_baru / 1000)
+
+
+class KelompokWaktuAgen:
+    """
+    Multiset terurut waktu selesai agen homogen: nilai unik -> heap indeks agen.
+
+    Agen homogen dengan waktu selesai sama saling dapat dipertukarkan, jadi cukup nilai
+    uniknya yang dinilai; heap menjaga tie-breaking ke indeks agen terkecil.
+    """
+
+    def __init__(self, jumlah_agen):
+        self.nilai = [0.0]
+        self.agen = {0.0: list(range(jumlah_agen))}
+
+    @classmethod
+    def from_times(cls, waktu_agen):
+        """
+        Bangun kelompok dari waktu selesai agen yang sudah ada (state prefix evaluasi).
+        """
+        kelompok = cls.__new__(cls)
+        kelompok.agen = {}
+        for indeks_agen, waktu in enumerate(np.asarray(waktu_agen).tolist()):
+            kelompok.agen.setdefault(waktu, []).append(indeks_agen)
+        kelompok.nilai = sorted(kelompok.agen)
+        return kelompok
+
+    def pilih(self, waktu_dep_selesai, durasi_tugas, rata_rata, jumlah_kuadrat, maks, jumlah_agen):
+        """
+        Pilih agen terbaik untuk tugas berdurasi positif.
+
+        Untuk waktu >= waktu_dep_selesai skor naik monoton terhadap waktu agen, sehingga dari
+        sisi itu hanya nilai terkecil yang perlu dinilai; nilai di bawah waktu_dep_selesai
+        (semua menghasilkan waktu selesai yang sama) dinilai satu per satu. Tanpa dependensi
+        pemilihan menjadi O(log A).
+        """
+        nilai = self.nilai
+        batas = bisect_left(nilai, waktu_dep_selesai)
+        if batas == 0:
+            return self.agen[nilai[0]][0]
+
+        kandidat = nilai[: batas + 1]
+        waktu_lama = np.array(kandidat)
+        skor = skor_delta(
+            waktu_lama,
+            np.maximum(waktu_lama, waktu_dep_selesai) + durasi_tugas,
+            rata_rata,
+            jumlah_kuadrat,
+            maks,
+            jumlah_agen,
+        )
+        return min(
+            self.agen[kandidat[j]][0] for j in np.flatnonzero(skor == skor.min())
+        )
+
+    def pindahkan(self, indeks_agen, waktu_lama, waktu_baru):
+        """
+        Pindahkan agen dari kelompok waktu lama ke kelompok waktu baru.
+        """
+        heap = self.agen[waktu_lama]
+        if heap[0] == indeks_agen:
+            heapq.heappop(heap)
+        else:
+            heap.remove(indeks_agen)
+            heapq.heapify(heap)
+        if not heap:
+            del self.agen[waktu_lama]
+            self.nilai.pop(bisect_left(self.nilai, waktu_lama))
+
+        if waktu_baru in self.agen:
+            heapq.heappush(self.agen[waktu_baru], indeks_agen)
+        else:
+            self.agen[waktu_baru] = [indeks_agen]
+            insort(self.nilai, waktu_baru)
+
+
+class GreedyEvaluator:
+    """
+    Evaluator jadwal greedy berbasis array (inner loop ACO dan PSO).
+
+    Menerima durasi tugas, struktur dependensi (CSR predesesor) dan jumlah agen sebagai
+    array NumPy, lalu mensimulasikan penugasan greedy yang sama dengan
+    `MultiAgentScheduler.assign_to_agents` tanpa membangun dict per tugas.
+    """
+
+    def __init__(
+        self,
+        durasi,
+        jumlah_agen,
+        pred_indptr=None,
+        pred_indices=None,
+        slot=None,
+        homogen=False,
+    ):
+        """
+        Inisialisasi evaluator dari array durasi, CSR predesesor dan slot ID tugas.
+
+        `slot[i]` adalah indeks tempat waktu selesai tugas i disimpan (tugas dengan ID sama
+        berbagi slot), dan `pred_indices` berisi slot predesesor setiap tugas. Jika `homogen`,
+        agen dengan waktu selesai sama dinilai sekali lewat `KelompokWaktuAgen`.
+        """
+        self.durasi = np.asarray(durasi, dtype=np.float64)
+        self.jumlah_tugas = len(self.durasi)
+        self.jumlah_agen = int(jumlah_agen)
+        self.slot = (
+            np.arange(self.jumlah_tugas)
+            if slot is None
+            else np.asarray(slot, dtype=np.int64)
+        )
+        if pred_indptr is None:
+            pred_indptr = np.zeros(self.jumlah_tugas + 1, dtype=np.int64)
+            pred_indices = np.zeros(0, dtype=np.int64)
+        self.pred_indptr = np.asarray(pred_indptr, dtype=np.int64)
+        self.pred_indices = np.asarray(pred_indices, dtype=np.int64)
+        self.ada_dependensi = len(self.pred_indices) > 0
+        self.homogen = homogen
+
+        # Versi list untuk akses skalar di loop Python (lebih cepat dari indexing NumPy)
+        self._durasi = self.durasi.tolist()
+        self._slot = self.slot.tolist()
+        self._pred_indptr = self.pred_indptr.tolist()
+        self._pred_indices = self.pred_indices.tolist()
+
+    def _skor_kandidat(self, waktu_agen, waktu_baru, rata_rata, jumlah_kuadrat, maks):
+        """
+        Skor setiap kandidat agen: LBI * 1000 + makespan / 1000 (sama dengan find_best_agent).
+
+        Kandidat a = state agen jika tugas diberikan ke agen a (waktu_agen[a] -> waktu_baru[a]),
+        dihitung O(1) per kandidat dari statistik berjalan lewat `skor_delta`.
+        """
+        return skor_delta(
+            waktu_agen, waktu_baru, rata_rata, jumlah_kuadrat, maks, self.jumlah_agen
+        )
+
+    def evaluate(self, urutan_indeks_tugas, jejak=None):
+        """
+        Simulasikan penugasan greedy untuk satu urutan tugas.
+
+        Mengembalikan tuple (durasi_total, keseimbangan_beban, waktu_selesai_agen,
+        agen_per_posisi, mulai_per_posisi); dua list terakhir sejajar dengan urutan. Jika
+        `jejak` (list) diberikan, statistik berjalan (rata-rata, jumlah kuadrat, maksimum)
+        setelah setiap posisi ditambahkan ke dalamnya untuk `evaluate_from`.
+        """
+        jumlah_agen = self.jumlah_agen
+        waktu_agen = np.zeros(jumlah_agen)
+        if jumlah_agen == 0 or len(urutan_indeks_tugas) == 0:
+            return 0.0, 0.0, waktu_agen, [], []
+
+        return self._simulasikan(
+            urutan_indeks_tugas,
+            0,
+            waktu_agen,
+            [0] * self.jumlah_tugas,
+            (0.0, 0.0, 0.0),
+            KelompokWaktuAgen(jumlah_agen) if self.homogen else None,
+            [],
+            [],
+            jejak,
+        )
+
+    def evaluate_from(self, urutan_indeks_tugas, posisi_awal, dasar, jejak_dasar, jejak=None):
+        """
+        Evaluasi ulang urutan yang sama dengan urutan `dasar` sampai sebelum `posisi_awal`.
+
+        State prefix (waktu selesai agen, waktu selesai slot, statistik berjalan) dipulihkan
+        dari hasil evaluasi `dasar` dan `jejak_dasar`-nya, lalu greedy hanya disimulasikan
+        ulang dari posisi pertama yang berubah: O(T - k) langkah, bukan O(T). Hasilnya
+        identik dengan `evaluate` pada urutan baru.
+        """
+        jumlah_agen = self.jumlah_agen
+        k = int(posisi_awal)
+        if jumlah_agen == 0 or len(urutan_indeks_tugas) == 0 or k <= 0:
+            return self.evaluate(urutan_indeks_tugas, jejak)
+
+        agen_prefix = dasar[3][:k]
+        mulai_prefix = dasar[4][:k]
+        tugas_prefix = np.asarray(urutan_indeks_tugas[:k], dtype=np.int64)
+        akhir_prefix = np.asarray(mulai_prefix) + self.durasi[tugas_prefix]
+
+        # Waktu selesai agen naik monoton: nilai prefix = penugasan terakhir di agen itu
+        waktu_agen = np.zeros(jumlah_agen)
+        np.maximum.at(waktu_agen, agen_prefix, akhir_prefix)
+        # Slot ditimpa berurutan (ID duplikat: penugasan terakhir yang berlaku)
+        waktu_selesai_slot = np.zeros(self.jumlah_tugas)
+        waktu_selesai_slot[self.slot[tugas_prefix]] = akhir_prefix
+
+        if jejak is not None:
+            jejak.extend(jejak_dasar[:k])
+        return self._simulasikan(
+            urutan_indeks_tugas,
+            k,
+            waktu_agen,
+            waktu_selesai_slot.tolist(),
+            jejak_dasar[k - 1],
+            KelompokWaktuAgen.from_times(waktu_agen) if self.homogen else None,
+            list(agen_prefix),
+            list(mulai_prefix),
+            jejak,
+        )
+
+    def _simulasikan(
+        self,
+        urutan_indeks_tugas,
+        posisi_awal,
+        waktu_agen,
+        waktu_selesai_slot,
+        statistik,
+        kelompok,
+        agen_per_posisi,
+        mulai_per_posisi,
+        jejak,
+    ):
+        """
+        Loop greedy dari `posisi_awal` dengan state agen/slot/statistik yang diberikan.
+        """
+        jumlah_agen = self.jumlah_agen
+        durasi = self._durasi
+        slot = self._slot
+        indptr = self._pred_indptr
+        indices = self._pred_indices
+        ada_dependensi = self.ada_dependensi
+        rata_rata, jumlah_kuadrat, maks = statistik
+        if posisi_awal:
+            urutan_indeks_tugas = urutan_indeks_tugas[posisi_awal:]
+
+        for indeks_tugas in urutan_indeks_tugas:
+            durasi_tugas = durasi[indeks_tugas]
+
+            # Waktu tercepat tugas bisa dimulai (setelah parent selesai)
+            waktu_dep_selesai = 0
+            if ada_dependensi:
+                awal, akhir = indptr[indeks_tugas], indptr[indeks_tugas + 1]
+                if awal != akhir:
+                    waktu_dep_selesai = max(
+                        [waktu_selesai_slot[p] for p in indices[awal:akhir]]
+                    )
+
+            if kelompok is not None and durasi_tugas > 0:
+                # Fast path homogen: hanya nilai waktu selesai unik yang dinilai
+                agen_terbaik = kelompok.pilih(
+                    waktu_dep_selesai,
+                    durasi_tugas,
+                    rata_rata,
+                    jumlah_kuadrat,
+                    maks,
+                    jumlah_agen,
+                )
+            else:
+                # Skor semua kandidat sekaligus (argmin = agen pertama dengan skor minimum)
+                waktu_baru = np.maximum(waktu_agen, waktu_dep_selesai) + durasi_tugas
+                agen_terbaik = int(
+                    np.argmin(
+                        self._skor_kandidat(
+                            waktu_agen, waktu_baru, rata_rata, jumlah_kuadrat, maks
+                        )
+                    )
+                )
+
+            waktu_lama = float(waktu_agen[agen_terbaik])
+            waktu_mulai = max(waktu_lama, waktu_dep_selesai)
+            waktu_akhir = waktu_mulai + durasi_tugas
+            rata_rata, jumlah_kuadrat = perbarui_statistik(
+                waktu_lama, waktu_akhir, rata_rata, jumlah_kuadrat, jumlah_agen
+            )
+            maks = max(maks, waktu_akhir)
+            if kelompok is not None:
+                kelompok.pindahkan(agen_terbaik, waktu_lama, waktu_akhir)
+            waktu_agen[agen_terbaik] = waktu_akhir
+            waktu_selesai_slot[slot[indeks_tugas]] = waktu_akhir
+            agen_per_posisi.append(agen_terbaik)
+            mulai_per_posisi.append(waktu_mulai)
+            if jejak is not None:
+                jejak.append((rata_rata, jumlah_kuadrat, maks))
+
+        waktu_list = waktu_agen.tolist()
+        return (
+            max(waktu_list),
+            hitung_load_balance_index(waktu_list),
+            waktu_agen,
+            agen_per_posisi,
+            mulai_per_posisi,
+        )
@@ -0,0 +1,301 @@
+import heapq
+from bisect import bisect_left, insort
+
+import numpy as np
+
+
+def ada_siklus(jumlah_simpul, asal, tujuan):
+    """
+    Deteksi siklus pada graf berarah (edge asal -> tujuan) dengan Kahn iteratif, O(V + E).
+
+    Pengganti DFS rekursif untuk graf besar (rantai panjang tidak memicu RecursionError).
+    """
+    asal = np.asarray(asal, dtype=np.int64)
+    tujuan = np.asarray(tujuan, dtype=np.int64)
+    if len(asal) == 0:
+        return False
+    # Kasus umum: semua edge maju menurut indeks, urutan indeks sudah topologis
+    if np.all(asal < tujuan):
+        return False
+
+    indegree = np.bincount(tujuan, minlength=jumlah_simpul)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(asal, minlength=jumlah_simpul))))
+    penerus = tujuan[np.argsort(asal, kind="stable")].tolist()
+    indptr = indptr.tolist()
+    sisa = indegree.tolist()
+
+    antrean = np.flatnonzero(indegree == 0).tolist()
+    diproses = 0
+    while antrean:
+        i = antrean.pop()
+        diproses += 1
+        for k in range(indptr[i], indptr[i + 1]):
+            j = penerus[k]
+            sisa[j] -= 1
+            if sisa[j] == 0:
+                antrean.append(j)
+    return diproses < jumlah_simpul
+
+
+class DependencyGraph:
+    """
+    Graf dependensi tugas dalam format CSR (compressed sparse row) atas indeks integer.
+
+    Menyimpan predesesor setiap tugas (untuk evaluator), edge terbalik dari slot ID ke tugas
+    yang bergantung padanya, dan indegree (jumlah dependensi, termasuk ghost) untuk Kahn.
+    """
+
+    def __init__(self, tabel_tugas, dependensi):
+        """
+        Kompilasi dict dependensi {id_tugas: [id_dep, ...]} menjadi array CSR.
+        """
+        jumlah_tugas = len(tabel_tugas)
+        indeks = tabel_tugas.indeks
+        self.jumlah_tugas = jumlah_tugas
+        self.slot = tabel_tugas.slot
+
+        # Predesesor per tugas (slot); dependensi ghost tidak punya slot tapi tetap dihitung
+        # di indegree sehingga tidak pernah terpenuhi (sama dengan perilaku get_ready_tasks)
+        pred_indptr = np.zeros(jumlah_tugas + 1, dtype=np.int64)
+        pred_indices = []
+        indegree = np.zeros(jumlah_tugas, dtype=np.int64)
+        for i, id_tugas in enumerate(tabel_tugas.ids):
+            deps = dependensi.get(id_tugas, [])
+            indegree[i] = len(deps)
+            pred_indices.extend(indeks[dep_id] for dep_id in deps if dep_id in indeks)
+            pred_indptr[i + 1] = len(pred_indices)
+
+        self.pred_indptr = pred_indptr
+        self.pred_indices = np.array(pred_indices, dtype=np.int64)
+        self.indegree = indegree
+        self.jumlah_edge = len(self.pred_indices)
+
+        # Edge terbalik: slot -> tugas yang bergantung padanya (duplikat dipertahankan)
+        tugas_per_edge = np.repeat(
+            np.arange(jumlah_tugas, dtype=np.int64), np.diff(pred_indptr)
+        )
+        urutan_edge = np.argsort(self.pred_indices, kind="stable")
+        self.succ_indptr = np.concatenate(
+            (
+                [0],
+                np.cumsum(np.bincount(self.pred_indices, minlength=jumlah_tugas)),
+            )
+        ).astype(np.int64)
+        self.succ_indices = tugas_per_edge[urutan_edge]
+
+        # Akar (tanpa dependensi) dan urutan fallback deadlock: dependensi paling sedikit,
+        # indeks terkecil lebih dulu
+        self.akar = np.flatnonzero(indegree == 0)
+        self.urutan_fallback = np.argsort(indegree, kind="stable")
+
+        # Versi list untuk loop Python di ReadySet
+        self._akar = self.akar.tolist()
+        self._urutan_fallback = self.urutan_fallback.tolist()
+        self._slot = self.slot.tolist()
+        self._indegree = indegree.tolist()
+        self._succ_indptr = self.succ_indptr.tolist()
+        self._succ_indices = self.succ_indices.tolist()
+
+    def gather_successors(self, slot):
+        """
+        Semua edge keluar untuk sekumpulan slot sekaligus.
+
+        Mengembalikan (posisi, penerus): `posisi[e]` adalah indeks elemen `slot` asal edge e
+        dan `penerus[e]` tugas yang bergantung padanya (dipakai untuk update batch).
+        """
+        slot = np.asarray(slot, dtype=np.int64)
+        awal = self.succ_indptr[slot]
+        jumlah = self.succ_indptr[slot + 1] - awal
+        total = int(jumlah.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        offset = np.repeat(awal - np.cumsum(jumlah) + jumlah, jumlah)
+        posisi = np.repeat(np.arange(len(slot)), jumlah)
+        return posisi, self.succ_indices[offset + np.arange(total)]
+
+    def priority_order(self, skor):
+        """
+        Urutan topologis yang selalu memilih tugas siap dengan skor tertinggi, O(T log T + E).
+
+        Tugas siap disimpan di heap dengan kunci (-skor, indeks), jadi seri diputus ke indeks
+        terkecil; penerus masuk heap saat indegree-nya menjadi nol. Jika heap kosong
+        (deadlock/dependensi ghost), tugas tersisa dengan dependensi paling sedikit dipaksa.
+        """
+        skor = skor.tolist() if isinstance(skor, np.ndarray) else list(skor)
+        jumlah_tugas = self.jumlah_tugas
+        sisa_dep = list(self._indegree)
+        slot_selesai = bytearray(jumlah_tugas)
+        terjadwal = bytearray(jumlah_tugas)
+        slot = self._slot
+        succ_indptr = self._succ_indptr
+        succ_indices = self._succ_indices
+        fallback = self._urutan_fallback
+        penunjuk = 0
+
+        heap = [(-skor[i], i) for i in self._akar]
+        heapq.heapify(heap)
+        urutan = []
+        for _ in range(jumlah_tugas):
+            if heap:
+                i = heapq.heappop(heap)[1]
+            else:
+                while terjadwal[fallback[penunjuk]]:
+                    penunjuk += 1
+                i = fallback[penunjuk]
+            terjadwal[i] = 1
+            urutan.append(i)
+
+            # Dependensi dirujuk lewat ID, jadi satu slot cukup diselesaikan sekali
+            s = slot[i]
+            if slot_selesai[s]:
+                continue
+            slot_selesai[s] = 1
+            for k in range(succ_indptr[s], succ_indptr[s + 1]):
+                j = succ_indices[k]
+                sisa_dep[j] -= 1
+                if sisa_dep[j] == 0 and not terjadwal[j]:
+                    heapq.heappush(heap, (-skor[j], j))
+        return urutan
+
+    def has_cycle(self):
+        """
+        Cek siklus dependensi antar ID tugas (ghost diabaikan, ID duplikat memakai baris
+        terakhir seperti dict dependensi).
+        """
+        baris = np.repeat(
+            np.arange(self.jumlah_tugas, dtype=np.int64), np.diff(self.pred_indptr)
+        )
+        terakhir = self.slot[baris] == baris
+        return ada_siklus(
+            self.jumlah_tugas, self.pred_indices[terakhir], baris[terakhir]
+        )
+
+    def task_levels(self, durasi):
+        """
+        Top-level dan bottom-level setiap tugas dalam satu lintasan topologis (Kahn), O(T + E).
+
+        Top-level adalah waktu mulai tercepat (lintasan terpanjang dari sumber, tanpa durasi
+        tugas itu sendiri); bottom-level adalah lintasan terpanjang ke sink termasuk durasi
+        tugas itu sendiri. Slot ID duplikat dianggap selesai saat baris tercepatnya selesai,
+        jadi top-level + durasi tetap batas bawah jadwal yang menghormati dependensi.
+        Mengembalikan None jika ada siklus (tidak ada urutan topologis).
+        """
+        durasi = np.asarray(durasi, dtype=np.float64)
+        jumlah_tugas = self.jumlah_tugas
+        if self.jumlah_edge == 0:
+            return np.zeros(jumlah_tugas), durasi.copy()
+
+        durasi = durasi.tolist()
+        slot = self._slot
+        succ_indptr = self._succ_indptr
+        succ_indices = self._succ_indices
+        sisa_dep = np.diff(self.pred_indptr).tolist()
+        sisa_anggota = np.bincount(self.slot, minlength=jumlah_tugas).tolist()
+        mulai = [0.0] * jumlah_tugas
+        selesai_slot = [float("inf")] * jumlah_tugas
+        urutan = []
+
+        # Lintasan maju: top-level
+        antrean = [i for i, sisa in enumerate(sisa_dep) if sisa == 0]
+        while antrean:
+            i = antrean.pop()
+            urutan.append(i)
+            akhir = mulai[i] + durasi[i]
+
+            # Slot selesai setelah semua baris ber-ID sama diproses
+            s = slot[i]
+            if akhir < selesai_slot[s]:
+                selesai_slot[s] = akhir
+            sisa_anggota[s] -= 1
+            if sisa_anggota[s]:
+                continue
+            akhir = selesai_slot[s]
+            for k in range(succ_indptr[s], succ_indptr[s + 1]):
+                j = succ_indices[k]
+                if akhir > mulai[j]:
+                    mulai[j] = akhir
+                sisa_dep[j] -= 1
+                if sisa_dep[j] == 0:
+                    antrean.append(j)
+
+        if len(urutan) < jumlah_tugas:
+            return None
+
+        # Lintasan balik (urutan topologis terbalik): bottom-level
+        bawah = [0.0] * jumlah_tugas
+        for i in reversed(urutan):
+            s = slot[i]
+            terpanjang = 0.0
+            for k in range(succ_indptr[s], succ_indptr[s + 1]):
+                if bawah[succ_indices[k]] > terpanjang:
+                    terpanjang = bawah[succ_indices[k]]
+            bawah[i] = durasi[i] + terpanjang
+
+        return np.array(mulai), np.array(bawah)
+
+    def ready_set(self):
+        """
+        Buat state Kahn baru untuk satu konstruksi urutan.
+        """
+        return ReadySet(self)
+
+
+class ReadySet:
+    """
+    Himpunan tugas siap yang dirawat inkremental (Kahn) selama konstruksi satu urutan.
+
+    `siap` selalu terurut naik berdasarkan indeks tugas, sama seperti hasil iterasi set
+    pada implementasi lama, sehingga pemilihan acak tetap reprodusibel.
+    """
+
+    def __init__(self, graf):
+        self.graf = graf
+        self.sisa_dep = list(graf._indegree)
+        self.slot_selesai = bytearray(graf.jumlah_tugas)
+        self.terjadwal = bytearray(graf.jumlah_tugas)
+        self.siap = [i for i, sisa in enumerate(self.sisa_dep) if sisa == 0]
+        self.jumlah_tersisa = graf.jumlah_tugas
+
+    def tersisa(self):
+        """
+        Indeks tugas yang belum dijadwalkan, terurut naik (dipakai untuk fallback deadlock).
+        """
+        return [i for i, sudah in enumerate(self.terjadwal) if not sudah]
+
+    def paksa(self, total=False):
+        """
+        Fallback deadlock: tugas tersisa dengan dependensi belum terpenuhi paling sedikit.
+
+        Jika `total`, yang dibandingkan adalah jumlah dependensi keseluruhan (indegree).
+        """
+        tersisa = self.tersisa()
+        if not tersisa:
+            return None
+        kunci = self.graf._indegree if total else self.sisa_dep
+        return min(tersisa, key=kunci.__getitem__)
+
+    def selesaikan(self, indeks_tugas):
+        """
+        Tandai tugas selesai dan masukkan penerusnya yang indegree-nya menjadi nol.
+        """
+        indeks_tugas = int(indeks_tugas)
+        self.terjadwal[indeks_tugas] = 1
+        self.jumlah_tersisa -= 1
+        if self.sisa_dep[indeks_tugas] == 0:
+            siap = self.siap
+            siap.pop(bisect_left(siap, indeks_tugas))
+
+        # Dependensi dirujuk lewat ID, jadi satu slot cukup diselesaikan sekali
+        slot = self.graf._slot[indeks_tugas]
+        if self.slot_selesai[slot]:
+            return
+        self.slot_selesai[slot] = 1
+
+        sisa_dep = self.sisa_dep
+        terjadwal = self.terjadwal
+        succ_indices = self.graf._succ_indices
+        for k in range(self.graf._succ_indptr[slot], self.graf._succ_indptr[slot + 1]):
+            penerus = succ_indices[k]
+            sisa_dep[penerus] -= 1
+            if sisa_dep[penerus] == 0 and not terjadwal[penerus]:
+                insort(self.siap, penerus)
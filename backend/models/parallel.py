@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+class SharedArray:
+    """
+    Array NumPy di atas shared memory, dibagi antara proses induk dan worker tanpa pickling.
+
+    Induk membuat blok lewat `from_array`, worker menempel ke blok yang sama lewat
+    `attach(spesifikasi)`; perubahan in-place di induk langsung terlihat oleh worker.
+    """
+
+    def __init__(self, shm, shape, dtype, pemilik):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.pemilik = pemilik
+        self.array = np.ndarray(self.shape, dtype=self.dtype, buffer=shm.buf)
+
+    @classmethod
+    def from_array(cls, array):
+        """
+        Buat blok shared memory baru berisi salinan `array`.
+        """
+        array = np.asarray(array)
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = cls(shm, array.shape, array.dtype, pemilik=True)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spesifikasi):
+        """
+        Tempel ke blok shared memory yang sudah ada dari tuple (nama, shape, dtype).
+        """
+        nama, shape, dtype = spesifikasi
+        try:
+            # Worker tidak ikut mendaftarkan blok ke resource tracker (Python >= 3.13)
+            shm = shared_memory.SharedMemory(name=nama, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=nama)
+        return cls(shm, shape, dtype, pemilik=False)
+
+    @property
+    def spec(self):
+        return (self.shm.name, self.shape, self.dtype.str)
+
+    def release(self):
+        """
+        Lepas blok; pemilik (induk) sekaligus menghapusnya. Mengembalikan salinan array.
+        """
+        salinan = np.array(self.array)
+        self.array = None
+        self.shm.close()
+        if self.pemilik:
+            self.shm.unlink()
+        return salinan
+
+
+def split_counts(jumlah, bagian):
+    """
+    Bagi `jumlah` item menjadi paling banyak `bagian` potongan berukuran hampir sama.
+    """
+    bagian = max(1, min(int(bagian), int(jumlah)))
+    return [len(p) for p in np.array_split(np.arange(jumlah), bagian) if len(p)]
+
+
+def max_solver_workers():
+    """
+    Batas proses worker per scheduler: jumlah CPU, dipersempit lagi oleh MAX_SOLVER_WORKERS.
+    """
+    batas = os.cpu_count() or 1
+    batas_env = os.getenv("MAX_SOLVER_WORKERS")
+    if batas_env:
+        batas = min(batas, max(1, int(batas_env)))
+    return batas
+
+
+def clamp_workers(n_workers):
+    """
+    Batasi `n_workers` (dipilih klien) ke max_solver_workers(); nilai di atas batas dicatat.
+    """
+    diminta = max(1, int(n_workers or 1))
+    batas = max_solver_workers()
+    if diminta > batas:
+        print(f"Peringatan: n_workers={diminta} melebihi batas server {batas}; memakai {batas}.")
+        return batas
+    return diminta
+
+
+def worker_state(scheduler, dikecualikan):
+    """
+    Salinan dangkal atribut scheduler untuk dikirim sekali ke worker (tanpa array besar).
+    """
+    return {k: v for k, v in scheduler.__dict__.items() if k not in dikecualikan}
+
+
+def restore_scheduler(kelas, state):
+    """
+    Rekonstruksi scheduler di worker dari state tanpa menjalankan __init__ ulang.
+    """
+    scheduler = object.__new__(kelas)
+    scheduler.__dict__.update(state)
+    return scheduler
+
+
+def pool_context():
+    """
+    Konteks multiprocessing untuk semua process pool: forkserver jika tersedia, selain itu spawn.
+
+    Pool dibuat dari proses yang multi-thread (thread optimize milik `run()`, thread gthread
+    gunicorn), jadi fork langsung bisa mewarisi lock yang sedang dipegang thread lain.
+    Forkserver mem-fork dari server satu-thread yang sudah memuat numpy/pandas dan modul
+    scheduler, sehingga worker tetap cepat dibuat. Konsekuensinya, initializer, initargs,
+    dan task (termasuk `cost_function` scheduler) harus bisa di-pickle.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    konteks = multiprocessing.get_context("forkserver")
+    # "__main__" agar fungsi yang didefinisikan di skrip utama (misal `python app.py`) tetap
+    # bisa di-unpickle di worker, seperti pada spawn
+    konteks.set_forkserver_preload(["__main__", "models.aco", "models.pso"])
+    return konteks
+
+
+def create_pool(n_workers, initializer, initargs):
+    """
+    Buat process pool persisten untuk satu pemanggilan optimize.
+
+    State worker dikirim lewat `initargs` (di-pickle sekali per worker), array besar lewat
+    SharedArray.
+    """
+    return ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=pool_context(),
+        initializer=initializer,
+        initargs=initargs,
+    )
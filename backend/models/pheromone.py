@@ -0,0 +1,137 @@
+import numpy as np
+
+
+class SparsePheromone:
+    """
+    Feromon sparse berbasis candidate list: setiap tugas hanya menyimpan k penerus terkuat.
+
+    Edge di luar candidate list bernilai default (nilai awal yang ikut menguap). Evaporasi
+    diterapkan malas lewat satu faktor peluruhan global, sehingga biaya per iterasi hanya
+    sebanding dengan jumlah edge pada rute semut, bukan O(T^2).
+    """
+
+    # Di bawah batas ini faktor global dilebur ke nilai tersimpan agar tidak overflow
+    _BATAS_FAKTOR = 1e-6
+
+    def __init__(self, jumlah_tugas, k=20, nilai_awal=1.0, dtype=np.float64):
+        """
+        Inisialisasi candidate list kosong (T x k) dengan nilai awal untuk semua edge.
+        """
+        self.jumlah_tugas = int(jumlah_tugas)
+        self.k = max(1, min(int(k), max(self.jumlah_tugas, 1)))
+        self.dtype = np.dtype(dtype)
+
+        # Nilai aktual = nilai tersimpan * faktor; slot kosong ditandai kandidat -1
+        self.kandidat = np.full((self.jumlah_tugas, self.k), -1, dtype=np.int64)
+        self.nilai = np.zeros((self.jumlah_tugas, self.k), dtype=self.dtype)
+        self.nilai_default = float(nilai_awal)
+        self.faktor = 1.0
+
+    @property
+    def shape(self):
+        return (self.jumlah_tugas, self.jumlah_tugas)
+
+    def values(self, asal, tujuan):
+        """
+        Nilai feromon aktual untuk edge asal -> setiap tugas di `tujuan`.
+
+        Hanya k kandidat baris `asal` yang dicari di `tujuan` (searchsorted), sehingga biaya
+        di luar pembuatan array hasil adalah O(k log n).
+        """
+        tujuan = np.asarray(tujuan, dtype=np.int64)
+        nilai = np.full(len(tujuan), self.nilai_default, dtype=np.float64)
+        if len(tujuan) == 0:
+            return nilai
+
+        # Ready set sudah terurut naik; urutan lain diurutkan dulu
+        urutan = None
+        if np.any(tujuan[1:] < tujuan[:-1]):
+            urutan = np.argsort(tujuan, kind="stable")
+            tujuan = tujuan[urutan]
+
+        kandidat = self.kandidat[asal]
+        posisi = np.searchsorted(tujuan, kandidat)
+        posisi_aman = np.minimum(posisi, len(tujuan) - 1)
+        cocok = (kandidat >= 0) & (tujuan[posisi_aman] == kandidat)
+        target = posisi_aman[cocok] if urutan is None else urutan[posisi_aman[cocok]]
+        nilai[target] = self.nilai[asal][cocok]
+        return nilai * self.faktor
+
+    def rows(self, asal):
+        """
+        Baris feromon aktual (len(asal) x T) untuk sekumpulan tugas asal sekaligus.
+        """
+        asal = np.asarray(asal, dtype=np.int64)
+        baris = np.full((len(asal), self.jumlah_tugas), self.nilai_default, dtype=np.float64)
+        kandidat = self.kandidat[asal]
+        i, j = np.nonzero(kandidat >= 0)
+        baris[i, kandidat[i, j]] = self.nilai[asal[i], j]
+        return baris * self.faktor
+
+    def evaporate(self, tingkat_penguapan):
+        """
+        Evaporasi seluruh edge secara malas, O(1) (kecuali saat renormalisasi).
+
+        Evaporasi penuh (faktor nol, misal tingkat_penguapan=1.0) mengosongkan candidate list
+        sehingga deposit berikutnya tetap berlaku, sama seperti matriks dense yang dinolkan.
+        """
+        self.faktor *= 1 - tingkat_penguapan
+        if self.faktor <= 0:
+            # In-place agar view shared memory di worker tetap valid
+            self.kandidat.fill(-1)
+            self.nilai.fill(0)
+            self.nilai_default = 0.0
+            self.faktor = 1.0
+        elif self.faktor < self._BATAS_FAKTOR:
+            self.nilai *= self.faktor
+            self.nilai_default *= self.faktor
+            self.faktor = 1.0
+
+    def deposit(self, asal, tujuan, jumlah):
+        """
+        Tambahkan deposit pada edge rute; hanya edge yang disentuh yang diperbarui.
+
+        Edge baru masuk ke slot kosong, atau menggantikan kandidat terlemah di barisnya jika
+        nilainya lebih besar; jika tidak, edge tersebut tetap bernilai default.
+        """
+        if len(asal) == 0:
+            return
+        asal = np.asarray(asal, dtype=np.int64)
+        tujuan = np.asarray(tujuan, dtype=np.int64)
+        jumlah = np.asarray(jumlah, dtype=np.float64) / self.faktor
+
+        # Gabungkan deposit untuk edge yang sama
+        kunci, invers = np.unique(asal * self.jumlah_tugas + tujuan, return_inverse=True)
+        total = np.bincount(invers, weights=jumlah, minlength=len(kunci))
+        asal, tujuan = np.divmod(kunci, self.jumlah_tugas)
+
+        # Edge yang sudah ada di candidate list: update langsung
+        cocok = self.kandidat[asal] == tujuan[:, None]
+        ada = cocok.any(axis=1)
+        kolom = cocok.argmax(axis=1)
+        self.nilai[asal[ada], kolom[ada]] += total[ada]
+
+        # Edge baru: yang terkuat didahulukan
+        baru = np.flatnonzero(~ada)
+        for e in baru[np.argsort(-total[baru], kind="stable")]:
+            i = asal[e]
+            nilai_baru = self.nilai_default + total[e]
+            baris_kandidat = self.kandidat[i]
+            kosong = np.flatnonzero(baris_kandidat < 0)
+            if len(kosong):
+                j = kosong[0]
+            else:
+                j = int(np.argmin(self.nilai[i]))
+                if self.nilai[i, j] >= nilai_baru:
+                    continue
+            baris_kandidat[j] = tujuan[e]
+            self.nilai[i, j] = nilai_baru
+
+    def to_dense(self):
+        """
+        Matriks feromon penuh T x T (untuk inspeksi/tes pada jumlah tugas kecil).
+        """
+        padat = np.full(self.shape, self.nilai_default, dtype=np.float64)
+        baris, kolom = np.nonzero(self.kandidat >= 0)
+        padat[baris, self.kandidat[baris, kolom]] = self.nilai[baris, kolom]
+        return padat * self.faktor
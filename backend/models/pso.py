@@ -1,9 +1,42 @@
 import numpy as np
-import random
 import json
 import time
 import pandas as pd
 from .base import MultiAgentScheduler
+from .parallel import (
+    SharedArray,
+    clamp_workers,
+    create_pool,
+    restore_scheduler,
+    split_counts,
+    worker_state,
+)
+
+# State scheduler di dalam proses worker (diisi sekali oleh initializer pool)
+_WORKER = {}
+
+
+def _init_swarm_worker(kelas, state, spesifikasi):
+    """
+    Initializer worker: rekonstruksi scheduler dan tempel matriks posisi dari shared memory.
+    """
+    scheduler = restore_scheduler(kelas, state)
+    shared = SharedArray.attach(spesifikasi)
+    scheduler.posisi = shared.array
+    _WORKER["scheduler"] = scheduler
+    _WORKER["shared"] = shared
+
+
+def _evaluate_particles_chunk(rentang):
+    """
+    Evaluasi partikel [awal, akhir) di worker: (biaya, durasi_total, keseimbangan) per partikel.
+    """
+    awal, akhir = rentang
+    scheduler = _WORKER["scheduler"]
+    return [
+        scheduler.evaluate_sequence(urutan.tolist())[:3]
+        for urutan in scheduler.positions_to_sequences(scheduler.posisi[awal:akhir])
+    ]
 
 
 class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
@@ -21,32 +54,44 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
         w=0.3,
         c1=0.3,
         c2=0.4,
+        n_workers=1,
+        bottom_level_bias=0.0,
         **kwargs,
     ):
         """
         Inisialisasi Scheduler PSO dengan parameter partikel, inerisa, dan koefisien kognitif/sosial.
+
+        `n_workers` > 1 mengevaluasi partikel di process pool dengan `posisi` di shared memory.
+        Nilainya dibatasi ke jumlah CPU (dan MAX_SOLVER_WORKERS) di sisi server.
+        `bottom_level_bias` > 0 membiaskan posisi awal agar tugas dengan bottom-level tinggi
+        (lintasan kritis) cenderung didekode lebih dulu.
         """
         super().__init__(tasks, agents, cost_function, **kwargs)
+        self.n_workers = clamp_workers(n_workers)
+        self._pool = None
+        self._posisi_shared = None
         self.jumlah_partikel = n_particles if self.jumlah_tugas > 0 else 0
         self.jumlah_iterasi = n_iterations if self.jumlah_tugas > 0 else 0
         self.w, self.c1, self.c2 = w, c1, c2
 
         if self.jumlah_tugas > 0 and self.jumlah_partikel > 0:
             # Inisialisasi posisi partikel dengan nilai acak antara 0.0 dan 1.0
-            self.posisi = np.random.rand(self.jumlah_partikel, self.jumlah_tugas)
+            self.posisi = self.rng.random((self.jumlah_partikel, self.jumlah_tugas))
 
             # Bias prioritas (agar tugas penting cenderung di depan)
-            for i, task in enumerate(self.tugas):
-                priority = task.get("priority", 1)
-                priority_bias = (priority - 1) * 0.025
-                self.posisi[:, i] += priority_bias
+            self.posisi += (self.tabel_tugas.prioritas - 1) * 0.025
 
             # Batasi nilai posisi agar tetap rasional
             self.posisi = np.clip(self.posisi, 0, 2)
 
+            # Bias lintasan kritis (bottom-level ternormalisasi ke [0, 1]), setelah clip agar
+            # bobot besar tetap membedakan tugas
+            if bottom_level_bias:
+                self.posisi += bottom_level_bias * self.critical_path_bias()
+
             # Inisialisasi kecepatan partikel
             self.kecepatan = (
-                np.random.rand(self.jumlah_partikel, self.jumlah_tugas) * 0.1
+                self.rng.random((self.jumlah_partikel, self.jumlah_tugas)) * 0.1
             )
 
             # Inisialisasi pbest
@@ -65,64 +110,81 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
             self.durasi_pbest = np.array([])
             self.posisi_gbest = None
 
+    def critical_path_bias(self):
+        """
+        Bias per tugas (0..1) yang mendorong tugas ber-bottom-level tinggi ke depan urutan.
+
+        Dekoder dengan dependensi memilih posisi tertinggi lebih dulu, sedangkan argsort
+        tanpa dependensi memilih posisi terendah lebih dulu, jadi arah bias disesuaikan.
+        """
+        bawah = self.bottom_level
+        skala = bawah.max() if len(bawah) else 0.0
+        relatif = bawah / skala if skala > 0 else np.zeros_like(bawah)
+        return relatif if self.enable_dependencies else 1.0 - relatif
+
     def position_to_sequence(self, posisi):
         """
         Konversi posisi partikel (kontinu) ke urutan tugas (diskrit) dengan perbaikan dependensi.
         """
         if self.jumlah_tugas == 0:
             return []
+        return self.positions_to_sequences(np.asarray(posisi)[None, :])[0].copy()
+
+    def positions_to_sequences(self, posisi):
+        """
+        Konversi matriks posisi (partikel x tugas) menjadi matriks urutan (partikel x tugas).
+
+        Tanpa dependensi cukup satu argsort per baris. Dengan dependensi, setiap partikel
+        didekode lewat perbaikan topologis berbasis priority queue (O(T log T + E)): tugas
+        siap dengan penalti tertinggi (posisi - 0.5 x jumlah dependensi) dipilih lebih dulu.
+        """
+        posisi = np.asarray(posisi, dtype=np.float64)
         if not self.enable_dependencies:
-            return np.argsort(posisi)
-
-        # Koreksi berbasis penalti
-        urutan = np.argsort(posisi)
-        penalti = {}
-        selesai = set()
-        tersedia = set(urutan)
-        terkoreksi = []
-        iterasi_maks = self.jumlah_tugas * 2
-
-        daftar_id_tugas = [str(tugas[self.task_id_col]) for tugas in self.tugas]
-
-        # Hitung Penalti Awal
-        for indeks_tugas in urutan:
-            tid = daftar_id_tugas[indeks_tugas]
-            prioritas_dasar = posisi[indeks_tugas]
-            dep_tidak_terpenuhi = sum(
-                1 for dep in self.dependensi.get(tid, []) if dep not in selesai
+            return np.argsort(posisi, axis=1)
+
+        # Koreksi berbasis penalti: beri penalti sesuai jumlah dependensi tugas
+        penalti = posisi - self.graf.indegree * 0.5
+        urutan = np.empty(posisi.shape, dtype=np.int64)
+        for p in range(len(posisi)):
+            urutan[p] = self.graf.priority_order(penalti[p])
+        return urutan
+
+    def sequence_to_position(self, urutan):
+        """
+        Posisi partikel yang didekode kembali menjadi `urutan` (kebalikan dekoder).
+
+        Tanpa dependensi posisi naik sesuai urutan (argsort). Dengan dependensi, skor penalti
+        (posisi - 0.5 x jumlah dependensi) dibuat turun sesuai urutan, sehingga urutan yang
+        topologis didekode persis sama.
+        """
+        jumlah = len(urutan)
+        urutan = np.asarray(urutan, dtype=np.int64)
+        posisi = np.empty(self.jumlah_tugas)
+        if not self.enable_dependencies:
+            posisi[urutan] = np.arange(jumlah) / jumlah
+        else:
+            posisi[urutan] = (
+                self.graf.indegree[urutan] * 0.5 + (jumlah - np.arange(jumlah)) / jumlah
             )
-            # Beri penalti jika ada dependensi yang belum terpenuhi
-            penalti[indeks_tugas] = prioritas_dasar - (dep_tidak_terpenuhi * 0.5)
-
-        hitung_iterasi = 0
-        while tersedia and hitung_iterasi < iterasi_maks:
-            hitung_iterasi += 1
-
-            # Cari tugas yang siap (dependensi lunas)
-            siap = [
-                idx
-                for idx in tersedia
-                if self.is_dependency_satisfied(daftar_id_tugas[idx], selesai)
-            ]
-
-            if siap:
-                # Pilih yang prioritasnya (nilai posisi) paling tinggi
-                terbaik = max(siap, key=lambda t: penalti[t])
-                terkoreksi.append(terbaik)
-                tersedia.remove(terbaik)
-                selesai.add(daftar_id_tugas[terbaik])
-            else:
-                # Fallback: Ambil tugas dengan sisa dependensi paling sedikit (Deadlock)
-                fallback = min(
-                    tersedia,
-                    key=lambda t: len(self.dependensi.get(daftar_id_tugas[t], [])),
-                )
-                terkoreksi.append(fallback)
-                tersedia.remove(fallback)
-                selesai.add(daftar_id_tugas[fallback])
+        return posisi
 
-        terkoreksi.extend(sorted(tersedia))
-        return np.array(terkoreksi)
+    def improve_gbest(self):
+        """
+        Local search pada urutan gbest; jika lebih baik, urutan hasilnya dijadikan gbest
+        (posisinya dikodekan ulang lewat `sequence_to_position`).
+        """
+        if self.posisi_gbest is None:
+            return False
+        urutan, evaluasi = self.improve_sequence(self.position_to_sequence(self.posisi_gbest))
+        if not self.is_better(evaluasi):
+            return False
+        posisi = self.sequence_to_position(urutan)
+        # Urutan yang tidak bisa direproduksi dekoder (misal fallback deadlock) dilewati
+        if self.position_to_sequence(posisi).tolist() != urutan:
+            return False
+        self.update_best(urutan, evaluasi)
+        self.posisi_gbest = posisi
+        return True
 
     def position_to_schedule(self, posisi):
         """
@@ -132,45 +194,128 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
         jadwal, waktu_selesai_agen, keseimbangan_beban = self.assign_to_agents(urutan)
         return jadwal, waktu_selesai_agen
 
-    def optimize(self, show_progress=True, progress_callback=None):
+    def update_velocity_and_position(self):
+        """
+        Update kecepatan dan posisi seluruh swarm sebagai satu operasi matriks (partikel x tugas).
+
+        r1/r2 diambil dalam satu panggilan dari generator scheduler dengan urutan stream yang
+        sama seperti pengambilan per partikel (r1, r2 partikel 0, lalu partikel 1, ...). Posisi
+        diupdate in-place agar tetap berbagi buffer dengan worker.
+        """
+        acak = self.rng.random((self.jumlah_partikel, 2, self.jumlah_tugas))
+        r1, r2 = acak[:, 0], acak[:, 1]
+        kognitif = self.c1 * r1 * (self.posisi_pbest - self.posisi)
+        sosial = self.c2 * r2 * (self.posisi_gbest - self.posisi)
+        self.kecepatan *= self.w
+        self.kecepatan += kognitif
+        self.kecepatan += sosial
+        self.posisi += self.kecepatan
+
+    def evaluate_swarm(self):
+        """
+        Evaluasi semua partikel untuk satu iterasi.
+
+        Menghasilkan (urutan, (biaya, durasi_total, keseimbangan, hasil)) per partikel. Di
+        process pool, `urutan` dan `hasil` bernilai None dan dihitung ulang di induk hanya
+        jika partikel menjadi gbest baru (evaluasi bersifat deterministik).
+        """
+        if self._pool is None:
+            for urutan in self.positions_to_sequences(self.posisi):
+                urutan = urutan.tolist()
+                yield urutan, self.evaluate_sequence(urutan)
+            return
+
+        potongan = split_counts(self.jumlah_partikel, self.n_workers)
+        batas = np.concatenate(([0], np.cumsum(potongan))).tolist()
+        for hasil_potongan in self._pool.map(
+            _evaluate_particles_chunk, list(zip(batas[:-1], batas[1:]))
+        ):
+            for evaluasi in hasil_potongan:
+                yield None, (*evaluasi, None)
+
+    def start_workers(self):
+        """
+        Pindahkan matriks posisi ke shared memory dan buat process pool (jika n_workers > 1).
+        """
+        if self.n_workers <= 1 or self.jumlah_partikel <= 1 or self._pool is not None:
+            return
+        self._posisi_shared = SharedArray.from_array(self.posisi)
+        self.posisi = self._posisi_shared.array
+        state = worker_state(
+            self,
+            ("posisi", "kecepatan", "posisi_pbest", "_pool", "_posisi_shared"),
+        )
+        self._pool = create_pool(
+            min(self.n_workers, self.jumlah_partikel),
+            _init_swarm_worker,
+            (self.__class__, state, self._posisi_shared.spec),
+        )
+
+    def stop_workers(self):
+        """
+        Hentikan process pool dan kembalikan posisi ke array biasa.
+        """
+        if self._pool is None:
+            return
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        self.posisi = self._posisi_shared.release()
+        self._posisi_shared = None
+
+    def optimize(
+        self,
+        show_progress=True,
+        progress_callback=None,
+        time_budget_ms=None,
+        gap_tolerance=None,
+    ):
         """
         Jalankan loop utama optimasi PSO.
+
+        `time_budget_ms` (opsional) membatasi waktu wall-clock; jika habis, loop berhenti di
+        antara evaluasi partikel dan hasil ditandai `budget_exhausted`. `gap_tolerance` (persen)
+        menghentikan loop begitu makespan terbaik berada dalam toleransi dari batas bawahnya.
         """
-        waktu_mulai = time.time()
+        self.penghentian.reset(time_budget_ms, gap_tolerance)
         if self.jumlah_partikel == 0 or self.jumlah_tugas == 0:
             return super().optimize(
                 show_progress=False, progress_callback=progress_callback
             )
 
+        self.start_workers()
+        try:
+            return self.run_swarm(show_progress, progress_callback)
+        finally:
+            self.stop_workers()
+
+    def run_swarm(self, show_progress=True, progress_callback=None):
+        """
+        Loop iterasi swarm: evaluasi partikel, update pbest/gbest, kecepatan dan posisi.
+        """
+        waktu_mulai = time.time()
 
         if show_progress:
             print(f"Memulai optimasi {self.__class__.__name__}...")
 
         urutan_awal = self.position_to_sequence(self.posisi[0])
-        jadwal_awal, waktu_agen_awal, keseimbangan_awal = self.assign_to_agents(
-            urutan_awal
+        biaya_awal, durasi_total_awal, keseimbangan_awal, hasil_awal = (
+            self.evaluate_sequence(urutan_awal)
         )
-        durasi_total_awal = max(waktu_agen_awal.values(), default=0)
-        self.biaya_terbaik = self.fungsi_biaya(jadwal_awal, durasi_total_awal)
+        self.biaya_terbaik = biaya_awal
         self.durasi_terbaik = durasi_total_awal
-        self.jadwal_terbaik = jadwal_awal
+        self.jadwal_terbaik = self.build_schedule(urutan_awal, hasil_awal)
         self.indeks_keseimbangan_terbaik = keseimbangan_awal
 
         for i in range(self.jumlah_iterasi):
             ada_terbaik_baru = False
 
-            for p in range(self.jumlah_partikel):
-                # Evaluasi Partikel
-                jadwal, waktu_agen = self.position_to_schedule(self.posisi[p])
-                durasi_total = max(waktu_agen.values(), default=0)
-                indeks_keseimbangan = self.calculate_load_balance_index(waktu_agen)
-                biaya = self.fungsi_biaya(jadwal, durasi_total)
+            biaya_iterasi = np.empty(self.jumlah_partikel)
+            durasi_iterasi = np.empty(self.jumlah_partikel)
 
-                # Update Personal Best (PBest)
-                if biaya < self.biaya_pbest[p]:
-                    self.biaya_pbest[p] = biaya
-                    self.durasi_pbest[p] = durasi_total
-                    self.posisi_pbest[p] = self.posisi[p].copy()
+            # Evaluasi Partikel (tanpa membangun dict jadwal; serial atau di process pool)
+            for p, (urutan, evaluasi) in enumerate(self.evaluate_swarm()):
+                biaya, durasi_total, indeks_keseimbangan, hasil = evaluasi
+                biaya_iterasi[p], durasi_iterasi[p] = biaya, durasi_total
 
                 # Update Global Best (GBest)
                 if biaya < self.biaya_terbaik or (
@@ -179,22 +324,33 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
                 ):
                     self.biaya_terbaik = biaya
                     self.durasi_terbaik = durasi_total
-                    self.jadwal_terbaik = jadwal
+                    if hasil is None:
+                        urutan = self.position_to_sequence(self.posisi[p])
+                        hasil = self.evaluate_sequence(urutan)[3]
+                    self.jadwal_terbaik = self.build_schedule(urutan, hasil)
                     self.indeks_keseimbangan_terbaik = indeks_keseimbangan
                     self.posisi_gbest = self.posisi[p].copy()
                     ada_terbaik_baru = True
 
-            # Update Kecepatan dan Posisi Partikel
-            if self.posisi_gbest is not None:
-                for p in range(self.jumlah_partikel):
-                    r1, r2 = (
-                        np.random.rand(self.jumlah_tugas),
-                        np.random.rand(self.jumlah_tugas),
-                    )
-                    kognitif = self.c1 * r1 * (self.posisi_pbest[p] - self.posisi[p])
-                    sosial = self.c2 * r2 * (self.posisi_gbest - self.posisi[p])
-                    self.kecepatan[p] = self.w * self.kecepatan[p] + kognitif + sosial
-                    self.posisi[p] += self.kecepatan[p]
+                # Anggaran waktu habis: sisa partikel tidak dievaluasi
+                if self.penghentian.time_exhausted():
+                    break
+
+            # Swarm yang terpotong anggaran waktu tidak lagi digerakkan
+            if not self.penghentian.anggaran_habis:
+                # Update Personal Best (PBest) sekaligus untuk seluruh swarm
+                lebih_baik = biaya_iterasi < self.biaya_pbest
+                self.biaya_pbest[lebih_baik] = biaya_iterasi[lebih_baik]
+                self.durasi_pbest[lebih_baik] = durasi_iterasi[lebih_baik]
+                self.posisi_pbest[lebih_baik] = self.posisi[lebih_baik]
+
+                # Local search pada partikel terbaik iterasi; hasil yang lebih baik menjadi gbest
+                if self.mode_local_search == "iteration" and self.improve_gbest():
+                    ada_terbaik_baru = True
+
+                # Update Kecepatan dan Posisi Partikel
+                if self.posisi_gbest is not None:
+                    self.update_velocity_and_position()
 
             self.riwayat_iterasi.append(
                 {
@@ -231,12 +387,29 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
                     f"Iterasi {i + 1}: Makespan Terbaik: {self.durasi_terbaik:.2f}, Load Balance: {self.indeks_keseimbangan_terbaik:.4f}"
                 )
 
+            # Early stopping: target makespan tercapai atau konvergen (tanpa perbaikan)
+            if self.penghentian.update(self.durasi_terbaik) is not None:
+                if show_progress:
+                    print(f"Berhenti di iterasi {i + 1}: {self.penghentian.alasan}")
+                break
+
         waktu_akhir_agen_final = {}
         if self.posisi_gbest is not None:
             self.jadwal_terbaik, waktu_akhir_agen_final = self.position_to_schedule(
                 self.posisi_gbest
             )
 
+            # Local search sekali pada gbest akhir (jadwal diambil langsung dari urutannya)
+            if self.mode_local_search == "final":
+                urutan, evaluasi = self.improve_sequence(
+                    self.position_to_sequence(self.posisi_gbest)
+                )
+                if self.is_better(evaluasi):
+                    self.update_best(urutan, evaluasi)
+                    waktu_akhir_agen_final = dict(
+                        zip(self.daftar_id_agen, evaluasi[3][2].tolist())
+                    )
+
         # Time Complexity: O(T × N × D × E)
         time_complexity = f"O({self.jumlah_iterasi} × {self.jumlah_partikel} × {self.jumlah_tugas} × {len(self.agen)})"
 
@@ -255,6 +428,10 @@ class PSO_MultiAgent_Scheduler(MultiAgentScheduler):
             "time_complexity": time_complexity,
             "iteration_history": pd.DataFrame(self.riwayat_iterasi),
             "algorithm": self.__class__.__name__,
+            "stop_reason": self.penghentian.alasan,
+            "budget_exhausted": self.penghentian.anggaran_habis,
+            "lower_bound": self.batas_bawah_makespan,
+            "gap": self.optimality_gap(self.durasi_terbaik),
         }
 
 
@@ -0,0 +1,131 @@
+import time
+
+
+def optimality_gap(makespan, batas_bawah):
+    """
+    Selisih makespan terhadap batas bawahnya dalam persen: (makespan - LB) / LB * 100.
+
+    None jika gap tidak terdefinisi (batas bawah tidak ada, atau nol dengan makespan > 0).
+    """
+    if batas_bawah is None or makespan == float("inf"):
+        return None
+    if batas_bawah <= 0:
+        return 0.0 if makespan <= 0 else None
+    return (makespan - batas_bawah) / batas_bawah * 100.0
+
+
+class EarlyStopping:
+    """
+    Kriteria henti berbasis konvergensi untuk loop iterasi ACO/PSO.
+
+    Dicek sekali per iterasi dengan makespan terbaik saat ini. Loop berhenti lebih awal jika
+    makespan sudah mencapai `target_makespan`, atau jika selama `patience` iterasi
+    berturut-turut tidak ada perbaikan relatif lebih dari `min_improvement` (misal 0.001 =
+    0,1%) terhadap makespan acuan terakhir.
+
+    `time_budget_ms` membatasi waktu wall-clock (mode anytime): loop mengecek sisa waktu di
+    antara evaluasi lewat `time_exhausted` dan berhenti dengan solusi terbaik sejauh ini.
+
+    `gap_tolerance` (persen) menghentikan loop begitu makespan terbukti berada dalam
+    toleransi dari `lower_bound` (batas bawah makespan scheduler).
+
+    Jika beberapa kriteria terpenuhi bersamaan, alasan dilaporkan dengan urutan: anggaran
+    waktu, target makespan, gap, lalu patience. Iterasi yang terpotong anggaran selalu
+    berakhir dengan `time_budget_exhausted`, konsisten dengan flag `budget_exhausted`.
+    """
+
+    # Alasan berhenti yang dilaporkan di hasil optimize dan event SSE `done`
+    MAX_ITERATIONS = "max_iterations"
+    NO_IMPROVEMENT = "no_improvement"
+    TARGET_REACHED = "target_makespan_reached"
+    BUDGET_EXHAUSTED = "time_budget_exhausted"
+    GAP_REACHED = "gap_tolerance_reached"
+
+    def __init__(
+        self,
+        patience=None,
+        min_improvement=0.0,
+        target_makespan=None,
+        time_budget_ms=None,
+        gap_tolerance=None,
+        lower_bound=None,
+    ):
+        """
+        Inisialisasi kriteria; nilai None (bawaan) menonaktifkan kriteria terkait.
+        """
+        self.patience = int(patience) if patience else None
+        self.min_improvement = min(max(0.0, float(min_improvement or 0.0)), 0.99)
+        self.target_makespan = (
+            float(target_makespan) if target_makespan is not None else None
+        )
+        self.time_budget_ms = (
+            float(time_budget_ms) if time_budget_ms is not None else None
+        )
+        self.gap_tolerance = float(gap_tolerance) if gap_tolerance is not None else None
+        self.lower_bound = lower_bound
+        self.reset()
+
+    def reset(self, time_budget_ms=None, gap_tolerance=None):
+        """
+        Kosongkan state dan mulai hitung anggaran waktu sebelum satu pemanggilan optimize.
+
+        `time_budget_ms` dan `gap_tolerance` menimpa nilai konstruktor untuk pemanggilan ini.
+        """
+        self.toleransi_gap = (
+            float(gap_tolerance) if gap_tolerance is not None else self.gap_tolerance
+        )
+        self.acuan = float("inf")
+        self.tanpa_perbaikan = 0
+        self.alasan = self.MAX_ITERATIONS
+        self.anggaran_habis = False
+
+        anggaran = time_budget_ms if time_budget_ms is not None else self.time_budget_ms
+        self.tenggat = (
+            time.perf_counter() + max(0.0, float(anggaran)) / 1000.0
+            if anggaran is not None
+            else None
+        )
+
+    def time_exhausted(self):
+        """
+        True jika anggaran waktu sudah habis (murah, aman dicek per evaluasi).
+        """
+        if self.tenggat is None:
+            return False
+        if not self.anggaran_habis and time.perf_counter() >= self.tenggat:
+            self.anggaran_habis = True
+            self.alasan = self.BUDGET_EXHAUSTED
+        return self.anggaran_habis
+
+    def gap_reached(self, makespan):
+        """
+        True jika gap makespan terhadap batas bawah sudah dalam `gap_tolerance`.
+        """
+        gap = optimality_gap(makespan, self.lower_bound)
+        # Toleransi kecil untuk galat pembulatan saat makespan tepat di batas bawah
+        return gap is not None and gap <= self.toleransi_gap + 1e-9
+
+    def update(self, makespan):
+        """
+        Catat makespan terbaik iterasi ini; kembalikan alasan berhenti atau None.
+        """
+        if makespan < self.acuan * (1 - self.min_improvement):
+            self.acuan = makespan
+            self.tanpa_perbaikan = 0
+        else:
+            self.tanpa_perbaikan += 1
+
+        if self.anggaran_habis:
+            # Sudah ditandai di tengah iterasi: jangan ditimpa kriteria lain
+            self.alasan = self.BUDGET_EXHAUSTED
+        elif self.target_makespan is not None and makespan <= self.target_makespan:
+            self.alasan = self.TARGET_REACHED
+        elif self.toleransi_gap is not None and self.gap_reached(makespan):
+            self.alasan = self.GAP_REACHED
+        elif self.patience is not None and self.tanpa_perbaikan >= self.patience:
+            self.alasan = self.NO_IMPROVEMENT
+        elif self.time_exhausted():
+            self.alasan = self.BUDGET_EXHAUSTED
+        else:
+            return None
+        return self.alasan
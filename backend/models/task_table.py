@@ -0,0 +1,101 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+class TaskTable:
+    """
+    Representasi tugas struct-of-arrays yang dibangun sekali per scheduler.
+
+    Menyimpan durasi dan prioritas sebagai array float64 kontigu, ID tugas ter-intern ke
+    indeks integer, dan record asli hanya untuk keperluan output. Tabel hasil ingestion
+    kolumnar juga membawa biaya dan dependensi yang sudah diparse (list per baris).
+    """
+
+    def __init__(self, ids, durasi, prioritas, records=None, biaya=None, dependensi=None):
+        """
+        Inisialisasi tabel dari daftar ID (string), array durasi, dan array prioritas.
+        """
+        self.ids = [str(id_tugas) for id_tugas in ids]
+        self.durasi = np.ascontiguousarray(durasi, dtype=np.float64)
+        self.prioritas = np.ascontiguousarray(prioritas, dtype=np.float64)
+        self.biaya = (
+            np.ascontiguousarray(biaya, dtype=np.float64)
+            if biaya is not None
+            else np.zeros(len(self.ids), dtype=np.float64)
+        )
+        self.dependensi = dependensi
+        self.records = records
+
+        # ID -> indeks (ID duplikat memakai kemunculan terakhir, seperti peta_tugas lama)
+        self.indeks = {id_tugas: i for i, id_tugas in enumerate(self.ids)}
+        self.slot = np.fromiter(
+            (self.indeks[id_tugas] for id_tugas in self.ids),
+            dtype=np.int64,
+            count=len(self.ids),
+        )
+
+    @classmethod
+    def from_records(cls, records, task_id_col="id"):
+        """
+        Bangun tabel dari list dict atau DataFrame tugas.
+        """
+        if isinstance(records, pd.DataFrame):
+            records = records.to_dict("records")
+        return cls(
+            [tugas[task_id_col] for tugas in records],
+            [tugas.get("length", tugas.get("duration", 1)) for tugas in records],
+            [tugas.get("priority", 1) for tugas in records],
+            records=records,
+        )
+
+    def dependency_map(self):
+        """
+        Dict dependensi {id_tugas: [id_dep, ...]} dari dependensi per baris (baris terakhir
+        menang untuk ID duplikat, sama seperti parse_dependencies).
+        """
+        if self.dependensi is None:
+            return None
+        return dict(zip(self.ids, self.dependensi))
+
+    def to_records(self, task_id_col="id"):
+        """
+        Record tugas (list dict) dari kolom tabel, untuk heuristik kustom dan output.
+        """
+        if self.records is not None:
+            return self.records
+        dependensi = self.dependensi or [[] for _ in self.ids]
+        return [
+            {
+                task_id_col: id_tugas,
+                "length": durasi,
+                "cost": biaya,
+                "priority": prioritas,
+                "dependencies": list(deps),
+            }
+            for id_tugas, durasi, biaya, prioritas, deps in zip(
+                self.ids,
+                self.durasi.tolist(),
+                self.biaya.tolist(),
+                self.prioritas.tolist(),
+                dependensi,
+            )
+        ]
+
+    def fingerprint(self):
+        """
+        Hash SHA-256 isi tabel (ID, durasi, biaya, prioritas, dependensi) untuk kunci cache.
+        """
+        h = hashlib.sha256()
+        h.update("\x1f".join(self.ids).encode("utf-8"))
+        for kolom in (self.durasi, self.biaya, self.prioritas):
+            h.update(kolom.tobytes())
+        if self.dependensi is not None:
+            h.update(
+                "\x1e".join("\x1f".join(deps) for deps in self.dependensi).encode("utf-8")
+            )
+        return h.hexdigest()
+
+    def __len__(self):
+        return len(self.ids)
@@ -87,10 +87,15 @@ def generate_agen_default(jumlah_agen, agent_id_col="id"):
 def hitung_load_balance_index(waktu_selesai_agen):
     """
     Menghitung indeks keseimbangan beban kerja antar agen (Coef. of Variation).
+    Menerima dict {agen: waktu_selesai} atau deretan waktu selesai.
     """
-    if not waktu_selesai_agen:
+    if waktu_selesai_agen is None or len(waktu_selesai_agen) == 0:
         return 0.0
-    times = list(waktu_selesai_agen.values())
+    times = list(
+        waktu_selesai_agen.values()
+        if isinstance(waktu_selesai_agen, dict)
+        else waktu_selesai_agen
+    )
     if len(times) <= 1:
         return 0.0
 
@@ -128,10 +133,14 @@ def fungsi_biaya_jadwal(jadwal, durasi_total):
         if id_agen is not None:
             waktu_selesai[id_agen] = max(waktu_selesai.get(id_agen, 0), waktu_akhir)
 
-    # Hitung load balance
-    keseimbangan = hitung_load_balance_index(waktu_selesai)
+    return hitung_biaya_makespan_lbi(waktu_selesai, durasi_total)
 
-    # Biaya = Makespan × (1 + LBI)
+
+def hitung_biaya_makespan_lbi(waktu_selesai_agen, durasi_total):
+    """
+    Biaya Makespan × (1 + LBI) langsung dari waktu selesai agen yang mendapat tugas.
+    """
+    keseimbangan = hitung_load_balance_index(waktu_selesai_agen)
     biaya = durasi_total * (1 + keseimbangan)
     return max(0.1, biaya)
 
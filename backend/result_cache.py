@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResultCache:
+    """
+    Cache hasil simulasi berbasis konten (LRU + TTL) dengan tier disk opsional.
+
+    Kunci adalah hash SHA-256 dari input simulasi yang sudah dinormalisasi, nilai adalah
+    event SSE yang cukup untuk me-replay simulasi tanpa menjalankan scheduler lagi.
+    Aman dipakai dari banyak thread (worker gthread).
+    """
+
+    def __init__(self, max_entries=128, ttl_seconds=3600, disk_dir=None, max_disk_entries=512):
+        """
+        Inisialisasi cache memori berukuran `max_entries` dan (opsional) direktori disk.
+
+        Tier disk punya batas sendiri (`max_disk_entries`), jadi setup disk saja
+        (`max_entries=0`) tetap menyimpan entri.
+        """
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max(0, int(max_disk_entries))
+        self._entri = OrderedDict()
+        self._lock = threading.Lock()
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """
+        Bangun cache dari variabel lingkungan RESULT_CACHE_SIZE/_TTL/_DIR/_DISK_SIZE.
+        """
+        return cls(
+            max_entries=int(os.getenv("RESULT_CACHE_SIZE", "128")),
+            ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", "3600")),
+            disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+            max_disk_entries=int(os.getenv("RESULT_CACHE_DISK_SIZE", "512")),
+        )
+
+    @staticmethod
+    def make_key(**bagian):
+        """
+        Hash konten (JSON kanonik, kunci terurut) dari semua bagian input simulasi.
+        """
+        kanonik = json.dumps(bagian, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(kanonik.encode("utf-8")).hexdigest()
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 or (bool(self.disk_dir) and self.max_disk_entries > 0)
+
+    def _path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Ambil entri yang belum kedaluwarsa (memori dulu, lalu disk), atau None.
+        """
+        sekarang = time.time()
+        with self._lock:
+            entri = self._entri.get(key)
+            if entri is not None:
+                waktu_simpan, nilai = entri
+                if sekarang - waktu_simpan <= self.ttl_seconds:
+                    self._entri.move_to_end(key)
+                    return nilai
+                del self._entri[key]
+
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            # mtime dibaca sekali: file bisa dihapus proses lain (pemangkasan) kapan saja
+            waktu_simpan = os.path.getmtime(path)
+            if sekarang - waktu_simpan > self.ttl_seconds:
+                os.remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                nilai = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Promosikan ke tier memori
+        self._simpan_memori(key, nilai, waktu_simpan)
+        return nilai
+
+    def set(self, key, nilai):
+        """
+        Simpan entri ke memori (evict LRU) dan ke disk jika tier disk aktif.
+        """
+        self._simpan_memori(key, nilai, time.time())
+        if not self.disk_dir:
+            return
+        path = self._path(key)
+        sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(sementara, "w", encoding="utf-8") as f:
+                json.dump(nilai, f)
+            os.replace(sementara, path)
+            self._pangkas_disk()
+        except (OSError, TypeError, ValueError):
+            if os.path.exists(sementara):
+                os.remove(sementara)
+
+    def _simpan_memori(self, key, nilai, waktu_simpan):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entri[key] = (waktu_simpan, nilai)
+            self._entri.move_to_end(key)
+            while len(self._entri) > self.max_entries:
+                self._entri.popitem(last=False)
+
+    def _pangkas_disk(self):
+        """
+        Hapus file tertua jika jumlah entri disk melebihi batas.
+        """
+        files = [
+            os.path.join(self.disk_dir, nama)
+            for nama in os.listdir(self.disk_dir)
+            if nama.endswith(".json")
+        ]
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[: len(files) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        """
+        Kosongkan tier memori (dan disk jika aktif).
+        """
+        with self._lock:
+            self._entri.clear()
+        if self.disk_dir:
+            for nama in os.listdir(self.disk_dir):
+                if nama.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.disk_dir, nama))
+                    except OSError:
+                        pass
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entri)
@@ -8,6 +8,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from tests.test_app import TestFlaskApp
 from tests.test_aco import TestACOAlgorithm
 from tests.test_pso import TestPSOAlgorithm
+from tests.test_base import TestMultiAgentScheduler
+from tests.test_result_cache import TestResultCache
+from tests.test_ingestion import TestIngestion
+from tests.test_dataset_registry import TestDatasetRegistry
+from tests.test_job_queue import TestJobQueue
 
 def create_test_suite():
     """Membuat test suite komprehensif untuk semua komponen backend"""
@@ -22,6 +27,21 @@ def create_test_suite():
     
     # Tambahkan tes algoritma PSO
     test_suite.addTest(loader.loadTestsFromTestCase(TestPSOAlgorithm))
+
+    # Tambahkan tes kelas dasar scheduler
+    test_suite.addTest(loader.loadTestsFromTestCase(TestMultiAgentScheduler))
+
+    # Tambahkan tes cache hasil simulasi
+    test_suite.addTest(loader.loadTestsFromTestCase(TestResultCache))
+
+    # Tambahkan tes ingestion kolumnar payload tugas
+    test_suite.addTest(loader.loadTestsFromTestCase(TestIngestion))
+
+    # Tambahkan tes dataset registry (kolom memory-map)
+    test_suite.addTest(loader.loadTestsFromTestCase(TestDatasetRegistry))
+
+    # Tambahkan tes antrean job asinkron
+    test_suite.addTest(loader.loadTestsFromTestCase(TestJobQueue))
     
     return test_suite
 
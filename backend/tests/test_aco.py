@@ -3,10 +3,14 @@ import sys
 import os
 from unittest.mock import patch, MagicMock
 
+import numpy as np
+
 # Tambahkan direktori induk ke path untuk mengimpor model
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.aco import ACO_MultiAgent_Scheduler
+from models.utils import fungsi_biaya_jadwal
+from models.pheromone import SparsePheromone
 
 class TestACOAlgorithm(unittest.TestCase):
     def setUp(self):
@@ -112,6 +116,320 @@ class TestACOAlgorithm(unittest.TestCase):
         self.assertEqual(len(sequence), 3)
         self.assertEqual(set(sequence), {0, 1, 2})
 
+    def test_heuristic_vector_and_pheromone_dtype(self):
+        """Menguji heuristik disimpan sebagai vektor dan dtype feromon dapat diatur"""
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks,
+            agents=self.agents,
+            cost_function=self.cost_function,
+            pheromone_dtype='float32'
+        )
+
+        self.assertEqual(aco.heuristik.shape, (3,))
+        self.assertAlmostEqual(aco.heuristik[1], 1.0 / 3)
+        self.assertEqual(aco.feromon.dtype.name, 'float32')
+
+        probabilitas = aco.calculate_probabilities(0, [1, 2])
+        self.assertAlmostEqual(float(probabilitas.sum()), 1.0, places=6)
+        self.assertGreater(probabilitas[0], probabilitas[1])
+
+    def test_vectorized_deposit_is_bit_identical(self):
+        """Menguji deposit feromon vektor identik bit-per-bit dengan loop per edge"""
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function
+        )
+        rute_list = [[0, 1, 2], [2, 0, 1], [1, 2], [0], []]
+        biaya_list = [10.0, 12.0, 7.0, 5.0, float('inf')]
+
+        referensi = aco.feromon * (1 - aco.tingkat_penguapan)
+        for rute, biaya in zip(rute_list, biaya_list):
+            if len(rute) < 2:
+                continue
+            tambah = aco.deposit_feromon / biaya
+            for i in range(len(rute) - 1):
+                referensi[rute[i], rute[i + 1]] += tambah
+            referensi[rute[-1], rute[0]] += tambah
+
+        aco.update_pheromones(rute_list, biaya_list)
+        self.assertEqual(aco.feromon.tobytes(), referensi.tobytes())
+
+    def test_sparse_pheromone_matches_dense(self):
+        """Menguji mode feromon sparse sama dengan matriks dense selama candidate list cukup"""
+        rute_list = [[0, 1, 2], [2, 0, 1], [1, 2, 0]]
+        biaya_list = [10.0, 12.0, 0]
+        dense = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function
+        )
+        sparse = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function,
+            pheromone_mode='sparse', candidate_k=3
+        )
+
+        for _ in range(4):
+            dense.update_pheromones(rute_list, biaya_list)
+            sparse.update_pheromones(rute_list, biaya_list)
+
+        np.testing.assert_allclose(sparse.feromon.to_dense(), dense.feromon, rtol=1e-12)
+        np.testing.assert_allclose(
+            sparse.calculate_probabilities(0, [1, 2]),
+            dense.calculate_probabilities(0, [1, 2]),
+        )
+
+        sequence = sparse.construct_solution()
+        self.assertEqual(sorted(sequence), [0, 1, 2])
+
+    def test_sparse_pheromone_matches_dense_full_evaporation(self):
+        """Menguji evaporation_rate=1.0: mode sparse tetap belajar seperti matriks dense"""
+        rute_list = [[0, 1, 2], [2, 0, 1], [1, 2, 0]]
+        biaya_list = [10.0, 12.0, 0]
+        dense = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function,
+            evaporation_rate=1.0
+        )
+        sparse = ACO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function,
+            evaporation_rate=1.0, pheromone_mode='sparse', candidate_k=3
+        )
+
+        for _ in range(4):
+            dense.update_pheromones(rute_list, biaya_list)
+            sparse.update_pheromones(rute_list, biaya_list)
+
+        self.assertGreater(dense.feromon.max(), 0)
+        np.testing.assert_allclose(sparse.feromon.to_dense(), dense.feromon, rtol=1e-12)
+        np.testing.assert_allclose(
+            sparse.calculate_probabilities(0, [1, 2]),
+            dense.calculate_probabilities(0, [1, 2]),
+        )
+
+    def test_sparse_pheromone_keeps_top_k_candidates(self):
+        """Menguji candidate list sparse hanya menyimpan k edge terkuat per tugas"""
+        feromon = SparsePheromone(5, k=2)
+        feromon.deposit([0, 0, 0], [1, 2, 3], [1.0, 3.0, 2.0])
+
+        self.assertEqual(sorted(feromon.kandidat[0].tolist()), [2, 3])
+        feromon.evaporate(0.5)
+        np.testing.assert_allclose(feromon.values(0, [1, 2, 3]), [0.5, 2.0, 1.5])
+
+    def test_batched_construction_respects_dependencies(self):
+        """Menguji konstruksi batch menghasilkan rute valid untuk semua semut sekaligus"""
+        tasks_with_deps = [
+            {'id': f'Task_{i}', 'length': i % 4 + 1,
+             'dependencies': [f'Task_{j}' for j in range(max(0, i - 2), i) if (i + j) % 3]}
+            for i in range(12)
+        ]
+        for mode in ('dense', 'sparse'):
+            aco = ACO_MultiAgent_Scheduler(
+                tasks=tasks_with_deps,
+                agents=self.agents,
+                cost_function=self.cost_function,
+                enable_dependencies=True,
+                pheromone_mode=mode,
+                batch_construction=True,
+                n_ants=6,
+                n_iterations=3,
+            )
+            aco.update_pheromones([list(range(12))], [20.0])
+            rute_list = aco.construct_solutions_batched(6)
+
+            self.assertEqual(len(rute_list), 6)
+            for rute in rute_list:
+                self.assertEqual(sorted(rute), list(range(12)))
+                selesai = set()
+                for indeks in rute:
+                    id_tugas = aco.peta_tugas_terbalik[indeks]
+                    self.assertTrue(aco.is_dependency_satisfied(id_tugas, selesai))
+                    selesai.add(id_tugas)
+
+            hasil = aco.optimize(show_progress=False)
+            self.assertEqual(len(hasil['schedule']), 12)
+
+    def test_parallel_workers_reproducible(self):
+        """Menguji process pool ACO reprodusibel dengan seed tetap dan feromon ikut terupdate"""
+        tasks = [{'id': f'Task_{i}', 'length': i % 5 + 1} for i in range(10)]
+
+        def jalankan():
+            aco = ACO_MultiAgent_Scheduler(
+                tasks=tasks,
+                agents=self.agents,
+                cost_function=fungsi_biaya_jadwal,
+                n_ants=4,
+                n_iterations=3,
+                n_workers=2,
+                random_seed=42,
+            )
+            hasil = aco.optimize(show_progress=False)
+            self.assertIsNone(aco._pool)
+            self.assertIsInstance(aco.feromon, np.ndarray)
+            return hasil, aco.feromon
+
+        # Batas worker server mengikuti jumlah CPU; paksa 4 CPU agar pool benar-benar dipakai.
+        # Worker forkserver menerima state lewat pickle, jadi fungsi biaya harus fungsi modul.
+        with patch('models.parallel.os.cpu_count', return_value=4):
+            hasil_a, feromon_a = jalankan()
+            hasil_b, feromon_b = jalankan()
+
+        self.assertEqual(hasil_a['makespan'], hasil_b['makespan'])
+        self.assertTrue(np.array_equal(feromon_a, feromon_b))
+        self.assertFalse(np.all(feromon_a == feromon_a[0, 0]))
+
+    def test_n_workers_clamped_to_server_limit(self):
+        """Menguji n_workers dari klien dibatasi jumlah CPU dan MAX_SOLVER_WORKERS"""
+        def buat(n_workers):
+            return ACO_MultiAgent_Scheduler(
+                tasks=self.tasks,
+                agents=self.agents,
+                cost_function=self.cost_function,
+                n_ants=500,
+                n_iterations=1,
+                n_workers=n_workers,
+            )
+
+        with patch('models.parallel.os.cpu_count', return_value=4):
+            self.assertEqual(buat(500).n_workers, 4)
+            self.assertEqual(buat(3).n_workers, 3)
+            with patch.dict(os.environ, {'MAX_SOLVER_WORKERS': '2'}):
+                self.assertEqual(buat(500).n_workers, 2)
+
+    def test_isolated_rng_concurrent_runs_reproducible(self):
+        """Menguji generator per scheduler: run bersamaan di thread tetap reprodusibel"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        tasks = [{'id': f'Task_{i}', 'length': (i * 7) % 11 + 1} for i in range(25)]
+
+        def jalankan(seed):
+            aco = ACO_MultiAgent_Scheduler(
+                tasks=tasks,
+                agents=self.agents,
+                cost_function=self.cost_function,
+                n_ants=5,
+                n_iterations=4,
+                random_seed=seed,
+            )
+            hasil = aco.optimize(show_progress=False)
+            return hasil['iteration_history'].to_dict('records'), aco.feromon.tobytes()
+
+        state_global = np.random.get_state()[1].copy()
+        referensi = {seed: jalankan(seed) for seed in (1, 2)}
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            hasil = list(pool.map(jalankan, [1, 2, 1, 2]))
+
+        self.assertEqual(hasil, [referensi[1], referensi[2], referensi[1], referensi[2]])
+        self.assertTrue(np.array_equal(np.random.get_state()[1], state_global))
+
+    def test_early_stopping_patience_and_target(self):
+        """Menguji early stopping: patience tanpa perbaikan, target makespan, dan default"""
+        tasks = [{'id': f'Task_{i}', 'length': (i * 5) % 7 + 1} for i in range(12)]
+
+        def jalankan(**kwargs):
+            aco = ACO_MultiAgent_Scheduler(
+                tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                n_ants=4, n_iterations=30, random_seed=3, **kwargs
+            )
+            return aco.optimize(show_progress=False)
+
+        penuh = jalankan()
+        self.assertEqual(penuh['stop_reason'], 'max_iterations')
+        self.assertEqual(len(penuh['iteration_history']), 30)
+
+        sabar = jalankan(patience=2)
+        self.assertEqual(sabar['stop_reason'], 'no_improvement')
+        self.assertLess(len(sabar['iteration_history']), 30)
+
+        target = jalankan(target_makespan=float('inf'))
+        self.assertEqual(target['stop_reason'], 'target_makespan_reached')
+        self.assertEqual(len(target['iteration_history']), 1)
+
+        # Gap optimalitas: 12 tugas independen, 2 agen -> batas bawah = total durasi / 2
+        self.assertEqual(penuh['lower_bound'], sum(t['length'] for t in tasks) / 2)
+        self.assertGreaterEqual(penuh['gap'], 0.0)
+        gap = jalankan(gap_tolerance=penuh['gap'])
+        self.assertEqual(gap['stop_reason'], 'gap_tolerance_reached')
+        self.assertLess(len(gap['iteration_history']), 30)
+        self.assertLessEqual(gap['gap'], penuh['gap'])
+
+    def test_bottom_level_heuristic_mode(self):
+        """Menguji mode heuristik bottom-level dan solusi awal urutan lintasan kritis"""
+        tasks = [
+            {'id': 'A', 'length': 1},
+            {'id': 'B', 'length': 5},
+            {'id': 'C', 'length': 2, 'dependencies': ['A']},
+            {'id': 'D', 'length': 6, 'dependencies': ['C']},
+        ]
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_ants=3, n_iterations=2, enable_dependencies=True, random_seed=1,
+            heuristic_mode='bottom_level',
+        )
+        self.assertEqual(aco.bottom_level.tolist(), [9.0, 5.0, 8.0, 6.0])
+        self.assertEqual(aco.heuristik.tolist(), [9.0, 5.0, 8.0, 6.0])
+        # Rantai A -> C -> D (bottom-level tertinggi) didahulukan, tetap topologis
+        self.assertEqual(aco.initial_sequence(), [0, 2, 3, 1])
+        self.assertEqual(aco.optimize(show_progress=False)['makespan'], 9.0)
+
+        with self.assertRaises(ValueError):
+            ACO_MultiAgent_Scheduler(
+                tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                heuristic_mode='unknown',
+            )
+
+    def test_local_search_stage(self):
+        """Menguji local search per iterasi/akhir: jadwal konsisten dengan makespan hasil"""
+        tasks = [
+            {'id': f'Task_{i}', 'length': (i * 5) % 7 + 1,
+             'dependencies': [f'Task_{i - 2}'] if i >= 2 and i % 3 == 0 else []}
+            for i in range(20)
+        ]
+        tanpa = ACO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_ants=4, n_iterations=5, enable_dependencies=True, random_seed=2,
+        ).optimize(show_progress=False)
+        for mode in ('iteration', 'final'):
+            hasil = ACO_MultiAgent_Scheduler(
+                tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                n_ants=4, n_iterations=5, enable_dependencies=True, random_seed=2,
+                local_search=mode, local_search_moves=30,
+            ).optimize(show_progress=False)
+            self.assertEqual(hasil['makespan'], hasil['schedule']['finish_time'].max())
+            if mode == 'final':
+                # Loop identik dengan run tanpa local search, lalu hanya diperbaiki di akhir
+                self.assertLessEqual(hasil['makespan'], tanpa['makespan'])
+
+    def test_time_budget_returns_best_so_far(self):
+        """Menguji mode anytime: anggaran waktu habis menghentikan loop di antara evaluasi"""
+        tasks = [{'id': f'Task_{i}', 'length': (i * 5) % 7 + 1} for i in range(12)]
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_ants=4, n_iterations=1000, random_seed=3,
+        )
+        feromon_awal = aco.feromon.copy()
+        hasil = aco.optimize(show_progress=False, time_budget_ms=0)
+
+        self.assertTrue(hasil['budget_exhausted'])
+        self.assertEqual(hasil['stop_reason'], 'time_budget_exhausted')
+        self.assertEqual(len(hasil['iteration_history']), 1)
+        self.assertEqual(len(hasil['schedule']), 12)
+        # Koloni yang terpotong tidak meng-update feromon
+        self.assertTrue(np.array_equal(aco.feromon, feromon_awal))
+
+        # Target yang juga tercapai tidak menimpa alasan anggaran habis
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_ants=4, n_iterations=1000, random_seed=3, target_makespan=1e9,
+        )
+        hasil = aco.optimize(show_progress=False, time_budget_ms=0)
+        self.assertTrue(hasil['budget_exhausted'])
+        self.assertEqual(hasil['stop_reason'], 'time_budget_exhausted')
+
+        # Anggaran longgar dari konstruktor: semua iterasi selesai
+        aco = ACO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_ants=4, n_iterations=5, random_seed=3, time_budget_ms=60000,
+        )
+        hasil = aco.optimize(show_progress=False)
+        self.assertFalse(hasil['budget_exhausted'])
+        self.assertEqual(hasil['stop_reason'], 'max_iterations')
+
     def test_load_balance_calculation(self):
         """Menguji perhitungan indeks load balance"""
         aco = ACO_MultiAgent_Scheduler(
@@ -1,5 +1,9 @@
 import unittest
+import importlib.util
+import io
 import json
+import shutil
+import tempfile
 from unittest.mock import patch, MagicMock
 import sys
 import os
@@ -105,5 +109,238 @@ class TestFlaskApp(unittest.TestCase):
         data = json.loads(response.data)
         self.assertIn('error', data)
 
+    def test_stream_scheduling_replays_cached_result(self):
+        """Menguji request identik dengan seed tetap di-replay dari cache tanpa menjalankan ulang"""
+        data = {
+            "algorithm": "PSO",
+            "tasks": [{"id": f"Task_{i}", "length": i % 4 + 1} for i in range(8)],
+            "parameters": {"n_iterations": 3, "n_particles": 4, "random_seed": 5}
+        }
+
+        def kirim():
+            response = self.client.post('/stream_scheduling',
+                                        data=json.dumps(data),
+                                        content_type='application/json')
+            return [
+                json.loads(baris[len('data: '):])
+                for baris in response.get_data(as_text=True).split('\n')
+                if baris.startswith('data: ')
+            ]
+
+        pertama = kirim()
+        with patch('app.PSOScheduler.run') as run_mock:
+            kedua = kirim()
+            run_mock.assert_not_called()
+
+        self.assertEqual(pertama[1:-1], kedua[1:-1])
+        self.assertTrue(kedua[-1]['cache_hit'])
+        self.assertEqual(
+            pertama[-1]['full_result']['makespan'], kedua[-1]['full_result']['makespan']
+        )
+
+        # Kunci cache memakai n_workers efektif: permintaan di atas batas server sama dengan batasnya
+        with patch.dict(os.environ, {'MAX_SOLVER_WORKERS': '1'}), \
+                patch('app.PSOScheduler.run') as run_mock:
+            data['parameters']['n_workers'] = 64
+            ketiga = kirim()
+            run_mock.assert_not_called()
+        self.assertTrue(ketiga[-1]['cache_hit'])
+    def test_stream_scheduling_upload_csv(self):
+        """Menguji upload CSV (multipart dan body mentah) menghasilkan stream yang sama dengan JSON"""
+        csv = (
+            "Task_ID,Priority,Execution_Time (s),Depends_On_Task_ID\n"
+            "1,2,1.5,\n2,1,2.0,1\n3,3,0.5,\n4,1,3.0,2\n"
+        )
+        parameters = {"n_iterations": 3, "n_particles": 4, "random_seed": 5, "use_cache": False}
+
+        def events(response):
+            self.assertEqual(response.status_code, 200)
+            hasil = [
+                json.loads(baris[len('data: '):])
+                for baris in response.get_data(as_text=True).split('\n')
+                if baris.startswith('data: ')
+            ]
+            return [e.get('makespan') for e in hasil[1:-1]], hasil[-1]['full_result']['schedule']
+
+        dari_json = events(self.client.post('/stream_scheduling', json={
+            "algorithm": "PSO",
+            "tasks": [
+                {"Task_ID": 1, "Priority": 2, "Execution_Time (s)": 1.5},
+                {"Task_ID": 2, "Priority": 1, "Execution_Time (s)": 2.0, "Depends_On_Task_ID": 1},
+                {"Task_ID": 3, "Priority": 3, "Execution_Time (s)": 0.5},
+                {"Task_ID": 4, "Priority": 1, "Execution_Time (s)": 3.0, "Depends_On_Task_ID": 2},
+            ],
+            "parameters": parameters,
+        }))
+        dari_multipart = events(self.client.post(
+            '/stream_scheduling/upload',
+            data={
+                "algorithm": "PSO",
+                "parameters": json.dumps(parameters),
+                "file": (io.BytesIO(csv.encode()), "tasks.csv"),
+            },
+            content_type='multipart/form-data',
+        ))
+        dari_body = events(self.client.post(
+            '/stream_scheduling/upload?algorithm=PSO&parameters=' + json.dumps(parameters),
+            data=csv,
+            content_type='text/csv',
+        ))
+
+        self.assertEqual(dari_json, dari_multipart)
+        self.assertEqual(dari_json, dari_body)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow tidak terpasang')
+    def test_stream_scheduling_upload_parquet(self):
+        """Menguji upload Parquet menghasilkan jadwal yang sama dengan payload JSON"""
+        import pandas as pd
+
+        tasks = [
+            {"Task_ID": 1, "Priority": 2, "Execution_Time (s)": 1.5},
+            {"Task_ID": 2, "Priority": 1, "Execution_Time (s)": 2.0},
+            {"Task_ID": 3, "Priority": 3, "Execution_Time (s)": 0.5},
+        ]
+        parameters = {"n_iterations": 3, "n_particles": 4, "random_seed": 5, "use_cache": False}
+        parquet = io.BytesIO()
+        pd.DataFrame(tasks).to_parquet(parquet)
+
+        def jadwal(response):
+            self.assertEqual(response.status_code, 200)
+            hasil = [
+                json.loads(baris[len('data: '):])
+                for baris in response.get_data(as_text=True).split('\n')
+                if baris.startswith('data: ')
+            ]
+            return hasil[-1]['full_result']['schedule']
+
+        dari_json = jadwal(self.client.post('/stream_scheduling', json={
+            "algorithm": "PSO", "tasks": tasks, "parameters": parameters,
+        }))
+        dari_parquet = jadwal(self.client.post(
+            '/stream_scheduling/upload',
+            data={
+                "algorithm": "PSO",
+                "parameters": json.dumps(parameters),
+                "file": (io.BytesIO(parquet.getvalue()), "tasks.parquet"),
+            },
+            content_type='multipart/form-data',
+        ))
+        self.assertEqual(dari_json, dari_parquet)
+
+    def test_stream_scheduling_upload_invalid_file(self):
+        """Menguji upload dengan format tidak didukung atau file kosong ditolak"""
+        response = self.client.post('/stream_scheduling/upload?algorithm=PSO&format=xlsx',
+                                    data="id\n1\n", content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post('/stream_scheduling/upload?algorithm=PSO',
+                                    data="", content_type='text/csv')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', json.loads(response.data))
+    def test_stream_scheduling_registered_dataset(self):
+        """Menguji request dengan dataset_id memakai dataset registry, bukan array tugas"""
+        import app as app_module
+        from dataset_registry import DatasetRegistry
+
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, True)
+        registry = DatasetRegistry(app_module.dataset_registry.data_dir, cache_dir)
+
+        with patch.object(app_module, 'dataset_registry', registry):
+            response = self.client.post('/stream_scheduling', json={
+                "algorithm": "PSO",
+                "dataset_id": "cloud_task_scheduling_final",
+                "parameters": {"n_iterations": 2, "n_particles": 3, "use_cache": False},
+            })
+            self.assertEqual(response.status_code, 200)
+            hasil = [
+                json.loads(baris[len('data: '):])
+                for baris in response.get_data(as_text=True).split('\n')
+                if baris.startswith('data: ')
+            ]
+            self.assertEqual(hasil[-1]['full_result']['total_tasks'], 1000)
+
+            response = self.client.post('/stream_scheduling', json={
+                "algorithm": "PSO", "dataset_id": "../tidak_ada",
+            })
+            self.assertEqual(response.status_code, 404)
+
+            # Endpoint admin ditolak tanpa token
+            response = self.client.post('/datasets/cloud_task_scheduling_final/build')
+            self.assertEqual(response.status_code, 403)
+
+    def test_jobs_submit_poll_and_stream(self):
+        """Menguji POST /jobs langsung mengembalikan job ID dan hasilnya sama dengan stream"""
+        import time
+        import app as app_module
+        from job_queue import JobQueue
+
+        job_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, job_dir, True)
+        queue = JobQueue(job_dir, max_workers=1)
+        self.addCleanup(queue.shutdown)
+
+        data = {
+            "algorithm": "PSO",
+            "tasks": [{"id": f"Task_{i}", "length": i % 4 + 1} for i in range(8)],
+            "parameters": {"n_iterations": 3, "n_particles": 4, "random_seed": 5,
+                           "use_cache": False},
+        }
+        with patch.object(app_module, 'job_queue', queue):
+            response = self.client.post('/jobs', json=data)
+            self.assertEqual(response.status_code, 202)
+            job_id = json.loads(response.data)['job_id']
+
+            tenggat = time.time() + 60
+            while True:
+                respons_status = self.client.get(f'/jobs/{job_id}')
+                status = json.loads(respons_status.data)
+                if status['status'] in JobQueue.SELESAI or time.time() > tenggat:
+                    break
+                time.sleep(0.05)
+            self.assertEqual(status['status'], JobQueue.DONE)
+            # Status job berubah terus, jadi tidak boleh di-cache proxy/browser
+            self.assertIn('no-store', respons_status.headers['Cache-Control'])
+
+            response = self.client.get(f'/jobs/{job_id}/stream')
+            self.assertEqual(response.status_code, 200)
+            hasil = [
+                json.loads(baris[len('data: '):])
+                for baris in response.get_data(as_text=True).split('\n')
+                if baris.startswith('data: ')
+            ]
+            self.assertEqual(hasil[-1], status['result'])
+
+            # Menyambung ulang setelah event tertentu hanya mengirim sisanya
+            response = self.client.get(f'/jobs/{job_id}/stream',
+                                       headers={'Last-Event-ID': '1'})
+            self.assertIn('id: 2\n', response.get_data(as_text=True))
+            self.assertNotIn('id: 1\n', response.get_data(as_text=True))
+
+            self.assertEqual(self.client.post('/jobs', json={"tasks": data["tasks"]}).status_code, 400)
+
+            # Siklus dependensi ditolak langsung (sama seperti /stream_scheduling), bukan job failed
+            siklus = dict(data, tasks=[
+                {"id": "a", "length": 1, "dependencies": ["b"]},
+                {"id": "b", "length": 1, "dependencies": ["a"]},
+            ])
+            for endpoint in ('/jobs', '/stream_scheduling'):
+                response = self.client.post(endpoint, json=siklus)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('Dependency Error', json.loads(response.data)['error'])
+            self.assertEqual(os.listdir(job_dir), [job_id])
+            self.assertEqual(self.client.get('/jobs/tidak-ada').status_code, 404)
+            self.assertEqual(self.client.get('/jobs/tidak-ada/stream').status_code, 404)
+
+        langsung = self.client.post('/stream_scheduling', json=data)
+        akhir = [
+            json.loads(baris[len('data: '):])
+            for baris in langsung.get_data(as_text=True).split('\n')
+            if baris.startswith('data: ')
+        ][-1]
+        self.assertEqual(
+            akhir['full_result']['makespan'], status['result']['full_result']['makespan']
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,303 @@
+import unittest
+import random
+import sys
+import os
+
+# Tambahkan direktori induk ke path untuk mengimpor model
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.base import MultiAgentScheduler
+from models.utils import fungsi_biaya_jadwal
+
+
+class TestMultiAgentScheduler(unittest.TestCase):
+    def setUp(self):
+        """Menyiapkan perlengkapan tes sebelum setiap metode tes."""
+        rng = random.Random(7)
+        self.tasks = [
+            {
+                'id': f'Task_{i}',
+                'length': round(rng.uniform(0.5, 10), 2),
+                'priority': rng.randint(1, 3),
+                'dependencies': [f'Task_{j}' for j in range(max(0, i - 3), i) if rng.random() < 0.3],
+            }
+            for i in range(60)
+        ]
+        self.agents = [{'id': f'Agent_{i}'} for i in range(4)]
+
+    def greedy_reference(self, scheduler, urutan):
+        """Greedy referensi berbasis dict memakai find_best_agent (perilaku asli)."""
+        waktu_selesai_agen = {agen['id']: 0 for agen in scheduler.agen}
+        waktu_selesai_tugas = {}
+        jadwal = []
+        for indeks in urutan:
+            tugas = scheduler.tugas[indeks]
+            id_tugas = str(tugas['id'])
+            durasi = tugas.get('length', 1)
+            agen = scheduler.find_best_agent(
+                waktu_selesai_agen, durasi, id_tugas, waktu_selesai_tugas
+            )
+            dep = max(
+                [waktu_selesai_tugas.get(d, 0) for d in scheduler.dependensi.get(id_tugas, [])],
+                default=0,
+            )
+            mulai = max(waktu_selesai_agen[agen], dep)
+            waktu_selesai_agen[agen] = mulai + durasi
+            waktu_selesai_tugas[id_tugas] = mulai + durasi
+            jadwal.append((id_tugas, agen, mulai, mulai + durasi))
+        return jadwal, waktu_selesai_agen
+
+    def test_assign_to_agents_matches_reference_greedy(self):
+        """Menguji evaluator array menghasilkan jadwal yang sama dengan greedy berbasis dict"""
+        for enable_dependencies in (False, True):
+            scheduler = MultiAgentScheduler(
+                self.tasks, self.agents, fungsi_biaya_jadwal,
+                enable_dependencies=enable_dependencies,
+            )
+            urutan = list(range(len(self.tasks)))
+            random.Random(3).shuffle(urutan)
+
+            jadwal, waktu_agen, keseimbangan = scheduler.assign_to_agents(urutan)
+            jadwal_ref, waktu_agen_ref = self.greedy_reference(scheduler, urutan)
+
+            self.assertEqual(
+                [(j['task_id'], j['agent_id'], j['start_time'], j['finish_time']) for j in jadwal],
+                jadwal_ref,
+            )
+            self.assertEqual(waktu_agen, waktu_agen_ref)
+            self.assertEqual(keseimbangan, scheduler.calculate_load_balance_index(waktu_agen_ref))
+
+    def test_find_best_agent_matches_full_recompute(self):
+        """Menguji skor delta O(1) memilih agen yang sama dengan hitung ulang LBI penuh"""
+        scheduler = MultiAgentScheduler(self.tasks, self.agents, fungsi_biaya_jadwal)
+        rng = random.Random(11)
+
+        for _ in range(50):
+            waktu_agen = {agen['id']: round(rng.uniform(0, 50), 2) for agen in self.agents}
+            durasi = round(rng.uniform(0.5, 10), 2)
+            for prioritize_balance in (True, False):
+                skor_ref = {}
+                max_saat_ini = max(waktu_agen.values())
+                for id_agen in waktu_agen:
+                    waktu_temp = dict(waktu_agen)
+                    waktu_temp[id_agen] += durasi
+                    lbi = scheduler.calculate_load_balance_index(waktu_temp)
+                    makespan = max(waktu_temp.values())
+                    skor_ref[id_agen] = (
+                        lbi * 1000 + makespan / 1000
+                        if prioritize_balance
+                        else makespan + lbi * max_saat_ini * 2
+                    )
+
+                agen = scheduler.find_best_agent(
+                    waktu_agen, durasi, prioritize_balance=prioritize_balance
+                )
+                self.assertAlmostEqual(skor_ref[agen], min(skor_ref.values()), places=9)
+
+    def test_homogeneous_fast_path_matches_generic_path(self):
+        """Menguji fast path agen homogen memberi penugasan yang sama dengan jalur umum"""
+        agents = [{'id': f'Agent_{i}'} for i in range(25)]
+        scheduler = MultiAgentScheduler(
+            self.tasks, agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        self.assertTrue(scheduler.is_homogeneous_agents())
+        self.assertTrue(scheduler.evaluator.homogen)
+
+        urutan = list(range(len(self.tasks)))
+        random.Random(5).shuffle(urutan)
+        hasil_homogen = scheduler.evaluator.evaluate(urutan)
+        scheduler.evaluator.homogen = False
+        hasil_umum = scheduler.evaluator.evaluate(urutan)
+
+        self.assertEqual(hasil_homogen[3], hasil_umum[3])
+        self.assertEqual(hasil_homogen[0], hasil_umum[0])
+        self.assertEqual(hasil_homogen[2].tolist(), hasil_umum[2].tolist())
+
+        # Agen dengan atribut berbeda tidak memakai fast path
+        agents[0]['capacity'] = 2.0
+        scheduler = MultiAgentScheduler(self.tasks, agents, fungsi_biaya_jadwal)
+        self.assertFalse(scheduler.evaluator.homogen)
+
+    def test_evaluate_from_prefix_matches_full_evaluation(self):
+        """Menguji evaluasi delta dari state prefix identik dengan evaluasi penuh"""
+        rng = random.Random(9)
+        for agents in (self.agents, [{'id': f'Agent_{i}', 'capacity': i} for i in range(3)]):
+            scheduler = MultiAgentScheduler(
+                self.tasks, agents, fungsi_biaya_jadwal, enable_dependencies=True
+            )
+            evaluator = scheduler.evaluator
+            urutan = list(range(len(self.tasks)))
+            rng.shuffle(urutan)
+            jejak = []
+            dasar = evaluator.evaluate(urutan, jejak)
+            for _ in range(20):
+                i, j = sorted(rng.sample(range(len(urutan)), 2))
+                baru = urutan[:i] + [urutan[j]] + urutan[i:j] + urutan[j + 1:]
+                jejak_baru, jejak_penuh = [], []
+                delta = evaluator.evaluate_from(baru, i, dasar, jejak, jejak_baru)
+                penuh = evaluator.evaluate(baru, jejak_penuh)
+
+                self.assertEqual(delta[:2], penuh[:2])
+                self.assertEqual(delta[2].tolist(), penuh[2].tolist())
+                self.assertEqual(delta[3:], penuh[3:])
+                self.assertEqual(jejak_baru, jejak_penuh)
+
+    def test_improve_sequence_keeps_dependencies(self):
+        """Menguji local search swap/insert tidak memperburuk biaya dan menjaga dependensi"""
+        scheduler = MultiAgentScheduler(
+            self.tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True,
+            random_seed=4, local_search='final', local_search_moves=200,
+        )
+        urutan_awal = list(range(len(self.tasks)))
+        biaya_awal = scheduler.evaluate_sequence(urutan_awal)[0]
+        urutan, evaluasi = scheduler.improve_sequence(urutan_awal)
+
+        self.assertEqual(sorted(urutan), urutan_awal)
+        self.assertLessEqual(evaluasi[0], biaya_awal)
+        self.assertEqual(evaluasi[:3], scheduler.evaluate_sequence(urutan)[:3])
+        selesai = set()
+        for indeks in urutan:
+            id_tugas = scheduler.peta_tugas_terbalik[indeks]
+            self.assertTrue(scheduler.is_dependency_satisfied(id_tugas, selesai))
+            selesai.add(id_tugas)
+
+        with self.assertRaises(ValueError):
+            MultiAgentScheduler(self.tasks, self.agents, fungsi_biaya_jadwal, local_search='always')
+
+    def test_task_table_arrays(self):
+        """Menguji TaskTable menyimpan durasi/prioritas sebagai array dan indeks ID"""
+        tasks = [
+            {'id': 1, 'length': 5},
+            {'id': 2, 'duration': 3, 'priority': 2},
+            {'id': 3},
+        ]
+        scheduler = MultiAgentScheduler(tasks, self.agents, fungsi_biaya_jadwal)
+        tabel = scheduler.tabel_tugas
+
+        self.assertEqual(tabel.durasi.dtype.name, 'float64')
+        self.assertEqual(tabel.durasi.tolist(), [5.0, 3.0, 1.0])
+        self.assertEqual(tabel.prioritas.tolist(), [1.0, 2.0, 1.0])
+        self.assertEqual(tabel.ids, ['1', '2', '3'])
+        self.assertEqual(scheduler.peta_tugas['2'], 1)
+        self.assertEqual(scheduler.peta_tugas_terbalik[2], '3')
+        self.assertIs(tabel.records, tasks)
+
+    def test_evaluate_sequence_without_schedule_dicts(self):
+        """Menguji biaya evaluate_sequence sama dengan fungsi biaya pada jadwal lengkap"""
+        scheduler = MultiAgentScheduler(
+            self.tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        urutan = list(range(len(self.tasks)))
+
+        biaya, durasi_total, keseimbangan, hasil = scheduler.evaluate_sequence(urutan)
+        jadwal = scheduler.build_schedule(urutan, hasil)
+
+        self.assertEqual(durasi_total, max(j['finish_time'] for j in jadwal))
+        self.assertEqual(biaya, fungsi_biaya_jadwal(jadwal, durasi_total))
+        self.assertEqual(len(jadwal), len(self.tasks))
+
+    def test_dependency_graph_csr_and_ready_set(self):
+        """Menguji CSR dependensi (edge balik, indegree) dan ready set Kahn inkremental"""
+        tasks = [
+            {'id': 'A', 'length': 1},
+            {'id': 'B', 'length': 1, 'dependencies': ['A']},
+            {'id': 'C', 'length': 1, 'dependencies': ['A', 'B']},
+            {'id': 'D', 'length': 1, 'dependencies': ['GHOST']},
+        ]
+        scheduler = MultiAgentScheduler(
+            tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        graf = scheduler.graf
+
+        self.assertEqual(graf.indegree.tolist(), [0, 1, 2, 1])
+        self.assertEqual(graf.pred_indices.tolist(), [0, 0, 1])
+        self.assertEqual(graf.succ_indptr.tolist(), [0, 2, 3, 3, 3])
+        self.assertEqual(graf.succ_indices.tolist(), [1, 2, 2])
+
+        siap_set = graf.ready_set()
+        self.assertEqual(siap_set.siap, [0])
+        siap_set.selesaikan(0)
+        self.assertEqual(siap_set.siap, [1])
+        siap_set.selesaikan(1)
+        self.assertEqual(siap_set.siap, [2])
+        siap_set.selesaikan(2)
+        # Dependensi ghost tidak pernah terpenuhi: hanya bisa lewat fallback deadlock
+        self.assertEqual(siap_set.siap, [])
+        self.assertEqual(siap_set.paksa(), 3)
+
+    def test_priority_order_heap_decoder(self):
+        """Menguji urutan topologis berbasis heap: skor tertinggi dulu, fallback saat deadlock"""
+        tasks = [
+            {'id': 'A', 'length': 1},
+            {'id': 'B', 'length': 1},
+            {'id': 'C', 'length': 1, 'dependencies': ['A']},
+            {'id': 'D', 'length': 1, 'dependencies': ['GHOST', 'A']},
+            {'id': 'E', 'length': 1, 'dependencies': ['GHOST']},
+        ]
+        scheduler = MultiAgentScheduler(
+            tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+
+        # C baru siap setelah A; seri skor A dan B diputus ke indeks terkecil
+        self.assertEqual(scheduler.graf.priority_order([0.5, 0.5, 2.0, 9.0, 1.0]), [0, 2, 1, 4, 3])
+        self.assertEqual(scheduler.graf.priority_order([0.1, 0.9, 0.0, 0.0, 0.0]), [1, 0, 2, 4, 3])
+
+    def test_ready_set_matches_get_ready_tasks(self):
+        """Menguji ready set inkremental sama dengan get_ready_tasks di setiap langkah"""
+        scheduler = MultiAgentScheduler(
+            self.tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        rng = random.Random(13)
+        siap_set = scheduler.graf.ready_set()
+        tersisa, selesai = list(range(len(self.tasks))), set()
+
+        while tersisa:
+            self.assertEqual(siap_set.siap, scheduler.get_ready_tasks(tersisa, selesai))
+            pilihan = rng.choice(siap_set.siap)
+            siap_set.selesaikan(pilihan)
+            tersisa.remove(pilihan)
+            selesai.add(scheduler.peta_tugas_terbalik[pilihan])
+
+    def test_makespan_lower_bound(self):
+        """Menguji batas bawah makespan (beban/agen, tugas terpanjang, lintasan kritis)"""
+        tasks = [
+            {'id': 'A', 'length': 2},
+            {'id': 'B', 'length': 3, 'dependencies': ['A']},
+            {'id': 'C', 'length': 4, 'dependencies': ['B', 'GHOST']},
+            {'id': 'D', 'length': 1},
+        ]
+        scheduler = MultiAgentScheduler(
+            tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        self.assertEqual(scheduler.lintasan_kritis, 9.0)
+        self.assertEqual(scheduler.top_level.tolist(), [0.0, 2.0, 5.0, 0.0])
+        self.assertEqual(scheduler.bottom_level.tolist(), [9.0, 7.0, 4.0, 1.0])
+        self.assertEqual(scheduler.batas_bawah_makespan, 9.0)
+        self.assertAlmostEqual(scheduler.optimality_gap(9.9), 10.0)
+
+        tanpa_dep = MultiAgentScheduler(tasks, self.agents[:2], fungsi_biaya_jadwal)
+        self.assertEqual(tanpa_dep.batas_bawah_makespan, 5.0)
+
+        # Siklus: lintasan kritis tidak terdefinisi, hanya batas beban yang dipakai
+        siklus = [{'id': 'A', 'length': 2, 'dependencies': ['B']},
+                  {'id': 'B', 'length': 2, 'dependencies': ['A']}]
+        scheduler = MultiAgentScheduler(
+            siklus, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        self.assertIsNone(scheduler.lintasan_kritis)
+        self.assertEqual(scheduler.batas_bawah_makespan, 2.0)
+
+        # Tidak ada urutan yang menghormati dependensi yang menembus batas bawah
+        scheduler = MultiAgentScheduler(
+            self.tasks, self.agents, fungsi_biaya_jadwal, enable_dependencies=True
+        )
+        rng = random.Random(5)
+        for _ in range(30):
+            urutan = scheduler.graf.priority_order([rng.random() for _ in self.tasks])
+            self.assertGreaterEqual(
+                scheduler.evaluate_sequence(urutan)[1], scheduler.batas_bawah_makespan
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
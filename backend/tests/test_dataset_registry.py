@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+# Tambahkan direktori induk ke path untuk mengimpor modul
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dataset_registry import DatasetRegistry
+from ingestion import ingest_tasks, read_task_file
+
+
+class TestDatasetRegistry(unittest.TestCase):
+    def setUp(self):
+        """Menyiapkan direktori data dan cache sementara berisi satu dataset CSV."""
+        self.data_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir, True)
+        self.addCleanup(shutil.rmtree, self.cache_dir, True)
+        self.tulis_csv(
+            "Task_ID,Priority,Execution_Time (s),Depends_On_Task_ID\n"
+            "1,2,1.5,\n2,1,2.0,1\n3,3,0.5,9\n4,1,3.0,2\n"
+        )
+        self.registry = DatasetRegistry(self.data_dir, self.cache_dir)
+
+    def tulis_csv(self, isi):
+        with open(os.path.join(self.data_dir, "contoh.csv"), "w") as f:
+            f.write(isi)
+
+    def test_ingest_matches_csv_ingestion(self):
+        """Menguji tabel dari kolom memory-map sama dengan ingestion CSV langsung"""
+        self.assertEqual(self.registry.available(), ["contoh"])
+        self.assertIn("contoh", self.registry)
+        self.assertNotIn("../contoh", self.registry)
+
+        sumber = read_task_file(self.registry.source_path("contoh"))
+        for kwargs in ({}, {"enable_dependencies": False}):
+            tabel, aktif = self.registry.ingest("contoh", **kwargs)
+            acuan, aktif_acuan = ingest_tasks(sumber, **kwargs)
+            self.assertEqual(aktif, aktif_acuan)
+            self.assertEqual(tabel.fingerprint(), acuan.fingerprint())
+
+        tabel, aktif = self.registry.ingest("contoh")
+        self.assertTrue(aktif)
+        self.assertEqual(tabel.dependensi, [[], ["1"], [], ["2"]])
+
+        # Kolom dibagi read-only lewat memory-map, bukan disalin per request
+        _, kolom = self.registry.columns("contoh")
+        self.assertFalse(kolom["durasi"].flags.writeable)
+
+    def test_rebuilds_when_source_changes(self):
+        """Menguji konversi diulang otomatis jika CSV sumber berubah"""
+        pertama = self.registry.build("contoh")
+        self.assertEqual(self.registry.build("contoh")["build_id"], pertama["build_id"])
+
+        self.tulis_csv("Task_ID,Execution_Time (s)\n1,4.0\n2,5.0\n3,6.0\n")
+        self.assertIsNone(self.registry.manifest("contoh"))
+        tabel, aktif = self.registry.ingest("contoh")
+        self.assertFalse(aktif)
+        self.assertEqual(tabel.durasi.tolist(), [4.0, 5.0, 6.0])
+
+
+    def test_forced_rebuild_keeps_live_build_readable(self):
+        """Menguji rebuild paksa tidak pernah melepas manifest atau direktori build aktif"""
+        lain = DatasetRegistry(self.data_dir, self.cache_dir)
+        pertama, kolom_lama = lain.columns("contoh")
+
+        kedua = self.registry.build("contoh", force=True)
+        self.assertNotEqual(kedua["build_id"], pertama["build_id"])
+        self.assertEqual(lain.manifest("contoh")["build_id"], kedua["build_id"])
+        # Worker lain yang masih memegang build lama tetap bisa membacanya
+        self.assertEqual(kolom_lama["durasi"].tolist(), [1.5, 2.0, 0.5, 3.0])
+        self.assertEqual(lain.columns("contoh")[0]["build_id"], kedua["build_id"])
+
+        # Build lama di luar aktif dan sebelumnya dibersihkan setelah masa tenggang
+        self.registry.MASA_TENGGANG_BUILD = -1
+        ketiga = self.registry.build("contoh", force=True)
+        direktori = os.path.join(self.cache_dir, "contoh")
+        build = sorted(n for n in os.listdir(direktori) if n != "manifest.json")
+        self.assertEqual(build, sorted([kedua["build_id"], ketiga["build_id"]]))
+
+    def test_ingest_reuses_table_per_build(self):
+        """Menguji TaskTable dibangun sekali per build, bukan per request"""
+        tabel, aktif = self.registry.ingest("contoh")
+        self.assertIs(self.registry.ingest("contoh")[0], tabel)
+        # Flag dependensi tetap dihitung per panggilan dari tabel yang sama
+        self.assertIs(self.registry.ingest("contoh", enable_dependencies=True)[0], tabel)
+        self.assertTrue(aktif)
+
+        tanpa, aktif = self.registry.ingest("contoh", enable_dependencies=False)
+        self.assertIsNot(tanpa, tabel)
+        self.assertFalse(aktif)
+        self.assertEqual(tanpa.dependensi, [[], [], [], []])
+
+        self.registry.build("contoh", force=True)
+        self.assertIsNot(self.registry.ingest("contoh")[0], tabel)
+
+if __name__ == '__main__':
+    unittest.main()
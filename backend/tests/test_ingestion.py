@@ -0,0 +1,88 @@
+import unittest
+import sys
+import os
+
+import pandas as pd
+
+# Tambahkan direktori induk ke path untuk mengimpor modul
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingestion import DependencyError, ingest_tasks
+from models.base import MultiAgentScheduler
+from models.utils import fungsi_biaya_jadwal
+
+
+class TestIngestion(unittest.TestCase):
+    def test_column_aliases_and_numbers(self):
+        """Menguji alias kolom di-resolve per kolom dengan urutan prioritas lama"""
+        tasks = [
+            {'Task_ID': 7.0, 'Duration': '0', 'length': ' 4 ', 'Cost': -1, 'price': '2.5', 'Priority': 'abc'},
+            {'name': ' alpha ', 'weight': 3, 'cost': None, 'priority': 2},
+            {'Duration': 'null'},
+        ]
+        tabel, aktif = ingest_tasks(tasks)
+
+        self.assertEqual(tabel.ids, ['7', 'alpha', '3'])
+        self.assertEqual(tabel.durasi.tolist(), [4.0, 3.0, 1.0])
+        self.assertEqual(tabel.biaya.tolist(), [2.5, 0.0, 0.0])
+        self.assertEqual(tabel.prioritas.tolist(), [1.0, 2.0, 1.0])
+        self.assertFalse(aktif)
+
+    def test_dependency_parsing_and_ghost_filter(self):
+        """Menguji dependensi string/list/angka diparse sekali dan ghost/self-dep dibuang"""
+        tasks = [
+            {'id': 1},
+            {'id': 2, 'dependencies': '1.0; 9 ,null'},
+            {'id': 3, 'depends_on': [1, 2.0, None, 'None', 3]},
+            {'id': 4, 'requires': 2},
+            {'id': 5, 'my_deps': '3,4', 'dependencies': '1'},
+        ]
+        tabel, aktif = ingest_tasks(tasks, dependency_col='my_deps')
+
+        self.assertTrue(aktif)
+        self.assertEqual(tabel.dependensi, [[], ['1'], ['1', '2'], ['2'], ['3', '4']])
+
+        # Dependensi diabaikan jika dimatikan eksplisit dan tidak ada kolom pilihan user
+        tabel, aktif = ingest_tasks(tasks, enable_dependencies=False)
+        self.assertFalse(aktif)
+        self.assertEqual(tabel.dependensi, [[]] * 5)
+
+    def test_circular_dependency_rejected(self):
+        """Menguji siklus dependensi ditolak, termasuk rantai panjang tanpa rekursi"""
+        with self.assertRaises(DependencyError):
+            ingest_tasks([{'id': 'a', 'dependencies': 'b'}, {'id': 'b', 'dependencies': ['a']}])
+
+        jumlah = 5000
+        rantai = [{'id': i, 'dependencies': [i + 1] if i + 1 < jumlah else []} for i in range(jumlah)]
+        tabel, aktif = ingest_tasks(rantai)
+        self.assertTrue(aktif)
+        self.assertEqual(tabel.dependensi[0], ['1'])
+
+        rantai[-1]['dependencies'] = [0]
+        with self.assertRaises(DependencyError):
+            ingest_tasks(pd.DataFrame(rantai))
+
+    def test_scheduler_uses_ingested_table(self):
+        """Menguji scheduler memakai TaskTable hasil ingestion tanpa parsing ulang"""
+        tasks = [
+            {'id': f'T{i}', 'length': i + 1, 'priority': 1 + i % 3,
+             'dependencies': ','.join(f'T{j}' for j in range(max(0, i - 2), i))}
+            for i in range(12)
+        ]
+        tabel, aktif = ingest_tasks(tasks)
+        dari_tabel = MultiAgentScheduler(tabel, None, fungsi_biaya_jadwal, enable_dependencies=aktif)
+        dari_record = MultiAgentScheduler(
+            tabel.to_records('id'), None, fungsi_biaya_jadwal, enable_dependencies=aktif
+        )
+
+        self.assertEqual(dari_tabel.dependensi, dari_record.dependensi)
+        self.assertFalse(dari_tabel.detect_circular_dependencies())
+        urutan = list(range(len(tasks)))
+        self.assertEqual(
+            dari_tabel.evaluate_sequence(urutan)[:2], dari_record.evaluate_sequence(urutan)[:2]
+        )
+        self.assertEqual(dari_tabel.tugas[3]['dependencies'], ['T1', 'T2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
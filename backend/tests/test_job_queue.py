@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+
+# Tambahkan direktori induk ke path untuk mengimpor modul
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_queue import JobQueue
+
+
+def hitung_iterasi(n):
+    """Job contoh: n event iterasi lalu satu event hasil."""
+    for i in range(1, n + 1):
+        yield json.dumps({"type": "iteration", "iteration": i, "makespan": 10.0 / i})
+    yield json.dumps({"type": "final_metrics", "makespan": 10.0 / n})
+
+
+def gagal_di_tengah():
+    """Job contoh yang gagal setelah satu event."""
+    yield json.dumps({"type": "start"})
+    raise ValueError("simulasi gagal")
+
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.job_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.job_dir, True)
+        self.queue = JobQueue(self.job_dir, max_workers=1)
+        self.addCleanup(self.queue.shutdown)
+
+    def tunggu(self, job_id, batas=30.0):
+        tenggat = time.time() + batas
+        while time.time() < tenggat:
+            status = self.queue.get(job_id)
+            if status["status"] in JobQueue.SELESAI:
+                return status
+            time.sleep(0.05)
+        self.fail(f"Job {job_id} tidak selesai dalam {batas} detik")
+
+    def test_submit_poll_and_follow(self):
+        """Menguji job berjalan di pool, status berisi hasil, dan follow bisa disambung ulang"""
+        job_id = self.queue.submit(hitung_iterasi, (5,), meta={"algorithm": "PSO"})
+        status = self.tunggu(job_id)
+
+        self.assertEqual(status["status"], JobQueue.DONE)
+        self.assertEqual(status["algorithm"], "PSO")
+        self.assertEqual(status["events"], 6)
+        self.assertEqual(status["progress"]["iteration"], 5)
+        self.assertEqual(status["result"], {"type": "final_metrics", "makespan": 2.0})
+
+        # Pool dibuat dari proses multi-thread: worker harus lewat forkserver, bukan fork
+        self.assertIn(self.queue._pool._mp_context.get_start_method(), ("forkserver", "spawn"))
+
+        semua = list(self.queue.follow(job_id))
+        self.assertEqual([i for i, _ in semua], list(range(6)))
+        self.assertEqual(json.loads(semua[-1][1])["type"], "final_metrics")
+        self.assertEqual(list(self.queue.follow(job_id, start=4)), semua[4:])
+
+    def test_failed_job_reports_error(self):
+        """Menguji exception di job menjadi status failed dan event error"""
+        job_id = self.queue.submit(gagal_di_tengah)
+        status = self.tunggu(job_id)
+
+        self.assertEqual(status["status"], JobQueue.FAILED)
+        self.assertIn("simulasi gagal", status["error"])
+        events = [json.loads(e) for _, e in self.queue.follow(job_id)]
+        self.assertEqual([e["type"] for e in events], ["start", "error"])
+
+    def test_prune_is_throttled(self):
+        """Menguji pemangkasan job kedaluwarsa berjalan paling sering sekali per interval"""
+        from unittest.mock import patch
+        import job_queue
+
+        self.queue.ttl_seconds = 0
+        lama = self.queue.submit(hitung_iterasi, (1,))
+        self.tunggu(lama)
+
+        # Pemangkasan baru saja berjalan saat submit: submit berikutnya tidak memindai direktori
+        with patch.object(job_queue, '_baca_json', wraps=job_queue._baca_json) as baca:
+            baru = self.queue.submit(hitung_iterasi, (1,))
+            self.assertNotIn(
+                os.path.join(self.job_dir, lama, 'status.json'),
+                [c.args[0] for c in baca.call_args_list],
+            )
+        self.tunggu(baru)
+        self.assertTrue(os.path.isdir(os.path.join(self.job_dir, lama)))
+
+        self.queue._pangkas_terakhir = 0.0
+        self.queue._pangkas()
+        self.assertFalse(os.path.isdir(os.path.join(self.job_dir, lama)))
+
+    def test_unknown_and_lost_jobs(self):
+        """Menguji ID tidak dikenal ditolak dan job yang prosesnya mati dilaporkan failed"""
+        with self.assertRaises(KeyError):
+            self.queue.get("0" * 32)
+        with self.assertRaises(KeyError):
+            self.queue.get("../status")
+
+        # Job antre milik proses yang sudah tidak ada (misal worker gunicorn di-restart)
+        job_id = self.queue.submit(hitung_iterasi, (1,))
+        self.tunggu(job_id)
+        path_status = os.path.join(self.job_dir, job_id, "status.json")
+        with open(path_status, "r", encoding="utf-8") as f:
+            status = json.load(f)
+        status.update({"status": JobQueue.QUEUED, "owner_pid": 2 ** 22 + 1})
+        with open(path_status, "w", encoding="utf-8") as f:
+            json.dump(status, f)
+
+        status = self.queue.get(job_id)
+        self.assertEqual(status["status"], JobQueue.FAILED)
+        self.assertIn("lost", status["error"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,6 +8,7 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from models.pso import PSO_MultiAgent_Scheduler
+from models.utils import fungsi_biaya_jadwal
 
 class TestPSOAlgorithm(unittest.TestCase):
     def setUp(self):
@@ -200,5 +201,185 @@ class TestPSOAlgorithm(unittest.TestCase):
             self.assertIn('start_time', task_schedule)
             self.assertIn('finish_time', task_schedule)
 
+    def test_parallel_evaluation_matches_serial(self):
+        """Menguji evaluasi partikel di process pool identik dengan evaluasi serial"""
+        tasks = [
+            {'id': f'Task_{i}', 'length': i % 5 + 1,
+             'dependencies': [f'Task_{i - 1}'] if i % 3 else []}
+            for i in range(12)
+        ]
+
+        def jalankan(n_workers):
+            pso = PSO_MultiAgent_Scheduler(
+                tasks=tasks,
+                agents=self.agents,
+                cost_function=fungsi_biaya_jadwal,
+                n_particles=6,
+                n_iterations=3,
+                enable_dependencies=True,
+                n_workers=n_workers,
+                random_seed=7,
+            )
+            hasil = pso.optimize(show_progress=False)
+            self.assertIsNone(pso._pool)
+            return hasil, pso.posisi
+
+        hasil_serial, posisi_serial = jalankan(1)
+        # Batas worker server mengikuti jumlah CPU; paksa 4 CPU agar pool benar-benar dipakai.
+        # Worker forkserver menerima state lewat pickle, jadi fungsi biaya harus fungsi modul.
+        with patch('models.parallel.os.cpu_count', return_value=4):
+            hasil_paralel, posisi_paralel = jalankan(2)
+            self.assertEqual(
+                PSO_MultiAgent_Scheduler(
+                    tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                    n_particles=500, n_workers=500,
+                ).n_workers,
+                4,
+            )
+
+        self.assertEqual(hasil_serial['makespan'], hasil_paralel['makespan'])
+        self.assertTrue(np.array_equal(posisi_serial, posisi_paralel))
+        self.assertEqual(
+            hasil_serial['schedule'].to_dict('records'),
+            hasil_paralel['schedule'].to_dict('records'),
+        )
+
+    def test_vectorized_velocity_update_matches_per_particle_loop(self):
+        """Menguji update kecepatan/posisi matriks identik dengan loop per partikel"""
+        pso = PSO_MultiAgent_Scheduler(
+            tasks=self.tasks,
+            agents=self.agents,
+            cost_function=self.cost_function,
+            n_particles=5,
+            w=0.5,
+            c1=1.5,
+            c2=2.0,
+        )
+        pso.posisi_pbest = pso.posisi + 0.3
+        pso.posisi_gbest = pso.posisi[2] - 0.1
+
+        posisi, kecepatan = pso.posisi.copy(), pso.kecepatan.copy()
+        rng = np.random.default_rng(11)
+        for p in range(pso.jumlah_partikel):
+            r1, r2 = rng.random(pso.jumlah_tugas), rng.random(pso.jumlah_tugas)
+            kognitif = pso.c1 * r1 * (pso.posisi_pbest[p] - posisi[p])
+            sosial = pso.c2 * r2 * (pso.posisi_gbest - posisi[p])
+            kecepatan[p] = pso.w * kecepatan[p] + kognitif + sosial
+            posisi[p] += kecepatan[p]
+
+        pso.rng = np.random.default_rng(11)
+        pso.update_velocity_and_position()
+
+        self.assertEqual(pso.kecepatan.tobytes(), kecepatan.tobytes())
+        self.assertEqual(pso.posisi.tobytes(), posisi.tobytes())
+
+    def test_early_stopping_patience_and_time_budget(self):
+        """Menguji PSO berhenti karena `patience` tanpa perbaikan atau anggaran waktu habis"""
+        tasks = [{'id': f'Task_{i}', 'length': (i * 5) % 7 + 1} for i in range(12)]
+        pso = PSO_MultiAgent_Scheduler(
+            tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+            n_particles=6, n_iterations=40, random_seed=3,
+            patience=3, min_improvement=0.5,
+        )
+        hasil = pso.optimize(show_progress=False)
+
+        # Perbaikan >50% tidak mungkin terjadi setelah iterasi pertama
+        self.assertEqual(hasil['stop_reason'], 'no_improvement')
+        self.assertEqual(len(hasil['iteration_history']), 4)
+        self.assertFalse(hasil['budget_exhausted'])
+
+        # Mode anytime: anggaran habis, swarm tidak lagi digerakkan
+        posisi_awal = pso.posisi.copy()
+        hasil = pso.optimize(show_progress=False, time_budget_ms=0)
+        self.assertTrue(hasil['budget_exhausted'])
+        self.assertEqual(hasil['stop_reason'], 'time_budget_exhausted')
+        self.assertTrue(np.array_equal(pso.posisi, posisi_awal))
+        self.assertEqual(len(hasil['schedule']), 12)
+
+    def test_bottom_level_bias_orders_critical_path_first(self):
+        """Menguji bias bottom-level mendorong tugas lintasan kritis ke depan urutan"""
+        tasks = [
+            {'id': 'A', 'length': 2},
+            {'id': 'B', 'length': 1, 'dependencies': ['A']},
+            {'id': 'C', 'length': 9},
+            {'id': 'D', 'length': 0.5},
+        ]
+        # Dekoder dependensi (posisi tertinggi dulu) dan argsort (terendah dulu) sama-sama
+        # menghasilkan urutan bottom-level menurun
+        for dependensi in (True, False):
+            pso = PSO_MultiAgent_Scheduler(
+                tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                n_particles=4, enable_dependencies=dependensi, random_seed=0,
+                bottom_level_bias=100.0,
+            )
+            for p in range(4):
+                self.assertEqual(pso.position_to_sequence(pso.posisi[p]).tolist(), [2, 0, 1, 3])
+
+    def test_sequence_to_position_round_trip_and_local_search(self):
+        """Menguji urutan hasil local search bisa dikodekan kembali menjadi posisi gbest"""
+        tasks = [
+            {'id': f'Task_{i}', 'length': (i * 5) % 7 + 1,
+             'dependencies': [f'Task_{i - 2}'] if i >= 2 and i % 3 == 0 else []}
+            for i in range(20)
+        ]
+        for dependensi in (True, False):
+            pso = PSO_MultiAgent_Scheduler(
+                tasks=tasks, agents=self.agents, cost_function=self.cost_function,
+                n_particles=5, n_iterations=5, enable_dependencies=dependensi,
+                random_seed=2, local_search='iteration', local_search_moves=30,
+            )
+            urutan = pso.position_to_sequence(pso.posisi[3]).tolist()
+            posisi = pso.sequence_to_position(urutan)
+            self.assertEqual(pso.position_to_sequence(posisi).tolist(), urutan)
+
+            hasil = pso.optimize(show_progress=False)
+            self.assertEqual(hasil['makespan'], hasil['schedule']['finish_time'].max())
+            # gbest (termasuk hasil local search) didekode menjadi jadwal yang dilaporkan
+            urutan_gbest = pso.position_to_sequence(pso.posisi_gbest)
+            self.assertEqual(pso.evaluate_sequence(urutan_gbest)[1], hasil['makespan'])
+
+    def test_positions_to_sequences_batched(self):
+        """Menguji dekode batch seluruh swarm sama dengan perbaikan penalti per partikel"""
+        tasks = [
+            {'id': f'Task_{i}', 'length': 1,
+             'dependencies': [f'Task_{j}' for j in range(max(0, i - 3), i) if (i * j) % 4 == 1]}
+            for i in range(15)
+        ]
+        pso = PSO_MultiAgent_Scheduler(
+            tasks=tasks,
+            agents=self.agents,
+            cost_function=self.cost_function,
+            n_particles=8,
+            enable_dependencies=True,
+        )
+        urutan = pso.positions_to_sequences(pso.posisi)
+        self.assertEqual(urutan.shape, (8, 15))
+
+        for p in range(8):
+            # Referensi: pilih tugas siap dengan penalti (posisi - 0.5 x #dependensi) tertinggi
+            penalti = {
+                t: pso.posisi[p, t] - 0.5 * len(pso.dependensi.get(f'Task_{t}', []))
+                for t in range(15)
+            }
+            tersedia, selesai, referensi = set(range(15)), set(), []
+            while tersedia:
+                siap = [t for t in sorted(tersedia)
+                        if pso.is_dependency_satisfied(f'Task_{t}', selesai)]
+                terbaik = max(siap, key=lambda t: penalti[t])
+                referensi.append(terbaik)
+                tersedia.remove(terbaik)
+                selesai.add(f'Task_{terbaik}')
+            self.assertEqual(urutan[p].tolist(), referensi)
+
+        # Tanpa dependensi: satu argsort per baris
+        pso_bebas = PSO_MultiAgent_Scheduler(
+            tasks=self.tasks, agents=self.agents, cost_function=self.cost_function,
+            n_particles=4,
+        )
+        np.testing.assert_array_equal(
+            pso_bebas.positions_to_sequences(pso_bebas.posisi),
+            np.argsort(pso_bebas.posisi, axis=1),
+        )
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from unittest.mock import patch
+
+# Tambahkan direktori induk ke path untuk mengimpor modul
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_key_is_content_addressed(self):
+        """Menguji kunci cache tidak bergantung urutan field dict"""
+        kunci_a = ResultCache.make_key(tasks=[{'id': '1', 'length': 2}], random_seed=42)
+        kunci_b = ResultCache.make_key(random_seed=42, tasks=[{'length': 2, 'id': '1'}])
+        kunci_c = ResultCache.make_key(tasks=[{'id': '1', 'length': 2}], random_seed=43)
+
+        self.assertEqual(kunci_a, kunci_b)
+        self.assertNotEqual(kunci_a, kunci_c)
+
+    def test_lru_eviction(self):
+        """Menguji entri yang paling lama tidak dipakai dibuang lebih dulu"""
+        cache = ResultCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual(len(cache), 2)
+
+    def test_ttl_expiry(self):
+        """Menguji entri kedaluwarsa setelah TTL"""
+        cache = ResultCache(max_entries=4, ttl_seconds=0.05)
+        cache.set('a', {'chunks': []})
+        self.assertIsNotNone(cache.get('a'))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_disk_tier(self):
+        """Menguji entri tetap tersedia dari disk setelah tier memori kosong"""
+        with tempfile.TemporaryDirectory() as direktori:
+            cache = ResultCache(max_entries=1, disk_dir=direktori)
+            cache.set('a', {'chunks': ['x'], 'final_metrics': {'type': 'final_metrics'}})
+            cache.set('b', {'chunks': []})
+
+            # 'a' sudah keluar dari memori (LRU) tapi masih ada di disk
+            self.assertEqual(cache.get('a')['chunks'], ['x'])
+
+            cache_baru = ResultCache(max_entries=4, disk_dir=direktori)
+            self.assertEqual(cache_baru.get('b'), {'chunks': []})
+
+    def test_disk_only_cache(self):
+        """Menguji setup disk saja (tier memori nol) tetap menyimpan dan mengembalikan entri"""
+        with tempfile.TemporaryDirectory() as direktori:
+            with patch.dict(os.environ, {'RESULT_CACHE_SIZE': '0', 'RESULT_CACHE_DIR': direktori}):
+                cache = ResultCache.from_env()
+            self.assertTrue(cache.enabled)
+            self.assertEqual(len(cache), 0)
+
+            cache.set('a', {'chunks': ['x']})
+            self.assertEqual(os.listdir(direktori), ['a.json'])
+            self.assertEqual(cache.get('a'), {'chunks': ['x']})
+
+            self.assertFalse(ResultCache(max_entries=0, disk_dir=direktori, max_disk_entries=0).enabled)
+
+    def test_disk_entry_removed_during_get(self):
+        """Menguji file disk yang dihapus proses lain di tengah get tidak membuat get gagal"""
+        import result_cache
+
+        with tempfile.TemporaryDirectory() as direktori:
+            ResultCache(max_entries=4, disk_dir=direktori).set('a', {'chunks': []})
+            cache = ResultCache(max_entries=4, disk_dir=direktori)
+            path = os.path.join(direktori, 'a.json')
+            baca_asli = result_cache.json.load
+
+            def baca_lalu_hapus(f):
+                nilai = baca_asli(f)
+                os.remove(path)
+                return nilai
+
+            with patch('result_cache.json.load', side_effect=baca_lalu_hapus):
+                self.assertEqual(cache.get('a'), {'chunks': []})
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()